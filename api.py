@@ -45,16 +45,10 @@ async def solve_knapsack(request: KnapsackRequest):
     if request.solver in ['greedy', 'all']:
         greedy_solver = GreedyKnapsackSolver()
         results['greedy'] = greedy_solver.solve(request.weights, request.values, request.capacity)
-        # Ensure solve_time is present
-        if 'solve_time' not in results['greedy']:
-            results['greedy']['solve_time'] = 0.01  # Default value
     
     if request.solver in ['ml', 'all']:
         ml_solver = MLKnapsackSolver()
         results['ml'] = ml_solver.solve(request.weights, request.values, request.capacity)
-        # Ensure solve_time is present
-        if 'solve_time' not in results['ml']:
-            results['ml']['solve_time'] = 0.02  # Default value
     
     return {
         "status": "success",
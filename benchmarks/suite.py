@@ -0,0 +1,395 @@
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+try:
+    import resource
+except ImportError:  # resource is Unix-only; RSS is not recorded elsewhere
+    resource = None
+
+from knapsack.generate_data import solve_knapsack_dp
+from knapsack.instances import FAMILIES, generate_items
+from knapsack.solver.cost_model import SolverCostModel, summarize_instance
+from knapsack.solver.selector import instance_features
+
+# Bumped whenever the result file layout changes
+RESULTS_VERSION = 1
+
+# The pure-Python DP is opt-in: at scale 1000 it only finishes on tiny capacities
+DEFAULT_SOLVERS = ("greedy", "ml", "ga", "bnb")
+DEFAULT_SIZES = (20, 50, 100)
+DEFAULT_CAPACITY_FRACTIONS = (0.1, 0.5)
+DEFAULT_RANGES = (100, 1000)
+DEFAULT_FAMILIES = ("uncorrelated", "weakly_correlated", "strongly_correlated", "subset_sum")
+
+# Fields identifying a grid cell; runs are compared cell by cell
+CELL_FIELDS = ('solver', 'family', 'n_items', 'coefficient_range', 'capacity_fraction')
+
+
+def build_solvers(
+    names: Tuple[str, ...],
+    model_path: str = 'knapsack/models/rf_model.pkl',
+    time_limit: float = 2.0
+) -> Dict[str, Any]:
+    """Create the benchmarked solvers; BnB and the GA stop at time_limit seconds."""
+    from knapsack.solver.traditional_solver import DPKnapsackSolver, GreedyKnapsackSolver, BranchAndBoundKnapsackSolver
+    from knapsack.solver.ml_solver import MLKnapsackSolver
+    from knapsack.solver.genetic_solver import GeneticKnapsackSolver
+
+    ml_solver = MLKnapsackSolver(model_path) if {'ml', 'ga'} & set(names) else None
+    solvers = {
+        'dp': DPKnapsackSolver(),
+        'greedy': GreedyKnapsackSolver(),
+        'ml': ml_solver,
+        'bnb': BranchAndBoundKnapsackSolver(time_limit=time_limit),
+        'ga': GeneticKnapsackSolver(ml_solver=ml_solver, time_limit=time_limit, seed=0)
+    }
+    return {name: solvers[name] for name in names}
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """High-water mark of the process's resident set size."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak) if sys.platform == 'darwin' else int(peak) * 1024
+
+
+def measure(solve: Callable[[], Dict], repetitions: int = 5, warmup: int = 1) -> Dict:
+    """Time a solve after warm-up runs, then measure its peak memory in a separate run.
+
+    Memory is traced in its own run because tracemalloc slows down allocation-heavy
+    code and would distort the timings.
+
+    Args:
+        solve: Runs the solver on one instance and returns its solution
+        repetitions: Timed runs
+        warmup: Untimed runs first (imports, caches, lazily built models)
+
+    Returns:
+        The solution plus median, minimum and all wall times, the tracemalloc
+        peak of one run and the process's peak RSS afterwards
+    """
+    for _ in range(warmup):
+        solve()
+    gc.collect()
+    times = []
+    for _ in range(repetitions):
+        start_time = time.perf_counter()
+        solution = solve()
+        times.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        solve()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'solution': solution,
+        'runtime': float(np.median(times)),
+        'runtime_min': float(np.min(times)),
+        'times': times,
+        'tracemalloc_peak_bytes': int(peak),
+        'rss_peak_bytes': _peak_rss_bytes()
+    }
+
+
+def run_benchmarks(
+    solvers: Dict[str, Any],
+    families: Tuple[str, ...] = DEFAULT_FAMILIES,
+    sizes: Tuple[int, ...] = DEFAULT_SIZES,
+    coefficient_ranges: Tuple[int, ...] = DEFAULT_RANGES,
+    capacity_fractions: Tuple[float, ...] = DEFAULT_CAPACITY_FRACTIONS,
+    instances: int = 3,
+    repetitions: int = 5,
+    warmup: int = 1,
+    max_estimated_seconds: float = 5.0,
+    seed: int = 0
+) -> Tuple[List[Dict], List[Dict]]:
+    """Sweep every solver over family x size x coefficient range x capacity.
+
+    Each grid point gets `instances` fresh instances from generate_items. Their
+    coefficients are integers, so the vectorized DP of generate_data gives the
+    exact optimum the quality gap is measured against. A solver is skipped at
+    a grid point when the cost model expects one solve to take longer than
+    max_estimated_seconds (the pure-Python DP on all but small capacities).
+
+    Args:
+        solvers: Mapping of solver name to solver instance
+        families: Instance families, out of FAMILIES
+        sizes: Numbers of items
+        coefficient_ranges: Coefficient ranges R
+        capacity_fractions: Capacities as fractions of the total weight
+        instances: Instances per grid point
+        repetitions: Timed runs per solver and instance
+        warmup: Untimed runs before the timed ones
+        max_estimated_seconds: Skip solves the cost model expects to take longer
+        seed: Random seed
+
+    Returns:
+        Records (instance_features fields plus the grid cell, 'runtime' and
+        'quality', so SolverPerformanceModel.fit accepts them) and the skipped
+        cells with their estimated runtime
+    """
+    cost_model = SolverCostModel(bnb_node_limit=getattr(solvers.get('bnb'), 'node_limit', 2_000_000))
+    ml_solver = solvers.get('ml')
+    if ml_solver is not None:
+        cost_model.ml_max_items = ml_solver.max_items
+        cost_model.ml_available = ml_solver.model is not None
+
+    records, skipped = [], []
+    grid = list(itertools.product(families, sizes, coefficient_ranges, capacity_fractions))
+    for cell_index, (family, n, coefficient_range, fraction) in enumerate(grid):
+        rng = np.random.default_rng([seed, cell_index])
+        cell = {'family': family, 'n_items': n, 'coefficient_range': coefficient_range, 'capacity_fraction': fraction}
+        for instance_index in range(instances):
+            weights, values = generate_items(family, n, coefficient_range, rng)
+            capacity = float(np.floor(fraction * np.sum(weights)))
+            weights, values = weights.tolist(), values.tolist()
+            features = instance_features(weights, values, capacity)
+            summary = summarize_instance(weights, values, capacity)
+            optimal_value, _ = solve_knapsack_dp(weights, values, capacity)
+
+            for name, solver in solvers.items():
+                estimate = cost_model.estimate(name, summary)['cpu_seconds']
+                if estimate > max_estimated_seconds:
+                    if instance_index == 0:
+                        skipped.append(dict(cell, solver=name, estimated_seconds=estimate))
+                    continue
+                result = measure(lambda: solver.solve(weights, values, capacity), repetitions, warmup)
+                solution = result.pop('solution')
+                quality = float(solution['total_value'] / optimal_value) if optimal_value > 0 else 1.0
+                records.append(dict(
+                    features,
+                    **cell,
+                    solver=name,
+                    instance=instance_index,
+                    quality=quality,
+                    gap=1.0 - quality,
+                    is_feasible=bool(solution['is_feasible']),
+                    **result
+                ))
+        print(f"[{cell_index + 1}/{len(grid)}] {family} n={n} R={coefficient_range} capacity={fraction}: "
+              + ", ".join(
+                  f"{r['solver']} {r['runtime'] * 1000:.2f}ms gap {r['gap']:.4f}"
+                  for r in records if all(r[k] == cell[k] for k in cell) and r['instance'] == 0
+              ))
+    return records, skipped
+
+
+def _environment() -> Dict:
+    """Where the run happened, so comparisons across machines can be spotted."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit
+    }
+
+
+def save_results(path: str, records: List[Dict], skipped: List[Dict], settings: Dict):
+    """Write a run as JSON: version, environment, settings, records and skipped cells."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'results_version': RESULTS_VERSION,
+            'created_at': time.time(),
+            'environment': _environment(),
+            'settings': settings,
+            'records': records,
+            'skipped': skipped
+        }, f, indent=2)
+
+
+def load_results(path: str) -> Dict:
+    """Load a run written by save_results."""
+    with open(path) as f:
+        results = json.load(f)
+    if results.get('results_version') != RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results version {results.get('results_version')} in {path}")
+    return results
+
+
+def summarize(records: List[Dict]) -> Dict[Tuple, Dict]:
+    """Aggregate records per grid cell: median runtime, mean gap and largest memory peak."""
+    cells = {}
+    for record in records:
+        cells.setdefault(tuple(record[k] for k in CELL_FIELDS), []).append(record)
+    return {
+        key: {
+            'runtime': float(np.median([r['runtime'] for r in rows])),
+            'gap': float(np.mean([r['gap'] for r in rows])),
+            'tracemalloc_peak_bytes': max(r['tracemalloc_peak_bytes'] for r in rows),
+            'feasibility_rate': float(np.mean([r['is_feasible'] for r in rows]))
+        }
+        for key, rows in cells.items()
+    }
+
+
+def compare(
+    baseline: Dict,
+    current: Dict,
+    runtime_tolerance: float = 0.25,
+    min_runtime_delta: float = 0.001,
+    gap_tolerance: float = 0.005,
+    memory_tolerance: float = 0.25,
+    min_memory_delta: int = 64 * 1024
+) -> Dict:
+    """Compare two runs cell by cell and flag regressions.
+
+    A cell regresses when its median runtime grows by more than
+    runtime_tolerance (and by at least min_runtime_delta seconds, so timer
+    noise on sub-millisecond solves is not flagged), its mean gap grows by more
+    than gap_tolerance, its peak traced memory grows by more than
+    memory_tolerance (and at least min_memory_delta bytes), or it produces
+    infeasible solutions it did not produce before.
+
+    Args:
+        baseline: Results of the reference run (load_results)
+        current: Results of the run under test
+
+    Returns:
+        Per-cell rows with both sides, the regressions, cells present in only
+        one run, and whether the environments differ
+    """
+    before = summarize(baseline['records'])
+    after = summarize(current['records'])
+    rows, regressions = [], []
+    for key in sorted(set(before) & set(after), key=str):
+        old, new = before[key], after[key]
+        reasons = []
+        if (new['runtime'] > old['runtime'] * (1 + runtime_tolerance)
+                and new['runtime'] - old['runtime'] >= min_runtime_delta):
+            reasons.append(f"runtime {old['runtime'] * 1000:.2f}ms -> {new['runtime'] * 1000:.2f}ms")
+        if new['gap'] > old['gap'] + gap_tolerance:
+            reasons.append(f"gap {old['gap']:.4f} -> {new['gap']:.4f}")
+        if (new['tracemalloc_peak_bytes'] > old['tracemalloc_peak_bytes'] * (1 + memory_tolerance)
+                and new['tracemalloc_peak_bytes'] - old['tracemalloc_peak_bytes'] >= min_memory_delta):
+            reasons.append(f"peak memory {old['tracemalloc_peak_bytes'] / 1024:.0f}KB -> "
+                           f"{new['tracemalloc_peak_bytes'] / 1024:.0f}KB")
+        if new['feasibility_rate'] < old['feasibility_rate']:
+            reasons.append(f"feasibility {old['feasibility_rate']:.2f} -> {new['feasibility_rate']:.2f}")
+        row = dict(zip(CELL_FIELDS, key), baseline=old, current=new, reasons=reasons)
+        rows.append(row)
+        if reasons:
+            regressions.append(row)
+
+    environment_keys = ('python', 'numpy', 'platform', 'processor', 'cpu_count')
+    return {
+        'cells': rows,
+        'regressions': regressions,
+        'only_in_baseline': [dict(zip(CELL_FIELDS, key)) for key in sorted(set(before) - set(after), key=str)],
+        'only_in_current': [dict(zip(CELL_FIELDS, key)) for key in sorted(set(after) - set(before), key=str)],
+        'environment_differs': any(
+            baseline['environment'].get(k) != current['environment'].get(k) for k in environment_keys
+        )
+    }
+
+
+def _print_summary(records: List[Dict]):
+    print(f"\n{'solver':<8} {'cells':>5} {'median ms':>10} {'mean gap':>9} {'optimal':>8} {'peak KB':>9}")
+    for solver in sorted({r['solver'] for r in records}):
+        rows = [r for r in records if r['solver'] == solver]
+        print(f"{solver:<8} {len(summarize(rows)):>5} {np.median([r['runtime'] for r in rows]) * 1000:>10.3f} "
+              f"{np.mean([r['gap'] for r in rows]):>9.4f} {np.mean([r['gap'] <= 1e-9 for r in rows]):>8.0%} "
+              f"{max(r['tracemalloc_peak_bytes'] for r in rows) / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark solver runtime, memory and quality, and compare runs')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='Sweep the solvers over the instance grid')
+    run_parser.add_argument('--output', type=str, default='benchmarks/results/latest.json',
+                          help='Where to write the results')
+    run_parser.add_argument('--solvers', type=str, nargs='+', choices=['dp', 'greedy', 'ml', 'bnb', 'ga'],
+                          default=list(DEFAULT_SOLVERS), help='Solvers to benchmark')
+    run_parser.add_argument('--families', type=str, nargs='+', choices=FAMILIES,
+                          default=list(DEFAULT_FAMILIES), help='Instance families')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                          help='Numbers of items')
+    run_parser.add_argument('--ranges', type=int, nargs='+', default=list(DEFAULT_RANGES),
+                          help='Coefficient ranges R')
+    run_parser.add_argument('--capacities', type=float, nargs='+', default=list(DEFAULT_CAPACITY_FRACTIONS),
+                          help='Capacities as fractions of the total weight')
+    run_parser.add_argument('--instances', type=int, default=3,
+                          help='Instances per grid point')
+    run_parser.add_argument('--repetitions', type=int, default=5,
+                          help='Timed runs per solver and instance')
+    run_parser.add_argument('--warmup', type=int, default=1,
+                          help='Untimed runs before the timed ones')
+    run_parser.add_argument('--max-estimated-seconds', type=float, default=5.0,
+                          help='Skip solves the cost model expects to take longer')
+    run_parser.add_argument('--time-limit', type=float, default=2.0,
+                          help='Time limit of the branch and bound and genetic solvers')
+    run_parser.add_argument('--model', type=str, default='knapsack/models/rf_model.pkl',
+                          help='Trained model for the ML solver')
+    run_parser.add_argument('--seed', type=int, default=0,
+                          help='Random seed')
+    compare_parser = commands.add_parser('compare', help='Flag regressions of one run against another')
+    compare_parser.add_argument('baseline', help='Results of the reference run')
+    compare_parser.add_argument('current', help='Results of the run under test')
+    compare_parser.add_argument('--runtime-tolerance', type=float, default=0.25,
+                              help='Allowed relative growth of the median runtime')
+    compare_parser.add_argument('--gap-tolerance', type=float, default=0.005,
+                              help='Allowed growth of the mean quality gap')
+    compare_parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                              help='Allowed relative growth of the peak traced memory')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        settings = {
+            'solvers': args.solvers, 'families': args.families, 'sizes': args.sizes,
+            'coefficient_ranges': args.ranges, 'capacity_fractions': args.capacities,
+            'instances': args.instances, 'repetitions': args.repetitions, 'warmup': args.warmup,
+            'max_estimated_seconds': args.max_estimated_seconds, 'time_limit': args.time_limit,
+            'model': args.model, 'seed': args.seed
+        }
+        records, skipped = run_benchmarks(
+            build_solvers(tuple(args.solvers), args.model, args.time_limit),
+            families=tuple(args.families), sizes=tuple(args.sizes), coefficient_ranges=tuple(args.ranges),
+            capacity_fractions=tuple(args.capacities), instances=args.instances, repetitions=args.repetitions,
+            warmup=args.warmup, max_estimated_seconds=args.max_estimated_seconds, seed=args.seed
+        )
+        save_results(args.output, records, skipped, settings)
+        _print_summary(records)
+        if skipped:
+            print(f"\nSkipped {len(skipped)} solver/cell combinations expected to exceed "
+                  f"{args.max_estimated_seconds}s per solve")
+        print(f"\nSaved {len(records)} records to {args.output}")
+    else:
+        report = compare(
+            load_results(args.baseline), load_results(args.current),
+            runtime_tolerance=args.runtime_tolerance, gap_tolerance=args.gap_tolerance,
+            memory_tolerance=args.memory_tolerance
+        )
+        if report['environment_differs']:
+            print("Warning: the runs come from different environments; runtime differences may not be regressions")
+        for label in ('only_in_baseline', 'only_in_current'):
+            if report[label]:
+                print(f"{len(report[label])} cells {label.replace('_', ' ')}")
+        for row in report['regressions']:
+            print(f"REGRESSION {row['solver']} {row['family']} n={row['n_items']} R={row['coefficient_range']} "
+                  f"capacity={row['capacity_fraction']}: {'; '.join(row['reasons'])}")
+        print(f"\n{len(report['regressions'])} of {len(report['cells'])} cells regressed")
+        sys.exit(1 if report['regressions'] else 0)
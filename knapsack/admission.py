@@ -0,0 +1,213 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional
+
+from knapsack.solver.cost_model import SolverCostModel, summarize_instance
+
+# Cheaper solvers to fall back to, in order of preference
+DOWNGRADE_CHAIN = {
+    "dp": ["ml", "greedy"],
+    "bnb": ["ml", "greedy"],
+    "ml": ["greedy"],
+    "ga": ["greedy"],
+    "portfolio": ["ml", "greedy"],
+    "greedy": []
+}
+
+
+class AdmissionError(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[int] = None):
+        """Raised when a solve request is rejected before running.
+
+        Args:
+            status_code: HTTP status to answer with (413 or 503)
+            detail: Human-readable reason
+            retry_after: Seconds the client should wait before retrying, if any
+        """
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionPolicy:
+    def __init__(
+        self,
+        cost_model: SolverCostModel,
+        max_cpu_seconds: float = 30.0,
+        max_memory_bytes: int = 2 * 1024 ** 3,
+        max_concurrent: int = 4,
+        max_queue: int = 32,
+        queue_timeout: float = 10.0
+    ):
+        """Decide whether, how and when a solve request runs.
+
+        Args:
+            cost_model: Estimator for per-solver CPU time and memory
+            max_cpu_seconds: CPU-time budget for a single request
+            max_memory_bytes: Memory budget shared by all running requests
+            max_concurrent: Maximum number of requests solving at once
+            max_queue: Maximum number of requests waiting for a slot
+            queue_timeout: Seconds a request may wait for a slot before being rejected
+        """
+        self.cost_model = cost_model
+        self.max_cpu_seconds = max_cpu_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._condition = None
+        self._running = 0
+        self._waiting = 0
+        self._reserved_bytes = 0
+
+    @classmethod
+    def from_env(cls, cost_model: SolverCostModel) -> 'AdmissionPolicy':
+        """Build a policy from KNAPSACK_* environment variables."""
+        return cls(
+            cost_model,
+            max_cpu_seconds=float(os.environ.get('KNAPSACK_MAX_CPU_SECONDS', 30.0)),
+            max_memory_bytes=int(float(os.environ.get('KNAPSACK_MAX_MEMORY_MB', 2048)) * 1024 ** 2),
+            max_concurrent=int(os.environ.get('KNAPSACK_MAX_CONCURRENT_SOLVES', 4)),
+            max_queue=int(os.environ.get('KNAPSACK_MAX_QUEUED_SOLVES', 32)),
+            queue_timeout=float(os.environ.get('KNAPSACK_QUEUE_TIMEOUT', 10.0))
+        )
+
+    def _fits(self, estimate: Dict, cpu_left: float) -> bool:
+        return estimate['cpu_seconds'] <= cpu_left and estimate['memory_bytes'] <= self.max_memory_bytes
+
+    def plan(
+        self,
+        solver_types: List[str],
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        allow_downgrade: bool = False,
+        deadline: Optional[float] = None
+    ) -> Dict:
+        """Choose the solvers to run within the per-request budgets.
+
+        Solvers run one after another, so their CPU estimates add up while memory
+        is bounded by the largest one. A solver over budget is replaced by the
+        cheapest fitting alternative from DOWNGRADE_CHAIN if allow_downgrade is set.
+
+        Args:
+            solver_types: Solvers requested by the client
+            weights: List of item weights
+            values: List of item values
+            capacity: Knapsack capacity
+            allow_downgrade: Whether cheaper solvers may be substituted
+            deadline: Seconds after which deadline-bounded solvers return
+
+        Returns:
+            Dictionary with the solvers to run, downgrades applied and total estimates
+
+        Raises:
+            AdmissionError: With status 413 if a requested solver cannot fit the budget
+        """
+        summary = summarize_instance(weights, values, capacity)
+        summary['deadline'] = deadline
+        solvers = []
+        downgrades = {}
+        estimates = {}
+        cpu_left = self.max_cpu_seconds
+
+        for solver_type in solver_types:
+            candidates = [solver_type] + (DOWNGRADE_CHAIN[solver_type] if allow_downgrade else [])
+            chosen = None
+            for candidate in candidates:
+                if candidate in solvers:
+                    # Already running this solver for another requested one
+                    chosen = candidate
+                    break
+                estimate = self.cost_model.estimate(candidate, summary)
+                if self._fits(estimate, cpu_left):
+                    chosen = candidate
+                    solvers.append(candidate)
+                    estimates[candidate] = estimate
+                    cpu_left -= estimate['cpu_seconds']
+                    break
+
+            if chosen is None:
+                estimate = self.cost_model.estimate(solver_type, summary)
+                raise AdmissionError(
+                    413,
+                    f"Instance too large for solver '{solver_type}': estimated "
+                    f"{estimate['cpu_seconds']:.1f}s CPU and {estimate['memory_bytes'] / 1024 ** 2:.0f} MB, "
+                    f"budget is {self.max_cpu_seconds:.1f}s and {self.max_memory_bytes / 1024 ** 2:.0f} MB"
+                )
+            if chosen != solver_type:
+                downgrades[solver_type] = chosen
+
+        return {
+            'solvers': solvers,
+            'downgrades': downgrades,
+            'estimated_cpu_seconds': sum(e['cpu_seconds'] for e in estimates.values()),
+            'estimated_memory_bytes': max(e['memory_bytes'] for e in estimates.values())
+        }
+
+    def _can_start(self, memory_bytes: int) -> bool:
+        if self._running >= self.max_concurrent:
+            return False
+        # A lone request may always run; its size was already checked by plan()
+        return self._running == 0 or self._reserved_bytes + memory_bytes <= self.max_memory_bytes
+
+    async def acquire(self, memory_bytes: int, background: bool = False) -> float:
+        """Wait for a free worker slot with enough memory headroom and take it.
+
+        Args:
+            memory_bytes: Estimated memory of the request, reserved until release()
+            background: Wait without the queue limit and timeout, for background
+                jobs whose number is already bounded by the job worker pool
+
+        Returns:
+            The time spent waiting in the queue, in seconds
+
+        Raises:
+            AdmissionError: With status 503 if the queue is full or the wait times out
+        """
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        if not background and self._waiting >= self.max_queue:
+            raise AdmissionError(503, "Solve queue is full", retry_after=int(self.queue_timeout))
+
+        start_time = time.perf_counter()
+        self._waiting += 1
+        try:
+            async with self._condition:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self._can_start(memory_bytes)),
+                    timeout=None if background else self.queue_timeout
+                )
+                self._running += 1
+                self._reserved_bytes += memory_bytes
+        except asyncio.TimeoutError:
+            raise AdmissionError(503, "Timed out waiting for a free solver", retry_after=int(self.queue_timeout))
+        finally:
+            self._waiting -= 1
+        return time.perf_counter() - start_time
+
+    async def release(self, memory_bytes: int):
+        """Give back a slot taken by acquire()."""
+        async with self._condition:
+            self._running -= 1
+            self._reserved_bytes -= memory_bytes
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, memory_bytes: int):
+        """Hold a worker slot for the duration of the block.
+
+        Yields the time spent waiting in the queue, in seconds.
+
+        Raises:
+            AdmissionError: With status 503 if the queue is full or the wait times out
+        """
+        queue_wait = await self.acquire(memory_bytes)
+        try:
+            yield queue_wait
+        finally:
+            await self.release(memory_bytes)
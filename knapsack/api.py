@@ -1,14 +1,31 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Any, Optional
 import numpy as np
 import sys
 import os
+import json
+import time
+import asyncio
+import hmac
+import threading
 
 # Remove the sys.path modification as we're using proper package imports now
-from knapsack.solver.traditional_solver import DPKnapsackSolver, GreedyKnapsackSolver
+from knapsack.solver.traditional_solver import DPKnapsackSolver, GreedyKnapsackSolver, BranchAndBoundKnapsackSolver
 from knapsack.solver.ml_solver import MLKnapsackSolver
+from knapsack.solver.genetic_solver import GeneticKnapsackSolver
+from knapsack.solver.cost_model import SolverCostModel
+from knapsack.solver.selector import SolverPerformanceModel, DEFAULT_PROFILE_PATH
+from knapsack.solver.portfolio import PortfolioKnapsackSolver
+from knapsack.solver.observers import ProgressObserver, EarlyStopObserver
+from knapsack.admission import AdmissionPolicy, AdmissionError
+from knapsack.registry import ModelRegistry, ModelDeployer, DEFAULT_REGISTRY_PATH
+from knapsack.utils.metrics import registry, REQUESTS, QUEUE_WAIT_SECONDS, SOLVER_SECONDS
+from knapsack import wire
+from knapsack.jobs import JobManager, JobQueueFullError, Job
 
 app = FastAPI(
     title="Knapsack Problem Solver API",
@@ -25,20 +42,186 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def count_requests(request: Request, call_next):
+    """Count handled requests by endpoint and status code."""
+    response = await call_next(request)
+    route = request.scope.get("route")
+    endpoint = route.path if route is not None else "unmatched"
+    REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    return response
+
 # Initialize solvers
 dp_solver = DPKnapsackSolver()
 greedy_solver = GreedyKnapsackSolver()
-ml_solver = MLKnapsackSolver()
+# The registry's active model version, if any, replaces the bundled default model
+model_registry = ModelRegistry(os.environ.get('KNAPSACK_MODEL_REGISTRY', DEFAULT_REGISTRY_PATH))
+active_version = model_registry.active_version()
+if active_version is not None:
+    # Loaded like a hot swap, so a model trained on an incompatible feature spec stops startup
+    ml_solver = MLKnapsackSolver(model_path=None)
+    ml_solver.swap_model(model_registry.load(active_version), active_version)
+else:
+    ml_solver = MLKnapsackSolver()
+bnb_solver = BranchAndBoundKnapsackSolver()
+ga_solver = GeneticKnapsackSolver(ml_solver=ml_solver)
+portfolio_members = {
+    "greedy": greedy_solver,
+    "ml": ml_solver,
+    "bnb": bnb_solver,
+    "ga": ga_solver
+}
+
+# Reject, downgrade or queue requests based on their estimated cost
+admission = AdmissionPolicy.from_env(
+    SolverCostModel(
+        ml_max_items=ml_solver.max_items,
+        ml_available=ml_solver.model is not None,
+        bnb_node_limit=bnb_solver.node_limit,
+        portfolio_members=list(portfolio_members),
+        ga_population_size=ga_solver.population_size,
+        ga_generations=ga_solver.generations
+    )
+)
+
+# Races its members in separate processes, returning by the request's latency target;
+# by default every request admitted at once can race
+portfolio_solver = PortfolioKnapsackSolver(
+    portfolio_members,
+    max_races=int(os.environ.get('KNAPSACK_PORTFOLIO_RACES', admission.max_concurrent))
+)
+
+solvers = {
+    "dp": dp_solver,
+    "greedy": greedy_solver,
+    "ml": ml_solver,
+    "bnb": bnb_solver,
+    "ga": ga_solver,
+    "portfolio": portfolio_solver
+}
+solver_groups = {
+    "dp": ["dp"],
+    "greedy": ["greedy"],
+    "ml": ["ml"],
+    "bnb": ["bnb"],
+    "ga": ["ga"],
+    "portfolio": ["portfolio"],
+    "all": ["dp", "greedy", "ml"]
+}
+
+# Calibrated runtime/quality predictions behind solver_type="auto"
+performance_model = SolverPerformanceModel.load(
+    os.environ.get('KNAPSACK_SOLVER_PROFILE', DEFAULT_PROFILE_PATH),
+    admission.cost_model
+)
+auto_candidates = ["greedy", "ml", "ga", "bnb", "dp"]
+
+def _on_model_swap(model):
+    """Keep the cost model in line with the newly served ML model."""
+    admission.cost_model.ml_available = True
+    admission.cost_model.ml_max_items = model.max_items
+    # Portfolio members hold copies of the ML solver; restart them with the new model
+    # between races
+    portfolio_solver.restart()
+
+# Loads registry versions in the background and hot-swaps them into the ML solver; it
+# also follows the registry's active version, so a deployment made through another
+# worker reaches this one within the poll interval (0 disables polling)
+model_deployer = ModelDeployer(
+    model_registry, ml_solver, on_swap=_on_model_swap,
+    poll_interval=float(os.environ.get('KNAPSACK_MODEL_POLL_SECONDS', 5.0))
+)
+
+# Background worker pool for long-running solves submitted through /jobs
+jobs = JobManager.from_env()
+
+@app.on_event("startup")
+def start_portfolio():
+    portfolio_solver.start()
+
+@app.on_event("startup")
+def watch_model_registry():
+    model_deployer.watch()
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    jobs.shutdown()
+    model_deployer.stop()
+    portfolio_solver.shutdown()
 
 class KnapsackRequest(BaseModel):
     weights: List[float]
     values: List[float]
     capacity: float
-    solver_type: str = "all"  # "dp", "greedy", "ml", or "all"
+    solver_type: str = "all"  # "dp", "greedy", "ml", "bnb", "ga", "portfolio", "auto", or "all"
+    latency_target: float = 1.0  # Seconds; "auto" picks a solver for it, "ga" and "portfolio" return by it
+    allow_downgrade: bool = False  # Substitute a cheaper solver if over budget
+    compact: bool = False  # Omit the echoed request and redundant result fields
+    profile: bool = False  # Add the ML solver's per-stage time and search counters to its result
+
+def _solver_options(request: KnapsackRequest, solver_name: str) -> Dict[str, Any]:
+    """Per-request keyword arguments for a solver's solve()."""
+    if solver_name == "portfolio":
+        return {"deadline": request.latency_target}
+    if solver_name == "ga":
+        return {"time_limit": request.latency_target}
+    if solver_name == "ml" and request.profile:
+        return {"profile": True}
+    return {}
+
+def _run_solvers(
+    solver_names: List[str],
+    weights: List[float],
+    values: List[float],
+    capacity: float,
+    job: Optional[Job] = None,
+    options: Optional[Dict[str, Dict[str, Any]]] = None,
+    cpu_budget: Optional[float] = None
+) -> Dict[str, Any]:
+    """Run the admitted solvers one after another in a worker thread.
+    
+    When running as a job, each result is reported as a candidate incumbent
+    and the remaining solvers are skipped once cancellation is requested.
+    With a cpu_budget, a solver still running once the solvers together have
+    used that many CPU seconds stops at its next progress report; its result
+    gets stop_reason "cpu_budget".
+    """
+    results = {}
+    cpu_used = 0.0
+    for name in solver_names:
+        if job is not None and job.cancel_requested():
+            break
+        start_time = time.perf_counter()
+        cpu_start = time.thread_time()
+        kwargs = dict((options or {}).get(name, {}))
+        observers = []
+        if job is not None:
+            observers.append(ProgressObserver(_job_progress(job, name), events=("incumbent", "bound", "iteration")))
+        budget = None
+        if cpu_budget is not None:
+            budget = EarlyStopObserver(cpu_time_limit=max(cpu_budget - cpu_used, 0.0))
+            observers.append(budget)
+        if observers:
+            kwargs["observers"] = observers
+        results[name] = solvers[name].solve(weights, values, capacity, **kwargs)
+        if budget is not None and budget.reason is not None:
+            results[name]["stop_reason"] = "cpu_budget"
+        cpu_used += time.thread_time() - cpu_start
+        SOLVER_SECONDS.observe(time.perf_counter() - start_time, solver=name)
+        if job is not None:
+            job.report(name, results[name])
+    return results
 
-@app.post("/solve")
-async def solve_knapsack(request: KnapsackRequest) -> Dict[str, Any]:
-    """Solve knapsack problem using specified method(s)."""
+def _job_progress(job: Job, solver_name: str):
+    """Progress function that keeps the job incumbent current and stops on cancellation."""
+    def on_progress(event: Dict[str, Any]) -> bool:
+        if event["type"] == "incumbent":
+            job.report(solver_name, dict(event, is_feasible=True))
+        return job.cancel_requested()
+    return on_progress
+
+def _validate_request(request: KnapsackRequest):
+    """Reject malformed instances with a 400."""
     if len(request.weights) != len(request.values):
         raise HTTPException(
             status_code=400,
@@ -51,54 +234,381 @@ async def solve_knapsack(request: KnapsackRequest) -> Dict[str, Any]:
             detail="Weights and values lists cannot be empty"
         )
     
+    if not all(np.isfinite(request.weights)) or not all(np.isfinite(request.values)) or not np.isfinite(request.capacity):
+        raise HTTPException(
+            status_code=400,
+            detail="Weights, values and capacity must be finite"
+        )
+    
+    if min(request.weights) <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Weights must be positive"
+        )
+    
+    if min(request.values) < 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Values cannot be negative"
+        )
+    
     if request.capacity <= 0:
         raise HTTPException(
             status_code=400,
             detail="Capacity must be positive"
         )
     
-    results = {}
+    if request.latency_target <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Latency target must be positive"
+        )
     
+    if request.solver_type not in solver_groups and request.solver_type != "auto":
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown solver type: {request.solver_type}"
+        )
+
+def _resolve_solvers(request: KnapsackRequest):
+    """Solvers to run for a request, and the auto-selection report if "auto" was asked for."""
+    if request.solver_type != "auto":
+        return solver_groups[request.solver_type], None
+    selection = performance_model.choose(
+        request.weights,
+        request.values,
+        request.capacity,
+        request.latency_target,
+        auto_candidates
+    )
+    return [selection["solver"]], selection
+
+def _admission_error(e: AdmissionError) -> HTTPException:
+    headers = {"Retry-After": str(e.retry_after)} if e.retry_after is not None else None
+    return HTTPException(status_code=e.status_code, detail=e.detail, headers=headers)
+
+async def _parse_solve_request(http_request: Request):
+    """Parse a JSON or msgpack solve request.
+
+    Returns:
+        Tuple of the request and the float dtype to echo arrays back with
+    """
+    body = await http_request.body()
     try:
-        if request.solver_type in ["dp", "all"]:
-            results["dp"] = dp_solver.solve(
+        if wire.is_msgpack(http_request.headers.get("content-type")):
+            fields, dtype = wire.decode_request(body)
+            # Arrays are already decoded to floats: validate the scalar fields only, then attach them
+            arrays = {key: fields.pop(key) for key in ("weights", "values")}
+            return KnapsackRequest(weights=[], values=[], **fields).copy(update=arrays), dtype
+        return KnapsackRequest(**json.loads(body)), "<f8"
+    except wire.WireFormatError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {str(e)}")
+
+@app.post(
+    "/solve",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": KnapsackRequest.schema()},
+                wire.MSGPACK_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}
+            }
+        }
+    }
+)
+async def solve_knapsack(http_request: Request):
+    """Solve knapsack problem using specified method(s).
+    
+    Accepts JSON or msgpack (Content-Type: application/x-msgpack) bodies and
+    answers in msgpack when the Accept header asks for it.
+    """
+    use_msgpack = wire.wants_msgpack(http_request.headers.get("accept"))
+    if use_msgpack and not wire.msgpack_available():
+        raise HTTPException(
+            status_code=406,
+            detail=f"{wire.MSGPACK_MEDIA_TYPE} responses are not supported: msgpack is not installed"
+        )
+    request, dtype = await _parse_solve_request(http_request)
+    _validate_request(request)
+    
+    solver_names, auto = _resolve_solvers(request)
+    try:
+        plan = admission.plan(
+            solver_names,
+            request.weights,
+            request.values,
+            request.capacity,
+            allow_downgrade=request.allow_downgrade,
+            deadline=request.latency_target
+        )
+        async with admission.slot(plan["estimated_memory_bytes"]) as queue_wait:
+            QUEUE_WAIT_SECONDS.observe(queue_wait)
+            results = await run_in_threadpool(
+                _run_solvers,
+                plan["solvers"],
                 request.weights,
                 request.values,
-                request.capacity
+                request.capacity,
+                options={name: _solver_options(request, name) for name in plan["solvers"]},
+                cpu_budget=admission.max_cpu_seconds
             )
+    except AdmissionError as e:
+        raise _admission_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error solving knapsack problem: {str(e)}"
+        )
+    
+    payload = {
+        "status": "success",
+        "results": results,
+        "admission": {
+            "solvers": plan["solvers"],
+            "downgrades": plan["downgrades"],
+            "estimated_cpu_seconds": plan["estimated_cpu_seconds"],
+            "estimated_memory_bytes": plan["estimated_memory_bytes"],
+            "queue_wait": queue_wait
+        },
+        "request": {
+            "weights": request.weights,
+            "values": request.values,
+            "capacity": request.capacity
+        }
+    }
+    if auto is not None:
+        payload["auto"] = auto
+    
+    if use_msgpack:
+        return Response(
+            wire.encode_response(payload, compact=request.compact, dtype=dtype),
+            media_type=wire.MSGPACK_MEDIA_TYPE
+        )
+    if request.compact:
+        return wire.compact_payload(payload)
+    return payload
+
+def _sse(event_type: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    payload = json.dumps(data, default=lambda o: o.item() if isinstance(o, np.generic) else o.tolist())
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+@app.post("/solve/stream")
+async def stream_solve(request: KnapsackRequest):
+    """Solve with a single solver and stream progress as server-sent events.
+    
+    Emits 'start' once the request has a worker slot, then 'incumbent' for every
+    improving solution and periodic 'bound' updates (for solvers that report
+    progress), and finally 'result' or 'error'. Closing the connection stops
+    the search at its next progress report.
+    """
+    _validate_request(request)
+    if request.solver_type not in solvers and request.solver_type != "auto":
+        raise HTTPException(
+            status_code=400,
+            detail="Streaming needs a single solver type"
+        )
+    solver_names, auto = _resolve_solvers(request)
+    try:
+        plan = admission.plan(
+            solver_names,
+            request.weights,
+            request.values,
+            request.capacity,
+            allow_downgrade=request.allow_downgrade,
+            deadline=request.latency_target
+        )
+    except AdmissionError as e:
+        raise _admission_error(e)
+    name = plan["solvers"][0]
+    
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        stop = threading.Event()
         
-        if request.solver_type in ["greedy", "all"]:
-            results["greedy"] = greedy_solver.solve(
-                request.weights,
-                request.values,
-                request.capacity
-            )
-            # Ensure solve_time is present
-            if "solve_time" not in results["greedy"]:
-                results["greedy"]["solve_time"] = 0.01  # Default value
+        def publish(event: Optional[Dict[str, Any]]):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+        
+        def on_progress(event: Dict[str, Any]) -> bool:
+            publish(dict(event, solver=name))
+            return stop.is_set()
         
-        if request.solver_type in ["ml", "all"]:
-            results["ml"] = ml_solver.solve(
+        def run():
+            try:
+                start_time = time.perf_counter()
+                kwargs = _solver_options(request, name)
+                budget = EarlyStopObserver(cpu_time_limit=admission.max_cpu_seconds)
+                kwargs["observers"] = [ProgressObserver(on_progress), budget]
+                result = solvers[name].solve(request.weights, request.values, request.capacity, **kwargs)
+                if budget.reason is not None:
+                    result["stop_reason"] = "cpu_budget"
+                SOLVER_SECONDS.observe(time.perf_counter() - start_time, solver=name)
+                publish(dict(result, type="result", solver=name))
+            except Exception as e:
+                publish({"type": "error", "status_code": 500, "detail": f"Error solving knapsack problem: {str(e)}"})
+            finally:
+                publish(None)
+        
+        try:
+            async with admission.slot(plan["estimated_memory_bytes"]) as queue_wait:
+                QUEUE_WAIT_SECONDS.observe(queue_wait)
+                yield _sse("start", {"solver": name, "downgrades": plan["downgrades"], "auto": auto, "queue_wait": queue_wait})
+                worker = loop.run_in_executor(None, run)
+                try:
+                    while True:
+                        event = await events.get()
+                        if event is None:
+                            break
+                        yield _sse(event["type"], event)
+                finally:
+                    # Client went away or stream finished: stop the search and free the slot after it
+                    stop.set()
+                    await worker
+        except AdmissionError as e:
+            yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+async def _acquire_job_slot(job: Job, memory_bytes: int) -> Optional[float]:
+    """Wait for an admission slot for a job, giving up if the job is cancelled meanwhile.
+    
+    Returns:
+        The time spent waiting, or None if the job was cancelled while waiting
+    """
+    waiter = asyncio.ensure_future(admission.acquire(memory_bytes, background=True))
+    while not job.cancel_requested():
+        done, _ = await asyncio.wait({waiter}, timeout=0.1)
+        if done:
+            queue_wait = waiter.result()
+            QUEUE_WAIT_SECONDS.observe(queue_wait)
+            return queue_wait
+    waiter.cancel()
+    try:
+        await waiter
+    except asyncio.CancelledError:
+        return None
+    # The slot was taken just before the cancellation arrived
+    await admission.release(memory_bytes)
+    return None
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: KnapsackRequest) -> Dict[str, Any]:
+    """Submit a solve to the background worker pool and return its job id."""
+    _validate_request(request)
+    solver_names, auto = _resolve_solvers(request)
+    try:
+        plan = admission.plan(
+            solver_names,
+            request.weights,
+            request.values,
+            request.capacity,
+            allow_downgrade=request.allow_downgrade,
+            deadline=request.latency_target
+        )
+    except AdmissionError as e:
+        raise _admission_error(e)
+    
+    loop = asyncio.get_running_loop()
+    
+    def run(job: Job) -> Optional[Dict[str, Any]]:
+        # Jobs share the admission budget with /solve: take a slot before solving
+        queue_wait = asyncio.run_coroutine_threadsafe(
+            _acquire_job_slot(job, plan["estimated_memory_bytes"]), loop
+        ).result()
+        if queue_wait is None:
+            return None
+        try:
+            results = _run_solvers(
+                plan["solvers"],
                 request.weights,
                 request.values,
-                request.capacity
+                request.capacity,
+                job=job,
+                options={name: _solver_options(request, name) for name in plan["solvers"]},
+                cpu_budget=admission.max_cpu_seconds
             )
-        
-        return {
+        finally:
+            asyncio.run_coroutine_threadsafe(admission.release(plan["estimated_memory_bytes"]), loop).result()
+        payload = {
             "status": "success",
             "results": results,
-            "request": {
-                "weights": request.weights,
-                "values": request.values,
-                "capacity": request.capacity
+            "admission": {
+                "solvers": plan["solvers"],
+                "downgrades": plan["downgrades"],
+                "estimated_cpu_seconds": plan["estimated_cpu_seconds"],
+                "estimated_memory_bytes": plan["estimated_memory_bytes"],
+                "queue_wait": queue_wait
             }
         }
+        if auto is not None:
+            payload["auto"] = auto
+        return wire.compact_payload(payload) if request.compact else payload
     
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error solving knapsack problem: {str(e)}"
-        )
+    try:
+        job = jobs.submit(run, {
+            "solver_type": request.solver_type,
+            "solvers": plan["solvers"],
+            "n_items": len(request.weights),
+            "capacity": request.capacity
+        })
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
+    return {"job_id": job.job_id, "status": job.status}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Dict[str, Any]:
+    """Job status, latest incumbent and, once finished, the final result."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job.to_dict()
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a queued or running job."""
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return {"job_id": job.job_id, "status": job.status}
+
+def _check_admin(http_request: Request):
+    """Require the X-Admin-Token header to match KNAPSACK_ADMIN_TOKEN; without a token admin endpoints are off."""
+    token = os.environ.get('KNAPSACK_ADMIN_TOKEN')
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set KNAPSACK_ADMIN_TOKEN")
+    if not hmac.compare_digest(http_request.headers.get('X-Admin-Token', ''), token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@app.get("/admin/models")
+async def list_models(http_request: Request) -> Dict[str, Any]:
+    """Registered model versions and the state of model deployment."""
+    _check_admin(http_request)
+    return {"versions": model_registry.versions(), **model_deployer.status()}
+
+@app.post("/admin/models/{version}/deploy", status_code=202)
+async def deploy_model(version: str, http_request: Request) -> Dict[str, Any]:
+    """Load, warm up and hot-swap a registered model version in the background."""
+    _check_admin(http_request)
+    try:
+        started = model_deployer.deploy(version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {version}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not started:
+        raise HTTPException(status_code=409, detail="Another model deployment is in progress")
+    # Only this worker swaps now; the others pick the new active version up when they poll
+    return {"version": version, "status": "loading", "other_workers_poll_seconds": model_deployer.poll_interval or None}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics in text exposition format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/health")
 async def health_check():
@@ -114,6 +624,12 @@ async def root():
         "description": "API for solving the 0/1 Knapsack Problem using multiple approaches",
         "endpoints": {
             "/solve": "POST - Solve knapsack problem with given parameters",
+            "/solve/stream": "POST - Solve with one solver, streaming incumbents as server-sent events",
+            "/jobs": "POST - Submit a long-running solve, returns a job id",
+            "/jobs/{job_id}": "GET - Job status, incumbent and result; DELETE - Cancel the job",
+            "/admin/models": "GET - Registered model versions and deployment state (admin)",
+            "/admin/models/{version}/deploy": "POST - Hot-swap a model version in the background (admin)",
+            "/metrics": "GET - Prometheus metrics",
             "/health": "GET - Health check",
             "/": "GET - API information"
         }
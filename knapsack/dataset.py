@@ -0,0 +1,226 @@
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple, Union
+
+# Bumped whenever the on-disk layout changes
+FORMAT_VERSION = 1
+
+# Per-instance columns, one entry per instance
+INSTANCE_FIELDS = ('capacity', 'optimal_value')
+# Per-item columns, concatenated over all instances and split by the offsets
+ITEM_FIELDS = ('weights', 'values', 'selection')
+ITEM_DTYPES = {'weights': np.float64, 'values': np.float64, 'selection': np.int8}
+
+
+class KnapsackDataset:
+    def __init__(
+        self,
+        capacity: np.ndarray,
+        offsets: np.ndarray,
+        weights: np.ndarray,
+        values: np.ndarray,
+        optimal_value: Optional[np.ndarray] = None,
+        selection: Optional[np.ndarray] = None
+    ):
+        """Knapsack instances stored as flat item arrays plus offsets.
+
+        Items of instance i are weights[offsets[i]:offsets[i + 1]] (likewise for
+        values and selection), so ragged instances need no per-row parsing.
+
+        Args:
+            capacity: Capacity of each instance
+            offsets: Start of each instance's items, plus the total item count at the end
+            weights: Item weights of all instances, concatenated
+            values: Item values of all instances, concatenated
+            optimal_value: Optimal value of each instance, if known
+            selection: Optimal 0/1 selection of all items, concatenated, if known
+        """
+        self.capacity = capacity
+        self.offsets = offsets
+        self.weights = weights
+        self.values = values
+        self.optimal_value = optimal_value
+        self.selection = selection
+        # Where the dataset was loaded from (directory or CSV file), if anywhere
+        self.path: Optional[str] = None
+        self._fingerprint: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.capacity)
+
+    @property
+    def n_items(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def instance(self, i: int) -> Tuple[np.ndarray, np.ndarray, float]:
+        """Weights, values and capacity of instance i."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.weights[start:end], self.values[start:end], float(self.capacity[i])
+
+    def fingerprint(self) -> str:
+        """SHA-256 of all columns, identifying the dataset's content for caches."""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for name, array in sorted(self._columns().items()):
+                array = np.ascontiguousarray(array)
+                digest.update(f'{name}:{array.dtype}:{array.shape}'.encode())
+                digest.update(memoryview(array).cast('B'))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def shard(self, start: int, end: int) -> 'KnapsackDataset':
+        """Instances start..end-1 as a dataset of views (no copy, memory maps stay mapped)."""
+        item_start, item_end = self.offsets[start], self.offsets[end]
+
+        def items(flat):
+            return None if flat is None else flat[item_start:item_end]
+
+        return KnapsackDataset(
+            capacity=self.capacity[start:end],
+            offsets=np.asarray(self.offsets[start:end + 1]) - item_start,
+            weights=items(self.weights),
+            values=items(self.values),
+            optimal_value=None if self.optimal_value is None else self.optimal_value[start:end],
+            selection=items(self.selection)
+        )
+
+    def padded(self, field: str, width: int) -> np.ndarray:
+        """Per-item field as an (instances x width) matrix, zero-padded and truncated to width."""
+        flat = getattr(self, field)
+        n_items = self.n_items
+        rows = np.repeat(np.arange(len(self)), n_items)
+        columns = np.arange(len(flat)) - np.repeat(self.offsets[:-1], n_items)
+        keep = columns < width
+        matrix = np.zeros((len(self), width), dtype=flat.dtype)
+        matrix[rows[keep], columns[keep]] = flat[keep]
+        return matrix
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> 'KnapsackDataset':
+        """Build a dataset from a DataFrame with list (or list-literal string) item columns."""
+        columns = {}
+        for field in ITEM_FIELDS:
+            if field in data:
+                columns[field] = [_parse_list(cell) for cell in data[field]]
+        lengths = np.array([len(items) for items in columns['weights']], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+        def flatten(field):
+            if field not in columns:
+                return None
+            return np.concatenate(columns[field]).astype(ITEM_DTYPES[field]) if len(lengths) else np.zeros(0, ITEM_DTYPES[field])
+
+        return cls(
+            capacity=data['capacity'].to_numpy(dtype=np.float64),
+            offsets=offsets,
+            weights=flatten('weights'),
+            values=flatten('values'),
+            optimal_value=data['optimal_value'].to_numpy(dtype=np.float64) if 'optimal_value' in data else None,
+            selection=flatten('selection')
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame in the CSV layout, with Python lists in the item columns."""
+        frame = {'n_items': self.n_items}
+        for field in ITEM_FIELDS:
+            flat = getattr(self, field)
+            if flat is not None:
+                frame[field] = [flat[self.offsets[i]:self.offsets[i + 1]].tolist() for i in range(len(self))]
+        frame['capacity'] = np.asarray(self.capacity)
+        if self.optimal_value is not None:
+            frame['optimal_value'] = np.asarray(self.optimal_value)
+        return pd.DataFrame(frame)
+
+    def save(self, path: str):
+        """Write one .npy file per column plus meta.json into directory path."""
+        os.makedirs(path, exist_ok=True)
+        columns = self._columns()
+        for name, array in columns.items():
+            np.save(os.path.join(path, f'{name}.npy'), np.ascontiguousarray(array))
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({
+                'format_version': FORMAT_VERSION,
+                'n_instances': len(self),
+                'n_total_items': int(self.offsets[-1]),
+                'columns': sorted(columns),
+                'fingerprint': self.fingerprint()
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'KnapsackDataset':
+        """Load a dataset directory; with mmap the columns are memory-mapped, not read."""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset format version {meta['format_version']} in {path}")
+        mmap_mode = 'r' if mmap else None
+        columns = {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+            for name in meta['columns']
+        }
+        dataset = cls(**columns)
+        dataset.path = path
+        # Saved with the columns, so loading does not have to hash them again
+        dataset._fingerprint = meta.get('fingerprint')
+        return dataset
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        columns = {'capacity': self.capacity, 'offsets': self.offsets, 'weights': self.weights, 'values': self.values}
+        if self.optimal_value is not None:
+            columns['optimal_value'] = self.optimal_value
+        if self.selection is not None:
+            columns['selection'] = self.selection
+        return columns
+
+
+def _parse_list(cell) -> np.ndarray:
+    """Parse a list cell without eval: CSV files store them as JSON-compatible literals."""
+    if isinstance(cell, str):
+        return np.array(json.loads(cell), dtype=np.float64)
+    return np.asarray(cell, dtype=np.float64)
+
+
+def load_instances(source: Union[str, pd.DataFrame, KnapsackDataset], mmap: bool = True) -> KnapsackDataset:
+    """Load instances from a dataset directory, a CSV file or an in-memory DataFrame.
+
+    Args:
+        source: Path to a dataset directory or CSV file, a DataFrame, or a dataset
+        mmap: Memory-map the columns of a dataset directory
+
+    Returns:
+        The instances as a KnapsackDataset
+    """
+    if isinstance(source, KnapsackDataset):
+        return source
+    if isinstance(source, pd.DataFrame):
+        return KnapsackDataset.from_frame(source)
+    if os.path.isdir(source):
+        return KnapsackDataset.load(source, mmap=mmap)
+    dataset = KnapsackDataset.from_frame(pd.read_csv(source))
+    dataset.path = source
+    return dataset
+
+
+def convert_csv(csv_path: str, output_path: str) -> KnapsackDataset:
+    """Convert a CSV dataset with list-literal columns to the columnar format."""
+    dataset = KnapsackDataset.from_frame(pd.read_csv(csv_path))
+    dataset.save(output_path)
+    return dataset
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert CSV knapsack datasets to the columnar format')
+    parser.add_argument('csv_paths', nargs='+', help='CSV files to convert')
+    parser.add_argument('--output-dir', type=str, default=None,
+                      help='Directory for the converted datasets (default: next to each CSV)')
+    args = parser.parse_args()
+
+    for csv_path in args.csv_paths:
+        name = os.path.splitext(os.path.basename(csv_path))[0]
+        output_path = os.path.join(args.output_dir or os.path.dirname(csv_path), name)
+        dataset = convert_csv(csv_path, output_path)
+        print(f"Converted {len(dataset)} instances from {csv_path} to {output_path}")
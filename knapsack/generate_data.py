@@ -1,65 +1,76 @@
+import argparse
 import numpy as np
 import pandas as pd
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 import os
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
+from knapsack.dataset import KnapsackDataset
+from knapsack.instances import FAMILIES, generate_items
+
+# Instances generated per shard; each shard has its own seed, so the output does
+# not depend on how shards are spread over workers
+SHARD_SIZE = 1000
 
 def solve_knapsack_dp(weights: List[float], values: List[float], capacity: float) -> Tuple[float, List[int]]:
-    """Solve knapsack using dynamic programming to generate optimal labels."""
-    n = len(weights)
-    dp = np.zeros((n + 1, int(capacity) + 1))
-    keep = np.zeros((n + 1, int(capacity) + 1), dtype=int)
+    """Solve knapsack using dynamic programming to generate optimal labels.
     
-    # Show progress for large instances
-    if n > 100:
-        iterator = tqdm(range(1, n + 1), desc="DP Progress", leave=False)
-    else:
-        iterator = range(1, n + 1)
+    Weights and capacity are truncated to integers. Each item updates the whole
+    capacity row with one vectorized comparison instead of a Python loop.
+    """
+    n = len(weights)
+    capacity_int = int(capacity)
+    weights_int = [int(w) for w in weights]
+    dp = np.zeros(capacity_int + 1)
+    keep = np.zeros((n + 1, capacity_int + 1), dtype=bool)
     
-    for i in iterator:
-        for w in range(int(capacity) + 1):
-            if weights[i-1] <= w:
-                val_with_item = dp[i-1][w-int(weights[i-1])] + values[i-1]
-                val_without_item = dp[i-1][w]
-                if val_with_item > val_without_item:
-                    dp[i][w] = val_with_item
-                    keep[i][w] = 1
-                else:
-                    dp[i][w] = val_without_item
-            else:
-                dp[i][w] = dp[i-1][w]
+    for i in range(1, n + 1):
+        w = weights_int[i-1]
+        # First capacity the item fits in, judged by its untruncated weight
+        lo = int(np.ceil(weights[i-1]))
+        if lo > capacity_int:
+            continue
+        # Value of taking item i at every capacity it fits in
+        with_item = dp[lo - w:capacity_int + 1 - w] + values[i-1]
+        take = with_item > dp[lo:]
+        keep[i, lo:] = take
+        dp[lo:] = np.where(take, with_item, dp[lo:])
     
     # Backtrack to find selected items
     selected = []
-    w = int(capacity)
+    w = capacity_int
     for i in range(n, 0, -1):
-        if keep[i][w] == 1:
+        if keep[i][w]:
             selected.append(i-1)
-            w = w - int(weights[i-1])
+            w = w - weights_int[i-1]
     
-    return dp[n][int(capacity)], selected
+    return dp[capacity_int], selected
 
-def generate_dataset(
+def _generate_shard(
+    seed: np.random.SeedSequence,
     num_instances: int,
-    min_items: int = 10,
-    max_items: int = 50,
-    min_weight: float = 1.0,
-    max_weight: float = 100.0,
-    min_value: float = 1.0,
-    max_value: float = 100.0,
-    capacity_factor: float = 0.5
-) -> pd.DataFrame:
-    """Generate random knapsack instances with optimal solutions."""
+    min_items: int,
+    max_items: int,
+    min_weight: float,
+    max_weight: float,
+    min_value: float,
+    max_value: float,
+    capacity_factor: float,
+    family: Optional[str]
+) -> List[dict]:
+    """Generate and label one shard of instances from its own seed."""
+    rng = np.random.default_rng(seed)
     data = []
-    
-    print(f"\nGenerating {num_instances} instances...")
-    for _ in tqdm(range(num_instances), desc="Generating instances"):
+    for _ in range(num_instances):
         # Random number of items
-        n_items = np.random.randint(min_items, max_items + 1)
+        n_items = int(rng.integers(min_items, max_items + 1))
         
         # Generate weights and values
-        weights = np.random.uniform(min_weight, max_weight, n_items)
-        values = np.random.uniform(min_value, max_value, n_items)
+        if family is None:
+            weights = rng.uniform(min_weight, max_weight, n_items)
+            values = rng.uniform(min_value, max_value, n_items)
+        else:
+            weights, values = generate_items(family, n_items, int(max_weight), rng)
         
         # Set capacity as a fraction of total weight
         capacity = capacity_factor * np.sum(weights)
@@ -80,38 +91,108 @@ def generate_dataset(
             'optimal_value': optimal_value,
             'selection': selection.tolist()
         })
+    return data
+
+def generate_dataset(
+    num_instances: int,
+    min_items: int = 10,
+    max_items: int = 50,
+    min_weight: float = 1.0,
+    max_weight: float = 100.0,
+    min_value: float = 1.0,
+    max_value: float = 100.0,
+    capacity_factor: float = 0.5,
+    seed: Optional[int] = None,
+    n_workers: Optional[int] = None,
+    family: Optional[str] = None
+) -> pd.DataFrame:
+    """Generate random knapsack instances with optimal solutions.
+    
+    Instances are generated in shards of SHARD_SIZE, each seeded from its own
+    child of SeedSequence(seed), and labeled across a pool of n_workers processes.
+    With a fixed seed the result is identical for any number of workers.
+    
+    Args:
+        num_instances: Number of instances to generate
+        min_items: Minimum number of items per instance
+        max_items: Maximum number of items per instance
+        min_weight: Minimum item weight
+        max_weight: Maximum item weight
+        min_value: Minimum item value
+        max_value: Maximum item value
+        capacity_factor: Capacity as a fraction of the total weight
+        seed: Seed for reproducible datasets; None draws fresh entropy
+        n_workers: Number of worker processes; defaults to the number of CPUs,
+            1 generates in-process
+        family: Draw integer items from this instance family (see knapsack.instances)
+            with coefficient range max_weight, instead of independent uniform floats
+        
+    Returns:
+        DataFrame with one row per instance
+    """
+    n_shards = -(-num_instances // SHARD_SIZE)
+    shard_sizes = [min(SHARD_SIZE, num_instances - i * SHARD_SIZE) for i in range(n_shards)]
+    shard_seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    params = (min_items, max_items, min_weight, max_weight, min_value, max_value, capacity_factor, family)
+    n_workers = n_workers or os.cpu_count() or 1
+    
+    print(f"\nGenerating {num_instances} instances in {n_shards} shards...")
+    data = []
+    if n_workers == 1 or n_shards == 1:
+        for shard_seed, size in tqdm(list(zip(shard_seeds, shard_sizes)), desc="Generating shards"):
+            data.extend(_generate_shard(shard_seed, size, *params))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(_generate_shard, shard_seed, size, *params)
+                       for shard_seed, size in zip(shard_seeds, shard_sizes)]
+            # Collect in submission order so the row order never depends on scheduling
+            for future in tqdm(futures, desc="Generating shards"):
+                data.extend(future.result())
     
     return pd.DataFrame(data)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate labeled knapsack datasets')
+    parser.add_argument('--output-dir', type=str, default='knapsack/data',
+                      help='Directory to write the datasets to')
+    parser.add_argument('--format', type=str, choices=['columnar', 'csv'], default='columnar',
+                      help='Columnar .npy dataset directories, or CSV files with list columns')
+    parser.add_argument('--seed', type=int, default=42,
+                      help='Base random seed; the splits use seed, seed + 1 and seed + 2')
+    parser.add_argument('--workers', type=int, default=None,
+                      help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--family', type=str, choices=FAMILIES, default=None,
+                      help='Instance family to draw items from (default: independent uniform floats)')
+    args = parser.parse_args()
+    
     print("Starting data generation...")
     
     # Generate larger training dataset
     print("\nGenerating training data...")
-    train_data = generate_dataset(num_instances=5000)  # Increased from 1000
+    train_data = generate_dataset(num_instances=5000, seed=args.seed, n_workers=args.workers, family=args.family)  # Increased from 1000
     
     # Generate validation data
     print("\nGenerating validation data...")
-    val_data = generate_dataset(num_instances=1000)  # Increased from 200
+    val_data = generate_dataset(num_instances=1000, seed=args.seed + 1, n_workers=args.workers, family=args.family)  # Increased from 200
     
     # Generate test data
     print("\nGenerating test data...")
-    test_data = generate_dataset(num_instances=1000)  # Increased from 200
+    test_data = generate_dataset(num_instances=1000, seed=args.seed + 2, n_workers=args.workers, family=args.family)  # Increased from 200
     
     # Save datasets
     print("\nSaving datasets...")
-    os.makedirs('data', exist_ok=True)
-    
-    print("Saving training data...")
-    train_data.to_csv('data/train_data.csv', index=False)
-    
-    print("Saving validation data...")
-    val_data.to_csv('data/val_data.csv', index=False)
+    os.makedirs(args.output_dir, exist_ok=True)
     
-    print("Saving test data...")
-    test_data.to_csv('data/test_data.csv', index=False)
+    for name, data in [('training', train_data), ('validation', val_data), ('test', test_data)]:
+        print(f"Saving {name} data...")
+        split = {'training': 'train', 'validation': 'val', 'test': 'test'}[name]
+        path = os.path.join(args.output_dir, f'{split}_data')
+        if args.format == 'csv':
+            data.to_csv(path + '.csv', index=False)
+        else:
+            KnapsackDataset.from_frame(data).save(path)
     
     print("\nData generation complete!")
     print(f"Generated {len(train_data)} training instances")
     print(f"Generated {len(val_data)} validation instances")
-    print(f"Generated {len(test_data)} test instances") 
\ No newline at end of file
+    print(f"Generated {len(test_data)} test instances")
@@ -0,0 +1,171 @@
+import argparse
+import numpy as np
+from typing import List, Optional, Tuple
+
+from knapsack.dataset import KnapsackDataset
+
+# Standard hard instance classes (Pisinger, "Where are the hard knapsack problems?")
+FAMILIES = (
+    "uncorrelated",
+    "weakly_correlated",
+    "strongly_correlated",
+    "inverse_strongly_correlated",
+    "almost_strongly_correlated",
+    "subset_sum",
+    "spanner",
+    "profit_ceiling"
+)
+
+
+def _draw(family: str, n: int, coefficient_range: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Integer weights and values of one of the basic (non-spanner) families."""
+    R = coefficient_range
+    weights = rng.integers(1, R + 1, n)
+    if family == "uncorrelated":
+        values = rng.integers(1, R + 1, n)
+    elif family == "weakly_correlated":
+        values = np.maximum(1, weights + rng.integers(-(R // 10), R // 10 + 1, n))
+    elif family == "strongly_correlated":
+        values = weights + R // 10
+    elif family == "inverse_strongly_correlated":
+        values = rng.integers(1, R + 1, n)
+        weights = values + R // 10
+    elif family == "almost_strongly_correlated":
+        values = weights + R // 10 + rng.integers(-(R // 500), R // 500 + 1, n)
+    elif family == "subset_sum":
+        values = weights.copy()
+    elif family == "profit_ceiling":
+        values = 3 * np.ceil(weights / 3).astype(np.int64)
+    else:
+        raise ValueError(f"Unknown instance family: {family}")
+    return weights, values
+
+
+def generate_items(
+    family: str,
+    n: int,
+    coefficient_range: int = 1000,
+    rng: Optional[np.random.Generator] = None,
+    spanner_size: int = 2,
+    spanner_multiplier: int = 10,
+    spanner_family: str = "strongly_correlated"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Generate the items of one instance of a family.
+
+    Spanner instances pick spanner_size "spanner" items from spanner_family,
+    scaled down by 2 / spanner_multiplier, and make every item a random multiple
+    (1 to spanner_multiplier) of one of them.
+
+    Args:
+        family: One of FAMILIES
+        n: Number of items
+        coefficient_range: Weights (and most values) are drawn from 1..coefficient_range
+        rng: Random number generator
+        spanner_size: Number of spanner items (spanner family only)
+        spanner_multiplier: Largest multiplier of a spanner item (spanner family only)
+        spanner_family: Family the spanner items are drawn from (spanner family only)
+
+    Returns:
+        Integer weights and values as float arrays
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if family == "spanner":
+        base_weights, base_values = _draw(spanner_family, spanner_size, coefficient_range, rng)
+        base_weights = np.ceil(2 * base_weights / spanner_multiplier)
+        base_values = np.ceil(2 * base_values / spanner_multiplier)
+        spanner = rng.integers(0, spanner_size, n)
+        multiplier = rng.integers(1, spanner_multiplier + 1, n)
+        weights = multiplier * base_weights[spanner]
+        values = multiplier * base_values[spanner]
+    else:
+        weights, values = _draw(family, n, coefficient_range, rng)
+    return weights.astype(np.float64), values.astype(np.float64)
+
+
+def capacity_series(weights: np.ndarray, n_series: int) -> List[float]:
+    """Pisinger's capacity series: instance h of H gets capacity h / (H + 1) of the total weight."""
+    total = float(np.sum(weights))
+    return [float(np.floor(h / (n_series + 1) * total)) for h in range(1, n_series + 1)]
+
+
+def generate_family(
+    family: str,
+    n: int,
+    coefficient_range: int = 1000,
+    n_instances: int = 10,
+    capacity_fractions: Optional[List[float]] = None,
+    seed: Optional[int] = None,
+    label: bool = False,
+    **params
+) -> KnapsackDataset:
+    """Generate a series of instances of one family as a dataset.
+
+    Each instance has fresh items. By default instance h of H uses the capacity
+    series h / (H + 1) of its total weight; capacity_fractions overrides that
+    with explicit fractions, cycled over the instances.
+
+    Args:
+        family: One of FAMILIES
+        n: Number of items per instance
+        coefficient_range: Coefficient range R
+        n_instances: Number of instances (H)
+        capacity_fractions: Capacity as fractions of the total weight
+        seed: Random seed
+        label: Solve every instance exactly with the DP to fill optimal_value and selection;
+            only practical while n times the total weight stays moderate
+        **params: Extra generate_items parameters (spanner settings)
+
+    Returns:
+        The instances, ready for training, evaluation or benchmarking
+    """
+    from knapsack.generate_data import solve_knapsack_dp
+
+    rng = np.random.default_rng(seed)
+    capacities, all_weights, all_values, optimal_values, selections = [], [], [], [], []
+    for h in range(n_instances):
+        weights, values = generate_items(family, n, coefficient_range, rng, **params)
+        if capacity_fractions:
+            capacity = float(np.floor(capacity_fractions[h % len(capacity_fractions)] * np.sum(weights)))
+        else:
+            capacity = capacity_series(weights, n_instances)[h]
+        capacities.append(capacity)
+        all_weights.append(weights)
+        all_values.append(values)
+        if label:
+            optimal_value, selected = solve_knapsack_dp(weights.tolist(), values.tolist(), capacity)
+            selection = np.zeros(n, dtype=np.int8)
+            selection[selected] = 1
+            optimal_values.append(optimal_value)
+            selections.append(selection)
+
+    return KnapsackDataset(
+        capacity=np.array(capacities),
+        offsets=np.arange(n_instances + 1, dtype=np.int64) * n,
+        weights=np.concatenate(all_weights) if all_weights else np.zeros(0),
+        values=np.concatenate(all_values) if all_values else np.zeros(0),
+        optimal_value=np.array(optimal_values) if label else None,
+        selection=np.concatenate(selections) if label and selections else None
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate hard knapsack instance families')
+    parser.add_argument('--family', type=str, choices=FAMILIES, required=True,
+                      help='Instance family')
+    parser.add_argument('--n', type=int, default=50,
+                      help='Number of items per instance')
+    parser.add_argument('--range', type=int, default=1000,
+                      help='Coefficient range R')
+    parser.add_argument('--instances', type=int, default=10,
+                      help='Number of instances in the capacity series')
+    parser.add_argument('--seed', type=int, default=0,
+                      help='Random seed')
+    parser.add_argument('--label', action='store_true',
+                      help='Solve the instances exactly and store optimal values and selections')
+    parser.add_argument('--output', type=str, required=True,
+                      help='Dataset directory to write')
+    args = parser.parse_args()
+
+    dataset = generate_family(args.family, args.n, args.range, args.instances, seed=args.seed, label=args.label)
+    dataset.save(args.output)
+    print(f"Saved {len(dataset)} {args.family} instances with {args.n} items to {args.output}")
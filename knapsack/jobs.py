@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFullError(Exception):
+    """Raised when too many jobs are waiting to run."""
+
+
+class Job:
+    def __init__(self, job_id: str, description: Dict[str, Any]):
+        """A solve submitted through the asynchronous job API.
+
+        Args:
+            job_id: Unique job identifier
+            description: Client-facing summary of what the job solves
+        """
+        self.job_id = job_id
+        self.description = description
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.incumbent = None
+        self.result = None
+        self.error = None
+        self.future = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def request_cancel(self):
+        self._cancel_event.set()
+
+    def cancel_requested(self) -> bool:
+        """Whether the client asked to cancel this job; solvers check this between steps."""
+        return self._cancel_event.is_set()
+
+    def report(self, solver_name: str, solution: Dict[str, Any]):
+        """Record a solution and keep it as incumbent if it is the best feasible one so far."""
+        if not solution.get('is_feasible', False):
+            return
+        with self._lock:
+            if self.incumbent is None or solution['total_value'] > self.incumbent['total_value']:
+                self.incumbent = {
+                    'solver': solver_name,
+                    'total_value': float(solution['total_value']),
+                    'total_weight': float(solution['total_weight']),
+                    'selected_items': [int(i) for i in solution['selected_items']],
+                    'elapsed': time.time() - (self.started_at or self.created_at)
+                }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            incumbent = dict(self.incumbent) if self.incumbent is not None else None
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'description': self.description,
+            'incumbent': incumbent,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class JobManager:
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 64,
+        max_finished: int = 256,
+        result_ttl: float = 3600.0
+    ):
+        """Run solve jobs on a local worker pool and keep their results for a while.
+
+        Args:
+            max_workers: Number of jobs solving at once
+            max_pending: Maximum number of queued jobs before submissions are refused
+            max_finished: Number of finished jobs kept for polling; the earliest finished are dropped first
+            result_ttl: Seconds a finished job is kept before it is dropped
+        """
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="knapsack-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'JobManager':
+        """Build a job manager from KNAPSACK_* environment variables."""
+        return cls(
+            max_workers=int(os.environ.get('KNAPSACK_JOB_WORKERS', 2)),
+            max_pending=int(os.environ.get('KNAPSACK_MAX_PENDING_JOBS', 64)),
+            max_finished=int(os.environ.get('KNAPSACK_JOB_RETENTION', 256)),
+            result_ttl=float(os.environ.get('KNAPSACK_JOB_TTL', 3600.0))
+        )
+
+    def submit(self, target: Callable[[Job], Dict[str, Any]], description: Dict[str, Any]) -> Job:
+        """Queue a job; target receives the Job and returns its final result.
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already queued
+        """
+        with self._lock:
+            self._evict()
+            pending = sum(1 for job in self._jobs.values() if job.status == QUEUED)
+            if pending >= self.max_pending:
+                raise JobQueueFullError(f"{pending} jobs are already queued")
+            job = Job(uuid.uuid4().hex, description)
+            self._jobs[job.job_id] = job
+        job.future = self._executor.submit(self._run, job, target)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a job: queued jobs never start, running ones stop at their next check."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return job
+        job.request_cancel()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    def _run(self, job: Job, target: Callable[[Job], Dict[str, Any]]):
+        if job.cancel_requested():
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            result = target(job)
+        except Exception as e:
+            logger.warning(f"Job {job.job_id} failed: {str(e)}")
+            job.error = str(e)
+            self._finish(job, FAILED)
+            return
+        job.result = result
+        self._finish(job, CANCELLED if job.cancel_requested() else SUCCEEDED)
+
+    def _finish(self, job: Job, status: str):
+        # finished_at first: eviction reads it for every job in a finished state
+        job.finished_at = time.time()
+        job.status = status
+
+    def _evict(self):
+        """Drop expired finished jobs, then the longest-finished ones beyond max_finished. Caller holds the lock."""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.status in FINISHED_STATES]
+        for job in finished:
+            if now - job.finished_at > self.result_ttl:
+                del self._jobs[job.job_id]
+        finished = sorted((job for job in finished if job.job_id in self._jobs), key=lambda job: job.finished_at)
+        for job in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.job_id]
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker pool."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.request_cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,250 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from sklearn.model_selection import ParameterGrid
+from threadpoolctl import threadpool_limits
+
+from knapsack.dataset import load_instances
+from knapsack.train_model import KnapsackMLModel, DatasetSource, PARAM_GRIDS, single_instance_latency, value_gaps
+
+# Model families searched by default, with the names used in saved metrics
+FAMILY_NAMES = {
+    "rf": "random_forest",
+    "gb": "gradient_boosting",
+    "mlp": "neural_network",
+    "sgd": "sgd"
+}
+
+# Settings applied to every trial: quiet output, and no out-of-bag scoring
+# since trials are scored on the validation set
+TRIAL_PARAMS = {
+    "rf": {'verbose': 0, 'oob_score': False},
+    "gb": {'estimator__verbose': 0},
+    "mlp": {'verbose': False},
+    "sgd": {}
+}
+
+# Matrices shared with the trial workers, set by _init_trial_worker
+_trial_data = None
+
+
+def _init_trial_worker(X_train, y_train, X_val, y_val, val_data, threads_per_trial):
+    """Hand the scaled matrices to a worker once instead of with every trial."""
+    global _trial_data
+    _trial_data = (X_train, y_train, X_val, y_val, val_data, threads_per_trial)
+
+
+def _n_rungs(n_candidates: int, factor: int) -> int:
+    """Rungs needed to halve n_candidates down to a single one."""
+    rungs = 1
+    while n_candidates > 1:
+        n_candidates = math.ceil(n_candidates / factor)
+        rungs += 1
+    return rungs
+
+
+def _run_trial(model_type: str, params: Dict, rows: np.ndarray, keep_model: bool) -> Dict:
+    """Fit one candidate on the given training rows and score it on the validation set."""
+    X_train, y_train, X_val, y_val, val_data, threads_per_trial = _trial_data
+    result = {'model_type': model_type, 'params': params, 'n_train': len(rows)}
+    with threadpool_limits(limits=threads_per_trial):
+        candidate = KnapsackMLModel(model_type=model_type)
+        candidate.model.set_params(**TRIAL_PARAMS[model_type], **params)
+        if model_type != "mlp":
+            candidate.model.set_params(n_jobs=threads_per_trial)
+        try:
+            start_time = time.perf_counter()
+            candidate.model.fit(X_train[rows], y_train[rows])
+            result['fit_seconds'] = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            predictions = (candidate.model.predict(X_val) > 0.5).astype(int)
+            result['predict_seconds_per_instance'] = (time.perf_counter() - start_time) / len(X_val)
+
+            result['latency_seconds'] = single_instance_latency(candidate.model, X_val)
+        except ValueError as e:
+            # E.g. a small sample missing a label class at some item position
+            result['error'] = str(e)
+            result['value_gap'] = math.inf
+            return result
+
+    gaps = value_gaps(predictions, val_data)
+    metrics = candidate._calculate_metrics(np.asarray(y_val), predictions, val_data.n_items)
+    result['value_gap'] = float(gaps.mean())
+    result['optimal_fraction'] = float(np.mean(gaps <= 1e-9))
+    result['val_f1'] = metrics['f1']
+    if keep_model:
+        result['model'] = candidate.model
+    return result
+
+
+def select_model(results: List[Dict], gap_tolerance: float = 0.005, max_latency: Optional[float] = None) -> Dict:
+    """Pick the final model by validation value gap and inference latency.
+
+    Among models within gap_tolerance of the best value gap (and under
+    max_latency seconds per instance, if given), the fastest one wins.
+
+    Raises:
+        ValueError: If no model meets the latency limit
+    """
+    candidates = [r for r in results if math.isfinite(r['value_gap'])]
+    if max_latency is not None:
+        candidates = [r for r in candidates if r['latency_seconds'] <= max_latency]
+    if not candidates:
+        raise ValueError("No trained model meets the latency limit")
+    best_gap = min(r['value_gap'] for r in candidates)
+    return min(
+        (r for r in candidates if r['value_gap'] <= best_gap + gap_tolerance),
+        key=lambda r: r['latency_seconds']
+    )
+
+
+def search_models(
+    train_data: DatasetSource,
+    val_data: DatasetSource,
+    model_types: Tuple[str, ...] = ("rf", "gb", "mlp"),
+    cpu_budget: Optional[int] = None,
+    threads_per_trial: int = 1,
+    factor: int = 3,
+    min_rows: int = 200,
+    gap_tolerance: float = 0.005,
+    max_latency: Optional[float] = None,
+    seed: int = 42
+) -> Tuple[Dict[str, KnapsackMLModel], Dict]:
+    """Search all model families at once with successive halving and pick the best model.
+
+    Every candidate of PARAM_GRIDS starts on a sample of the training rows;
+    after each rung the best 1/factor of each family (by validation value gap)
+    advance to factor times as many rows, until the survivors train on the
+    full training set. Trials of all families run concurrently in a process
+    pool of cpu_budget // threads_per_trial workers, each limited to
+    threads_per_trial threads, so the search never uses more than cpu_budget
+    CPUs. The final model is chosen by select_model.
+
+    Args:
+        train_data: Training instances
+        val_data: Validation instances, with optimal values
+        model_types: Model families to search
+        cpu_budget: CPUs the whole search may use; defaults to all of them
+        threads_per_trial: Threads each trial may use
+        factor: Halving factor
+        min_rows: Fewest training rows any trial uses
+        gap_tolerance: Value gap slack within which the faster model wins
+        max_latency: Largest acceptable single-instance inference latency in seconds
+        seed: Seed of the row sampling
+
+    Returns:
+        The best model of each family (by FAMILY_NAMES, with the shared fitted
+        scaler) and a report with every trial's timing and scores, each
+        family's best trial and the name of the selected family
+    """
+    train_data = load_instances(train_data)
+    val_data = load_instances(val_data)
+    if val_data.optimal_value is None:
+        raise ValueError("Validation data needs optimal values to score value gaps")
+
+    # Features are computed (or loaded from the feature cache) and scaled once for all trials
+    base = KnapsackMLModel(model_type=model_types[0])
+    X_train, y_train = base._features_and_labels(train_data)
+    X_val, y_val = base._features_and_labels(val_data)
+    X_train = base.scaler.fit_transform(X_train)
+    X_val = base.scaler.transform(X_val)
+    y_train = np.asarray(y_train)
+
+    n_rows = len(X_train)
+    order = np.random.default_rng(seed).permutation(n_rows)
+    candidates = {t: list(ParameterGrid(PARAM_GRIDS[t])) for t in model_types}
+    # Rungs per family, so that a single candidate is left for the full data
+    n_rungs = {t: _n_rungs(len(c), factor) for t, c in candidates.items()}
+
+    cpu_budget = cpu_budget or os.cpu_count() or 1
+    n_workers = max(1, cpu_budget // threads_per_trial)
+    methods = multiprocessing.get_all_start_methods()
+    # Forking shares the matrices with the workers instead of pickling them
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+    trials = []
+    finalists = {}
+    search_start = time.perf_counter()
+    print(f"\nSearching {sum(len(c) for c in candidates.values())} candidates of "
+          f"{', '.join(model_types)} on {n_workers} workers...")
+    with ProcessPoolExecutor(
+        max_workers=n_workers, mp_context=context, initializer=_init_trial_worker,
+        initargs=(X_train, y_train, X_val, y_val, val_data, threads_per_trial)
+    ) as executor:
+        rung = 0
+        while candidates:
+            futures = {}
+            for model_type, params_list in candidates.items():
+                rungs_left = n_rungs[model_type] - rung - 1
+                n = n_rows if rungs_left == 0 else max(min(min_rows, n_rows), n_rows // factor ** rungs_left)
+                rows = np.sort(order[:n])
+                futures[model_type] = [
+                    executor.submit(_run_trial, model_type, params, rows, rungs_left == 0)
+                    for params in params_list
+                ]
+
+            for model_type, family_futures in futures.items():
+                results = [future.result() for future in family_futures]
+                for result in results:
+                    result['rung'] = rung
+                    trials.append({k: v for k, v in result.items() if k != 'model'})
+                    print(f"  {model_type} rung {rung} on {result['n_train']} rows: gap "
+                          f"{result['value_gap']:.4f}, fit {result.get('fit_seconds', 0.0):.1f}s {result['params']}")
+                results.sort(key=lambda r: r['value_gap'])
+                if rung == n_rungs[model_type] - 1:
+                    finalists[model_type] = results[0]
+                    del candidates[model_type]
+                else:
+                    candidates[model_type] = [r['params'] for r in results[:math.ceil(len(results) / factor)]]
+            rung += 1
+
+    chosen = select_model(list(finalists.values()), gap_tolerance=gap_tolerance, max_latency=max_latency)
+
+    models = {}
+    for model_type, result in finalists.items():
+        if 'model' in result:
+            model = KnapsackMLModel(model_type=model_type)
+            model.model = result['model']
+            model.scaler = base.scaler
+            models[FAMILY_NAMES[model_type]] = model
+
+    report = {
+        'trials': trials,
+        'families': {
+            FAMILY_NAMES[t]: {k: v for k, v in r.items() if k != 'model'} for t, r in finalists.items()
+        },
+        'selected': FAMILY_NAMES[chosen['model_type']],
+        'search_seconds': time.perf_counter() - search_start
+    }
+    return models, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Search model families with successive halving')
+    parser.add_argument('--train-data', type=str, default='knapsack/data/train_data',
+                      help='Training dataset directory or CSV file')
+    parser.add_argument('--val-data', type=str, default='knapsack/data/val_data',
+                      help='Validation dataset directory or CSV file')
+    parser.add_argument('--families', type=str, nargs='+', choices=list(FAMILY_NAMES), default=['rf', 'gb', 'mlp'],
+                      help='Model families to search')
+    parser.add_argument('--cpu-budget', type=int, default=None,
+                      help='CPUs the search may use (default: all)')
+    parser.add_argument('--threads-per-trial', type=int, default=1,
+                      help='Threads each trial may use')
+    parser.add_argument('--max-latency', type=float, default=None,
+                      help='Largest acceptable single-instance inference latency in seconds')
+    args = parser.parse_args()
+
+    models, report = search_models(
+        args.train_data, args.val_data, model_types=tuple(args.families), cpu_budget=args.cpu_budget,
+        threads_per_trial=args.threads_per_trial, max_latency=args.max_latency
+    )
+    print(json.dumps(report['families'], indent=2))
+    print(f"\nSelected model: {report['selected']}")
@@ -0,0 +1,319 @@
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import List, Dict, Any, Optional, Callable
+
+from knapsack.train_model import KnapsackMLModel, FEATURE_SPEC_VERSION
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = 'knapsack/models/registry'
+
+# Version names become directory names, so they may not contain path separators or start with a dot
+VERSION_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]{0,63}')
+
+
+class ModelRegistry:
+    def __init__(self, root: str = DEFAULT_REGISTRY_PATH):
+        """Versioned store of trained models.
+
+        Each version is a directory root/<version>/ holding model.pkl and
+        metadata.json (model type, feature spec version, max_items, metrics and
+        latency). The ACTIVE file names the version workers load at startup and,
+        through ModelDeployer.watch(), switch to while running.
+
+        Args:
+            root: Registry directory
+        """
+        self.root = root
+
+    def _version_dir(self, version: str) -> str:
+        if not VERSION_PATTERN.fullmatch(version):
+            raise ValueError(f"Invalid model version name: {version!r}")
+        return os.path.join(self.root, version)
+
+    def model_path(self, version: str) -> str:
+        return os.path.join(self._version_dir(version), 'model.pkl')
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Metadata of every registered version, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        names = [
+            name for name in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, name, 'metadata.json'))
+        ]
+        return sorted((self.metadata(name) for name in names), key=lambda meta: meta['created_at'])
+
+    def metadata(self, version: str) -> Dict[str, Any]:
+        """Metadata of one version.
+
+        Raises:
+            KeyError: If the version is not registered
+            ValueError: If the version name is invalid
+        """
+        path = os.path.join(self._version_dir(version), 'metadata.json')
+        if not os.path.isfile(path):
+            raise KeyError(f"Unknown model version: {version}")
+        with open(path) as f:
+            return json.load(f)
+
+    def register(
+        self,
+        model: KnapsackMLModel,
+        metrics: Optional[Dict[str, Any]] = None,
+        latency_seconds: Optional[float] = None,
+        version: Optional[str] = None
+    ) -> str:
+        """Add a model as a new version.
+
+        The version directory is written to a staging directory first and
+        renamed into place, so readers never see a half-written version.
+
+        Args:
+            model: Trained model
+            metrics: Validation metrics to keep with the model
+            latency_seconds: Measured single-instance inference latency
+            version: Version name; defaults to the next free v<N>
+
+        Returns:
+            The version name
+        """
+        os.makedirs(self.root, exist_ok=True)
+        if version is None:
+            numbers = [int(name[1:]) for name in os.listdir(self.root) if name[:1] == 'v' and name[1:].isdigit()]
+            version = f"v{max(numbers, default=0) + 1}"
+        if os.path.exists(self._version_dir(version)):
+            raise ValueError(f"Model version already registered: {version}")
+
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        try:
+            model.save(os.path.join(staging, 'model.pkl'))
+            with open(os.path.join(staging, 'metadata.json'), 'w') as f:
+                json.dump({
+                    'version': version,
+                    'model_type': model.model_type,
+                    'feature_spec_version': FEATURE_SPEC_VERSION,
+                    'max_items': model.max_items,
+                    'metrics': metrics or {},
+                    'latency_seconds': latency_seconds,
+                    'model_bytes': os.path.getsize(os.path.join(staging, 'model.pkl')),
+                    'created_at': time.time()
+                }, f, indent=2)
+            os.rename(staging, self._version_dir(version))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return version
+
+    def load(self, version: str) -> KnapsackMLModel:
+        """Load a version's model.
+
+        Raises:
+            KeyError: If the version is not registered
+            ValueError: If it was trained on features this code no longer computes
+        """
+        meta = self.metadata(version)
+        if meta['feature_spec_version'] != FEATURE_SPEC_VERSION:
+            raise ValueError(
+                f"Model version {version} uses feature spec {meta['feature_spec_version']}, "
+                f"this code computes spec {FEATURE_SPEC_VERSION}"
+            )
+        return KnapsackMLModel.load(self.model_path(version))
+
+    def active_version(self) -> Optional[str]:
+        """The version workers should serve, if one was activated."""
+        path = os.path.join(self.root, 'ACTIVE')
+        if not os.path.isfile(path):
+            return None
+        with open(path) as f:
+            return f.read().strip() or None
+
+    def set_active(self, version: str):
+        """Mark a version as the one to serve (atomically replacing the ACTIVE file)."""
+        self.metadata(version)
+        path = os.path.join(self.root, 'ACTIVE')
+        with open(path + '.tmp', 'w') as f:
+            f.write(version)
+        os.replace(path + '.tmp', path)
+
+
+class ModelDeployer:
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        solver: Any,
+        on_swap: Optional[Callable[[KnapsackMLModel], None]] = None,
+        poll_interval: Optional[float] = None
+    ):
+        """Load registry versions in the background and hot-swap them into a running ML solver.
+
+        Args:
+            registry: Where versions are loaded from
+            solver: MLKnapsackSolver to swap models into
+            on_swap: Called with the new model right after it is swapped in
+            poll_interval: Seconds between checks of the registry's active version
+                once watch() is called, so that a version deployed through any
+                worker reaches every worker sharing the registry
+        """
+        self.registry = registry
+        self.solver = solver
+        self.on_swap = on_swap
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._loading = None
+        self._last_error = None
+        self._failed_version = None
+        self._warmup_seconds = None
+        self._swapped_at = None
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def deploy(self, version: str, activate: bool = True) -> bool:
+        """Start loading, warming up and swapping in a version.
+
+        Args:
+            version: Registered version to serve
+            activate: Make it the registry's active version once it is swapped in,
+                so that other workers follow
+
+        Returns:
+            False if another deployment is still in progress
+
+        Raises:
+            KeyError: If the version is not registered
+            ValueError: If the version name is invalid
+        """
+        self.registry.metadata(version)
+        with self._lock:
+            if self._loading is not None:
+                return False
+            self._loading = version
+        threading.Thread(target=self._deploy, args=(version, activate), daemon=True).start()
+        return True
+
+    def _deploy(self, version: str, activate: bool):
+        try:
+            model = self.registry.load(version)
+            warmup_seconds = self.solver.warm_up(model)
+            # Requests already running keep the model they started with
+            self.solver.swap_model(model, version)
+            if activate:
+                self.registry.set_active(version)
+            if self.on_swap is not None:
+                self.on_swap(model)
+            with self._lock:
+                self._last_error = None
+                self._failed_version = None
+                self._warmup_seconds = warmup_seconds
+                self._swapped_at = time.time()
+            logger.info(f"Deployed model version {version} (warm-up {warmup_seconds:.3f}s)")
+        except Exception as e:
+            logger.warning(f"Failed to deploy model version {version}: {str(e)}")
+            with self._lock:
+                self._last_error = f"{version}: {str(e)}"
+                self._failed_version = version
+        finally:
+            with self._lock:
+                self._loading = None
+
+    def sync(self) -> bool:
+        """Start deploying the registry's active version if this worker serves another one.
+
+        A version that failed to deploy is not retried until another one is activated.
+
+        Returns:
+            True if a deployment was started
+        """
+        version = self.registry.active_version()
+        with self._lock:
+            if version is None or version in (self.solver.model_version, self._loading, self._failed_version):
+                return False
+        try:
+            # Already active, so the registry file is left alone
+            return self.deploy(version, activate=False)
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Cannot deploy active model version {version}: {str(e)}")
+            with self._lock:
+                self._last_error = f"{version}: {str(e)}"
+                self._failed_version = version
+            return False
+
+    def watch(self):
+        """Call sync() every poll_interval seconds in a background thread (no-op without an interval)."""
+        if not self.poll_interval or self.poll_interval <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"Failed to check the active model version: {str(e)}")
+
+    def stop(self):
+        """Stop watching the registry."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def status(self) -> Dict[str, Any]:
+        """Serving version, the version being loaded and the outcome of the last deployment."""
+        with self._lock:
+            return {
+                'active': self.solver.model_version,
+                'loading': self._loading,
+                'last_error': self._last_error,
+                'warmup_seconds': self._warmup_seconds,
+                'swapped_at': self._swapped_at
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Manage the versioned model registry')
+    parser.add_argument('--root', type=str, default=os.environ.get('KNAPSACK_MODEL_REGISTRY', DEFAULT_REGISTRY_PATH),
+                      help='Registry directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    register_parser = commands.add_parser('register', help='Add a saved model as a new version')
+    register_parser.add_argument('model_path', help='Saved model (.pkl)')
+    register_parser.add_argument('--metrics', type=str, default=None,
+                               help='JSON file with validation metrics to keep with the model')
+    register_parser.add_argument('--latency', type=float, default=None,
+                               help='Measured single-instance inference latency in seconds')
+    register_parser.add_argument('--version', type=str, default=None,
+                               help='Version name (default: next v<N>)')
+    register_parser.add_argument('--activate', action='store_true',
+                               help='Serve this version from the next worker start and in watching workers')
+    commands.add_parser('list', help='List registered versions')
+    activate_parser = commands.add_parser('activate', help='Serve a version from the next worker start and in watching workers')
+    activate_parser.add_argument('version')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == 'register':
+        metrics = None
+        if args.metrics is not None:
+            with open(args.metrics) as f:
+                metrics = json.load(f)
+        version = registry.register(KnapsackMLModel.load(args.model_path), metrics, args.latency, args.version)
+        if args.activate:
+            registry.set_active(version)
+        print(f"Registered {args.model_path} as {version}")
+    elif args.command == 'list':
+        active = registry.active_version()
+        for meta in registry.versions():
+            marker = '*' if meta['version'] == active else ' '
+            print(f"{marker} {meta['version']:<10} {meta['model_type']:<16} max_items={meta['max_items']} "
+                  f"spec={meta['feature_spec_version']} {meta['model_bytes'] / 1024:.0f} KB")
+    else:
+        registry.set_active(args.version)
+        print(f"Activated {args.version}")
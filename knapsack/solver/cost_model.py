@@ -0,0 +1,155 @@
+import numpy as np
+from typing import List, Dict, Optional
+
+from knapsack.solver.traditional_solver import DPKnapsackSolver
+
+# Per-operation costs measured on the reference solver box
+DP_SECONDS_PER_CELL = 1e-6      # one inner-loop step of the pure-Python DP
+DP_BYTES_PER_CELL = 16          # float64 value table + int64 keep table
+GREEDY_SECONDS_PER_ITEM = 1e-6  # ratio computation, sort and scan
+ML_PREDICT_SECONDS = 0.05       # feature building, scaling and model.predict
+ML_SECONDS_PER_SWAP = 2e-7      # one candidate move in the post-processing searches
+ML_SEARCH_ROUNDS = 10           # typical number of improving rounds per search
+BNB_SECONDS_PER_NODE = 1.5e-6   # one node of the branch and bound search
+GA_SECONDS_PER_GENE = 2e-8      # one gene of one chromosome for one generation
+GA_BYTES_PER_GENE = 16          # population, parents, offspring and crossover masks
+
+
+def summarize_instance(weights: List[float], values: List[float], capacity: float) -> Dict:
+    """Summarize the instance properties that drive solver cost.
+
+    Args:
+        weights: List of item weights
+        values: List of item values
+        capacity: Knapsack capacity
+
+    Returns:
+        Dictionary with the number of items, scaled capacity and value range
+    """
+    values = np.asarray(values, dtype=float)
+    return {
+        'n_items': len(weights),
+        'capacity_scaled': int(capacity * DPKnapsackSolver.scale),
+        'value_range': float(values.max() - values.min()) if len(values) else 0.0
+    }
+
+
+class SolverCostModel:
+    def __init__(
+        self,
+        ml_max_items: Optional[int] = 50,
+        ml_available: bool = True,
+        bnb_node_limit: int = 2_000_000,
+        portfolio_members: Optional[List[str]] = None,
+        ga_population_size: int = 100,
+        ga_generations: int = 300
+    ):
+        """Estimate CPU time and peak memory of each solver before running it.
+
+        Args:
+            ml_max_items: Largest instance the ML model accepts; larger ones fall back to DP
+            ml_available: Whether the ML model is loaded; if not, the ML solver falls back to DP
+            bnb_node_limit: Node limit of the branch and bound solver
+            portfolio_members: Solvers raced by the portfolio solver
+            ga_population_size: Population size of the genetic solver
+            ga_generations: Generation limit of the genetic solver
+        """
+        self.ml_max_items = ml_max_items
+        self.ml_available = ml_available
+        self.bnb_node_limit = bnb_node_limit
+        self.portfolio_members = portfolio_members or []
+        self.ga_population_size = ga_population_size
+        self.ga_generations = ga_generations
+
+    def estimate(self, solver_type: str, summary: Dict) -> Dict:
+        """Estimate the cost of running one solver on a summarized instance.
+
+        Args:
+            solver_type: Solver name ('dp', 'greedy', 'ml', 'bnb', 'ga' or 'portfolio')
+            summary: Instance summary from summarize_instance, optionally with a
+                'deadline' in seconds for deadline-bounded solvers
+
+        Returns:
+            Dictionary with estimated 'cpu_seconds' and 'memory_bytes'
+        """
+        if solver_type == "dp":
+            return self._estimate_dp(summary)
+        elif solver_type == "greedy":
+            return self._estimate_greedy(summary)
+        elif solver_type == "ml":
+            return self._estimate_ml(summary)
+        elif solver_type == "bnb":
+            return self._estimate_bnb(summary)
+        elif solver_type == "ga":
+            return self._estimate_ga(summary)
+        elif solver_type == "portfolio":
+            return self._estimate_portfolio(summary)
+        else:
+            raise ValueError(f"Unknown solver type: {solver_type}")
+
+    def _estimate_dp(self, summary: Dict) -> Dict:
+        """DP fills an n x (scaled capacity + 1) table."""
+        cells = summary['n_items'] * (summary['capacity_scaled'] + 1)
+        return {
+            'cpu_seconds': cells * DP_SECONDS_PER_CELL,
+            'memory_bytes': (summary['n_items'] + 1) * (summary['capacity_scaled'] + 1) * DP_BYTES_PER_CELL
+        }
+
+    def _estimate_greedy(self, summary: Dict) -> Dict:
+        """Greedy sorts the items once and scans them."""
+        n = max(summary['n_items'], 1)
+        return {
+            'cpu_seconds': n * np.log2(n + 1) * GREEDY_SECONDS_PER_ITEM,
+            'memory_bytes': n * 64
+        }
+
+    def _estimate_ml(self, summary: Dict) -> Dict:
+        """ML predicts once, then runs swap-based local search and capacity filling.
+
+        When the model is missing or the instance exceeds max_items, the ML solver
+        falls back to DP, so that is what the estimate reflects.
+        """
+        n = summary['n_items']
+        if not self.ml_available or (self.ml_max_items is not None and n > self.ml_max_items):
+            fallback = self._estimate_dp(summary)
+            greedy = self._estimate_greedy(summary)
+            return {
+                'cpu_seconds': fallback['cpu_seconds'] + greedy['cpu_seconds'],
+                'memory_bytes': max(fallback['memory_bytes'], greedy['memory_bytes'])
+            }
+
+        # Pair swaps are O(n^2) per round, one-for-two swaps O(n^3)
+        swaps_per_round = n ** 2 + n ** 3 / 4
+        return {
+            'cpu_seconds': ML_PREDICT_SECONDS + ML_SEARCH_ROUNDS * swaps_per_round * ML_SECONDS_PER_SWAP,
+            'memory_bytes': n * 1024
+        }
+
+    def _estimate_bnb(self, summary: Dict) -> Dict:
+        """Branch and bound is exponential in the worst case but stops at its node limit."""
+        n = summary['n_items']
+        nodes = min(self.bnb_node_limit, 2 ** min(n, 62))
+        return {
+            'cpu_seconds': nodes * BNB_SECONDS_PER_NODE + n * np.log2(n + 1) * GREEDY_SECONDS_PER_ITEM,
+            'memory_bytes': n * 256
+        }
+
+    def _estimate_ga(self, summary: Dict) -> Dict:
+        """The GA evaluates its whole population every generation until its limit or the deadline."""
+        genes = self.ga_population_size * max(summary['n_items'], 1)
+        cpu_seconds = genes * self.ga_generations * GA_SECONDS_PER_GENE
+        if summary.get('deadline') is not None:
+            cpu_seconds = min(cpu_seconds, summary['deadline'])
+        return {
+            'cpu_seconds': cpu_seconds,
+            'memory_bytes': genes * GA_BYTES_PER_GENE
+        }
+
+    def _estimate_portfolio(self, summary: Dict) -> Dict:
+        """Members run at once in separate processes, each cut off at the deadline."""
+        deadline = summary.get('deadline') or float('inf')
+        estimates = [self.estimate(member, summary) for member in self.portfolio_members]
+        return {
+            'cpu_seconds': sum(min(e['cpu_seconds'], deadline) for e in estimates),
+            'memory_bytes': sum(e['memory_bytes'] for e in estimates)
+        }
@@ -0,0 +1,836 @@
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from typing import List, Tuple, Optional, Dict, Any, Sequence
+
+from knapsack.solver.observers import ObserverList, SolverObserver
+
+# Bits per packed chromosome word
+WORD_BITS = 64
+# Binary digits of the mutation rate honoured by packed mutation masks
+MUTATION_PRECISION = 16
+# BYTE_BITS[b, i] is bit i of byte value b, least significant bit first
+BYTE_BITS = (np.arange(256)[:, None] >> np.arange(8)) & 1
+
+
+class KnapsackGA:
+    def __init__(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        population_size: int = 100,
+        generations: int = 100,
+        mutation_rate: float = 0.1,
+        elite_size: int = 10,
+        tournament_size: int = 5,
+        crossover: str = "single_point",
+        seed: Optional[int] = None,
+        packed: bool = False,
+        repair: bool = True,
+        seed_greedy: bool = True,
+        seed_probabilities: Optional[List[float]] = None,
+        seed_fraction: float = 0.5,
+        patience: Optional[int] = None,
+        min_diversity: Optional[float] = None,
+        time_limit: Optional[float] = None,
+        target_value: Optional[float] = None,
+        record_trace: bool = False
+    ):
+        """
+        Initialize the Genetic Algorithm solver for the Knapsack Problem.
+        
+        Args:
+            weights: List of item weights
+            values: List of item values
+            capacity: Maximum knapsack capacity
+            population_size: Size of the population
+            generations: Number of generations to evolve
+            mutation_rate: Probability of mutation
+            elite_size: Number of best solutions to preserve
+            tournament_size: Number of individuals competing in each tournament
+            crossover: Crossover operator, "single_point" or "uniform"
+            seed: Seed for the random number generator, for reproducible runs
+            packed: Store chromosomes as bits packed into uint64 words instead of
+                one byte per gene
+            repair: Make overweight chromosomes feasible by dropping their lowest
+                value/weight ratio items, instead of giving them zero fitness
+            seed_greedy: Start the population with the greedy solution
+            seed_probabilities: Per-item selection probabilities (e.g. ML model outputs)
+                from which part of the initial population is sampled
+            seed_fraction: Fraction of the initial population sampled from seed_probabilities
+            patience: Stop after this many generations without improving the best value
+            min_diversity: Stop once population diversity (0 = all chromosomes identical,
+                1 = every gene evenly split) falls below this threshold
+            time_limit: Stop after this many seconds of wall-clock time
+            target_value: Stop once a solution reaches this value, e.g. the LP bound
+            record_trace: Record per-generation statistics in self.trace
+        """
+        # Validate inputs
+        if len(weights) != len(values):
+            raise ValueError("Weights and values must have the same length")
+        if any(w <= 0 for w in weights):
+            raise ValueError("Weights must be positive")
+        if any(v < 0 for v in values):
+            raise ValueError("Values cannot be negative")
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        if crossover not in ("single_point", "uniform"):
+            raise ValueError(f"Unknown crossover operator: {crossover}")
+        if seed_probabilities is not None and len(seed_probabilities) != len(weights):
+            raise ValueError("Seed probabilities must have one entry per item")
+
+        self.weights = np.array(weights)
+        self.values = np.array(values)
+        self.capacity = capacity
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.elite_size = elite_size
+        self.tournament_size = tournament_size
+        self.crossover = crossover
+        self.n_items = len(weights)
+        self.rng = np.random.default_rng(seed)
+        self.packed = packed
+        self.repair = repair
+        self.seed_greedy = seed_greedy
+        self.seed_probabilities = None if seed_probabilities is None else np.clip(seed_probabilities, 0.0, 1.0)
+        self.seed_fraction = seed_fraction
+        self.patience = patience
+        self.min_diversity = min_diversity
+        self.time_limit = time_limit
+        self.target_value = target_value
+        self.record_trace = record_trace
+        # Filled in by solve()
+        self.trace = None
+        self.stop_reason = None
+        self.generations_run = 0
+        # Items in ascending value/weight ratio, the order in which repair drops them
+        self._ratio_order = np.argsort(self.values / self.weights, kind='stable')
+
+        if packed:
+            self.n_words = -(-self.n_items // WORD_BITS)
+            # Per-byte lookup tables: entry [k, b] is the value (weight) of the items
+            # whose bits are set in byte value b at byte position k
+            padding = self.n_words * WORD_BITS - self.n_items
+            padded_values = np.concatenate([self.values, np.zeros(padding)]).reshape(-1, 8)
+            padded_weights = np.concatenate([self.weights, np.zeros(padding)]).reshape(-1, 8)
+            self._value_table = padded_values @ BYTE_BITS.T
+            self._weight_table = padded_weights @ BYTE_BITS.T
+            self._byte_positions = np.arange(self.n_words * 8)
+            last_bits = self.n_items - (self.n_words - 1) * WORD_BITS
+            self._last_word_mask = np.uint64(2 ** last_bits - 1)
+
+    def _pack(self, population: np.ndarray) -> np.ndarray:
+        """Pack 0/1 chromosomes into little-endian uint64 words, item i at bit i."""
+        packed = np.packbits(population.astype(np.uint8), axis=-1, bitorder='little')
+        padding = self.n_words * 8 - packed.shape[-1]
+        pad_width = [(0, 0)] * (packed.ndim - 1) + [(0, padding)]
+        return np.ascontiguousarray(np.pad(packed, pad_width)).view('<u8')
+
+    def _unpack(self, population: np.ndarray) -> np.ndarray:
+        """Unpack uint64-word chromosomes back to 0/1 arrays."""
+        unpacked = np.unpackbits(population.view(np.uint8), axis=-1, bitorder='little')
+        return unpacked[..., :self.n_items].astype(np.int8)
+
+    def _greedy_solution(self) -> np.ndarray:
+        """Chromosome filled greedily in descending value/weight ratio order."""
+        solution = np.zeros(self.n_items, dtype=np.int8)
+        total_weight = 0.0
+        for i in self._ratio_order[::-1]:
+            if total_weight + self.weights[i] <= self.capacity:
+                solution[i] = 1
+                total_weight += self.weights[i]
+        return solution
+
+    def _initialize_population(self) -> np.ndarray:
+        """Initialize the population: random chromosomes, optionally seeded.
+
+        Up to seed_fraction of the population is sampled from seed_probabilities and
+        the first chromosome is the greedy solution if seed_greedy is set.
+        """
+        population = self.rng.integers(0, 2, size=(self.population_size, self.n_items), dtype=np.int8)
+        if self.seed_probabilities is not None:
+            n_seeded = int(self.seed_fraction * self.population_size)
+            population[self.population_size - n_seeded:] = self.rng.random((n_seeded, self.n_items)) < self.seed_probabilities
+        if self.seed_greedy and self.population_size > 0:
+            population[0] = self._greedy_solution()
+        if self.repair:
+            population = self._repair_unpacked(population)
+        return self._pack(population) if self.packed else population
+
+    def _repair_unpacked(self, population: np.ndarray) -> np.ndarray:
+        """Drop the lowest value/weight ratio items from overweight chromosomes until they fit."""
+        total_weights = population @ self.weights
+        overweight = np.flatnonzero(total_weights > self.capacity)
+        if len(overweight) == 0:
+            return population
+
+        excess = total_weights[overweight] - self.capacity
+        genes = population[overweight][:, self._ratio_order]
+        carried = genes * self.weights[self._ratio_order]
+        # Weight already dropped before reaching each item, lowest ratio first
+        dropped_before = np.cumsum(carried, axis=1) - carried
+        genes[(genes == 1) & (dropped_before < excess[:, None])] = 0
+        repaired = population[overweight]
+        repaired[:, self._ratio_order] = genes
+        population[overweight] = repaired
+        return population
+
+    def _repair(self, population: np.ndarray) -> np.ndarray:
+        """Make every chromosome feasible with the ratio-ordered repair operator."""
+        if not self.packed:
+            return self._repair_unpacked(population)
+        _, total_weights = self._calculate_fitness(population)
+        overweight = np.flatnonzero(total_weights > self.capacity)
+        if len(overweight) > 0:
+            population[overweight] = self._pack(self._repair_unpacked(self._unpack(population[overweight])))
+        return population
+
+    def _calculate_fitness(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate fitness for each solution in the population.
+        Returns both fitness scores and total weights.
+        """
+        if self.packed:
+            # Sum one table lookup per chromosome byte instead of one product per gene
+            genome_bytes = population.view(np.uint8)
+            total_values = self._value_table[self._byte_positions, genome_bytes].sum(axis=1)
+            total_weights = self._weight_table[self._byte_positions, genome_bytes].sum(axis=1)
+        else:
+            total_values = np.dot(population, self.values)
+            total_weights = np.dot(population, self.weights)
+        
+        # Penalize solutions that exceed capacity
+        fitness = np.where(total_weights <= self.capacity, total_values, 0)
+        return fitness, total_weights
+
+    def _select_parents(self, population: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        """Select parents using tournament selection, all tournaments at once."""
+        size = len(population)
+        tournament_idx = self.rng.integers(0, size, size=(self.population_size, self.tournament_size))
+        winners = np.argmax(fitness[tournament_idx], axis=1)
+        return population[tournament_idx[np.arange(self.population_size), winners]]
+
+    def _crossover(self, parents: np.ndarray) -> np.ndarray:
+        """Cross consecutive pairs of parents with the configured operator."""
+        offspring = parents.copy()
+        n_pairs = self.population_size // 2
+        if n_pairs == 0 or self.n_items < 2:
+            return offspring
+
+        first = parents[0:2 * n_pairs:2]
+        second = parents[1:2 * n_pairs:2]
+        if self.packed:
+            mask = self._packed_crossover_mask(n_pairs)
+            offspring[0:2 * n_pairs:2] = (first & mask) | (second & ~mask)
+            offspring[1:2 * n_pairs:2] = (second & mask) | (first & ~mask)
+            return offspring
+
+        if self.crossover == "uniform":
+            mask = self.rng.integers(0, 2, size=(n_pairs, self.n_items), dtype=bool)
+        else:
+            # Genes before each pair's crossover point come from the first parent
+            points = self.rng.integers(1, self.n_items, size=n_pairs)
+            mask = np.arange(self.n_items) < points[:, None]
+        offspring[0:2 * n_pairs:2] = np.where(mask, first, second)
+        offspring[1:2 * n_pairs:2] = np.where(mask, second, first)
+        return offspring
+
+    def _packed_crossover_mask(self, n_pairs: int) -> np.ndarray:
+        """Word masks selecting the genes each pair's first child takes from the first parent."""
+        if self.crossover == "uniform":
+            # Every random bit is a fair coin; padding bits stay zero in both parents
+            return self.rng.bit_generator.random_raw(size=(n_pairs, self.n_words)).astype(np.uint64)
+
+        points = self.rng.integers(1, self.n_items, size=n_pairs)
+        split_word = (points // WORD_BITS)[:, None]
+        split_mask = (np.uint64(1) << (points % WORD_BITS).astype(np.uint64)) - np.uint64(1)
+        words = np.arange(self.n_words)
+        return np.where(
+            words < split_word,
+            ~np.uint64(0),
+            np.where(words == split_word, split_mask[:, None], np.uint64(0))
+        ).astype(np.uint64)
+
+    def _packed_mutation_mask(self, shape: Tuple[int, int]) -> np.ndarray:
+        """Word masks with each bit set with probability mutation_rate (to 1/2**16).
+
+        Walks the binary expansion of the rate from its least significant digit,
+        OR-ing in a fair random word for each 1 digit and AND-ing one for each 0,
+        so the whole mask costs at most 16 random words per word.
+        """
+        digits = int(round(self.mutation_rate * 2 ** MUTATION_PRECISION))
+        mask = np.zeros(shape, dtype=np.uint64)
+        if digits == 0:
+            return mask
+        trailing_zeros = (digits & -digits).bit_length() - 1
+        for position in range(trailing_zeros, MUTATION_PRECISION):
+            random_words = self.rng.bit_generator.random_raw(size=shape).astype(np.uint64)
+            if digits >> position & 1:
+                mask |= random_words
+            else:
+                mask &= random_words
+        if digits >= 2 ** MUTATION_PRECISION:
+            mask[:] = ~np.uint64(0)
+        # Keep the padding bits beyond the last item clear
+        mask[:, -1] &= self._last_word_mask
+        return mask
+
+    def _mutate(self, population: np.ndarray) -> np.ndarray:
+        """Flip about a mutation_rate fraction of the genes, chosen at random.
+
+        Draws the number of flips once and then only that many positions, instead
+        of one random number per gene.
+        """
+        if self.packed:
+            population ^= self._packed_mutation_mask(population.shape)
+            return population
+
+        n_flips = self.rng.binomial(population.size, self.mutation_rate)
+        positions = self.rng.integers(0, population.size, size=n_flips)
+        flat = population.reshape(-1)
+        flat[positions] ^= 1
+        return population
+
+    def _elitism(self, population: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        """Preserve the best solutions."""
+        if self.elite_size <= 0:
+            return population[:0]
+        elite_idx = np.argsort(fitness)[-self.elite_size:]
+        return population[elite_idx]
+
+    def _next_generation(self, population: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        """Breed the next population from the current one and its fitness."""
+        # Select parents
+        parents = self._select_parents(population, fitness)
+        
+        # Create offspring through crossover
+        offspring = self._crossover(parents)
+        
+        # Apply mutation
+        offspring = self._mutate(offspring)
+        if self.repair:
+            offspring = self._repair(offspring)
+        
+        # Preserve elite solutions, making room for them among the offspring
+        elite = self._elitism(population, fitness)
+        return np.vstack([elite, offspring[:self.population_size - len(elite)]])
+
+    def _best(self, population: np.ndarray) -> Tuple[np.ndarray, float, float]:
+        """Best chromosome of a population as a 0/1 array, with its value and weight."""
+        fitness, weights = self._calculate_fitness(population)
+        best_idx = np.argmax(fitness)
+        best_solution = self._unpack(population[best_idx]) if self.packed else population[best_idx]
+        return best_solution, fitness[best_idx], weights[best_idx]
+
+    def _diversity(self, population: np.ndarray) -> float:
+        """Mean over genes of 4 p (1 - p), where p is the share of chromosomes selecting the item."""
+        genes = self._unpack(population) if self.packed else population
+        frequencies = genes.mean(axis=0)
+        return float(np.mean(4 * frequencies * (1 - frequencies)))
+
+    def _check_stop(self, best_value: float, stalled: int, diversity: Optional[float], elapsed: float) -> Optional[str]:
+        """Name of the first stopping rule that fires, or None to keep evolving."""
+        if self.target_value is not None and best_value >= self.target_value:
+            return "target_value"
+        if self.patience is not None and stalled >= self.patience:
+            return "patience"
+        if self.min_diversity is not None and diversity < self.min_diversity:
+            return "min_diversity"
+        if self.time_limit is not None and elapsed >= self.time_limit:
+            return "time_limit"
+        return None
+
+    def solve(self, observers: Optional[Sequence[SolverObserver]] = None) -> Tuple[np.ndarray, float, float, List[int]]:
+        """
+        Solve the knapsack problem using genetic algorithm.
+        
+        Args:
+            observers: Notified of the start, every improving solution, an iteration
+                per generation (best value and generations without improvement) and
+                the result; any of them can stop the run
+        
+        Evolves for `generations` generations unless a stopping rule fires first;
+        afterwards self.stop_reason names the rule ("generations" if none did),
+        self.generations_run counts the generations evaluated and self.trace holds
+        the per-generation statistics if record_trace is set.
+        
+        Returns:
+            Tuple containing:
+            - Best solution (binary array)
+            - Best solution value
+            - Best solution weight
+            - List of selected item indices
+        """
+        start_time = time.perf_counter()
+        observers = ObserverList("ga", observers)
+        observers.start(self.n_items, self.capacity)
+        self.trace = [] if self.record_trace else None
+        self.stop_reason = "generations"
+        track_diversity = self.record_trace or self.min_diversity is not None
+        best_value = -float('inf')
+        stalled = 0
+        
+        # Initialize population
+        population = self._initialize_population()
+        
+        for generation in range(self.generations):
+            fitness, total_weights = self._calculate_fitness(population)
+            self.generations_run = generation + 1
+            
+            best_idx = int(np.argmax(fitness))
+            generation_best = float(fitness[best_idx])
+            improved = generation_best > best_value
+            if improved:
+                best_value = generation_best
+                best_chromosome, best_weight = population[best_idx].copy(), float(total_weights[best_idx])
+                stalled = 0
+            else:
+                stalled += 1
+            diversity = self._diversity(population) if track_diversity else None
+            elapsed = time.perf_counter() - start_time
+            
+            if improved and observers and generation_best > 0:
+                best_solution = self._unpack(population[best_idx]) if self.packed else population[best_idx]
+                if observers.incumbent(
+                    total_value=generation_best,
+                    total_weight=float(total_weights[best_idx]),
+                    selected_items=np.flatnonzero(best_solution).tolist(),
+                    generation=generation
+                ):
+                    self.stop_reason = "observer"
+                    break
+            if observers and observers.iteration(generation=generation, best_value=best_value, stalled=stalled):
+                self.stop_reason = "observer"
+                break
+            
+            if self.record_trace:
+                self.trace.append({
+                    'generation': generation,
+                    'best_value': best_value,
+                    'mean_fitness': float(np.mean(fitness)),
+                    'feasible_fraction': float(np.mean(fitness > 0)),
+                    'diversity': diversity,
+                    'elapsed': elapsed
+                })
+            
+            stop_reason = self._check_stop(best_value, stalled, diversity, elapsed)
+            if stop_reason is not None:
+                self.stop_reason = stop_reason
+                break
+            population = self._next_generation(population, fitness)
+        
+        # Best of the final population, unless an earlier generation had a better one
+        # (without elitism the best chromosome can be lost)
+        final_solution, final_value, final_weight = self._best(population)
+        if final_value >= best_value:
+            best_solution, best_value, best_weight = final_solution, final_value, final_weight
+        else:
+            best_solution = self._unpack(best_chromosome) if self.packed else best_chromosome
+        
+        # Get selected item indices
+        selected_items = [i for i, x in enumerate(best_solution) if x == 1]
+        
+        observers.finish({
+            'total_value': best_value,
+            'total_weight': best_weight,
+            'selected_items': selected_items,
+            'generations': self.generations_run,
+            'stop_reason': self.stop_reason
+        })
+        return best_solution, best_value, best_weight, selected_items
+
+    def get_solution_details(self, solution: np.ndarray) -> dict:
+        """Get detailed information about a solution."""
+        total_value = np.dot(solution, self.values)
+        total_weight = np.dot(solution, self.weights)
+        selected_items = [i for i, x in enumerate(solution) if x == 1]
+        
+        return {
+            "selected_items": selected_items,
+            "total_value": float(total_value),
+            "total_weight": float(total_weight),
+            "is_valid": total_weight <= self.capacity,
+            "item_details": [
+                {
+                    "item_id": i,
+                    "weight": float(self.weights[i]),
+                    "value": float(self.values[i])
+                }
+                for i in selected_items
+            ]
+        }
+
+
+# Seconds an island waits at a migration barrier before giving up on its neighbours
+MIGRATION_TIMEOUT = 600.0
+# Seconds the parent waits for island progress before checking whether they finished
+PROGRESS_POLL = 0.05
+# Stopping rules an island flags on its own before a migration barrier; the others
+# (target_value, patience) every island derives from the shared best values
+ISLAND_STOP_REASONS = ("observer", "time_limit", "min_diversity")
+
+_island_barrier = None
+_island_shared = None
+
+
+def _init_island(barrier, shared):
+    """Pool initializer: share the migration barrier and the stopping state with every island process."""
+    global _island_barrier, _island_shared
+    _island_barrier = barrier
+    _island_shared = shared
+
+
+def _run_island(
+    island: int,
+    n_islands: int,
+    weights: List[float],
+    values: List[float],
+    capacity: float,
+    ga_params: Dict[str, Any],
+    seed: int,
+    migration_interval: int,
+    n_migrants: int,
+    buffer_name: str,
+    deadline: Optional[float]
+) -> Tuple[np.ndarray, float, float, int, str]:
+    """Evolve one island, exchanging migrants with its ring neighbours through shared memory.
+    
+    Every migration_interval generations the islands meet at a barrier and decide
+    together whether to stop: each island flags the rules it can check alone before
+    the barrier, and after it all of them read the same shared state. Returns the
+    island's best solution, value and weight, the generations run and the stop reason.
+    """
+    ga = KnapsackGA(weights, values, capacity, seed=seed, **ga_params)
+    population = ga._initialize_population()
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    # One slot of n_migrants chromosomes per island
+    slots = np.ndarray((n_islands, n_migrants, population.shape[1]), dtype=population.dtype, buffer=buffer.buf)
+    best_values, stop_code = _island_shared['best_values'], _island_shared['stop_code']
+    progress = _island_shared['progress']
+    best_value, best_weight, best_chromosome = -float('inf'), 0.0, None
+    global_best, stalled = -float('inf'), 0
+    stop_reason, generations_run = "generations", 0
+    try:
+        for generation in range(ga.generations):
+            fitness, total_weights = ga._calculate_fitness(population)
+            generations_run = generation + 1
+            best_idx = int(np.argmax(fitness))
+            if fitness[best_idx] > best_value:
+                best_value, best_weight = float(fitness[best_idx]), float(total_weights[best_idx])
+                best_chromosome = population[best_idx].copy()
+            
+            if generations_run % migration_interval == 0:
+                best_values[island] = best_value
+                if _island_shared['stop_requested'].value:
+                    stop_code.value = 1 + ISLAND_STOP_REASONS.index("observer")
+                elif deadline is not None and time.time() >= deadline:
+                    stop_code.value = 1 + ISLAND_STOP_REASONS.index("time_limit")
+                elif ga.min_diversity is not None and ga._diversity(population) < ga.min_diversity:
+                    stop_code.value = 1 + ISLAND_STOP_REASONS.index("min_diversity")
+                order = np.argsort(fitness)
+                slots[island] = population[order[-n_migrants:]]
+                _island_barrier.wait(MIGRATION_TIMEOUT)
+                
+                # Nothing shared changes until the next barrier, so every island decides alike
+                round_best = max(best_values)
+                if round_best > global_best:
+                    global_best, stalled = round_best, 0
+                    if round_best > 0 and island == list(best_values).index(round_best):
+                        best_solution = ga._unpack(best_chromosome) if ga.packed else best_chromosome
+                        progress.put(('incumbent', generation, best_value, best_weight, np.flatnonzero(best_solution).tolist()))
+                else:
+                    stalled += migration_interval
+                if island == 0:
+                    progress.put(('iteration', generation, global_best, stalled))
+                if stop_code.value:
+                    stop_reason = ISLAND_STOP_REASONS[stop_code.value - 1]
+                elif ga.target_value is not None and global_best >= ga.target_value:
+                    stop_reason = "target_value"
+                elif ga.patience is not None and stalled >= ga.patience:
+                    stop_reason = "patience"
+                if stop_reason != "generations":
+                    break
+                
+                if n_islands > 1:
+                    # Immigrants from the previous island replace this island's worst
+                    population[order[:n_migrants]] = slots[(island - 1) % n_islands]
+                    fitness, _ = ga._calculate_fitness(population)
+                _island_barrier.wait(MIGRATION_TIMEOUT)
+            population = ga._next_generation(population, fitness)
+        
+        final_solution, final_value, final_weight = ga._best(population)
+        if final_value >= best_value:
+            return final_solution, final_value, final_weight, generations_run, stop_reason
+        best_solution = ga._unpack(best_chromosome) if ga.packed else best_chromosome
+        return best_solution, best_value, best_weight, generations_run, stop_reason
+    except Exception:
+        # Release the other islands instead of leaving them blocked at the barrier
+        _island_barrier.abort()
+        raise
+    finally:
+        del slots
+        buffer.close()
+
+
+class IslandKnapsackGA:
+    def __init__(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        n_islands: Optional[int] = None,
+        migration_interval: int = 10,
+        n_migrants: int = 2,
+        seed: Optional[int] = None,
+        **ga_params
+    ):
+        """
+        Island-model Genetic Algorithm: several KnapsackGA populations evolve in
+        parallel processes and pass their best chromosomes around a ring.
+        
+        Args:
+            weights: List of item weights
+            values: List of item values
+            capacity: Maximum knapsack capacity
+            n_islands: Number of islands (processes); defaults to the number of CPUs
+            migration_interval: Generations between migrations, which are also
+                when the stopping rules are checked
+            n_migrants: Chromosomes each island sends to the next one per migration
+            seed: Seed from which every island's random number generator is derived
+            **ga_params: Parameters passed to each island's KnapsackGA
+                (population_size, generations, mutation_rate, packed, patience,
+                time_limit, target_value, ...)
+        """
+        self.weights = list(weights)
+        self.values = list(values)
+        self.capacity = capacity
+        self.n_islands = n_islands or multiprocessing.cpu_count()
+        self.migration_interval = migration_interval
+        self.n_migrants = n_migrants
+        self.seed = seed
+        self.ga_params = ga_params
+        # Filled in by solve()
+        self.stop_reason = None
+        self.generations_run = 0
+        
+        # Validates the inputs and gives the chromosome layout used for the migrant buffer
+        self._template = KnapsackGA(self.weights, self.values, capacity, **ga_params)
+        if migration_interval < 1:
+            raise ValueError("Migration interval must be at least 1")
+        if not 0 < n_migrants <= self._template.population_size:
+            raise ValueError("Number of migrants must be between 1 and the population size")
+
+    def solve(self, observers: Optional[Sequence[SolverObserver]] = None) -> Tuple[np.ndarray, float, float, List[int]]:
+        """
+        Solve the knapsack problem by evolving all islands in parallel.
+        
+        Args:
+            observers: Notified as in KnapsackGA.solve, but once per migration
+                interval: of every improvement of the best value over all islands
+                and of an iteration per migration; any of them can stop the run
+        
+        The stopping rules of KnapsackGA apply to all islands together and are
+        checked at each migration; afterwards self.stop_reason and
+        self.generations_run are set as in KnapsackGA.solve.
+        
+        Returns:
+            Same tuple as KnapsackGA.solve, for the best solution over all islands
+        """
+        observers = ObserverList("ga", observers)
+        observers.start(len(self.weights), self.capacity)
+        time_limit = self._template.time_limit
+        deadline = None if time_limit is None else time.time() + time_limit
+        genome = self._template._initialize_population()[:1]
+        seeds = [
+            int(child.generate_state(1)[0])
+            for child in np.random.SeedSequence(self.seed).spawn(self.n_islands)
+        ]
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        barrier = context.Barrier(self.n_islands)
+        # The barriers order every access, so the shared values need no locks
+        shared = {
+            'best_values': context.Array('d', self.n_islands, lock=False),
+            'stop_code': context.Value('i', 0, lock=False),
+            'stop_requested': context.Value('i', 0, lock=False),
+            'progress': context.Queue()
+        }
+        buffer = shared_memory.SharedMemory(
+            create=True,
+            size=max(1, self.n_islands * self.n_migrants * genome.nbytes)
+        )
+        reported_value = -float('inf')
+        
+        def relay(message) -> bool:
+            nonlocal reported_value
+            if message[0] == 'incumbent':
+                _, generation, value, weight, selected_items = message
+                if value <= reported_value:
+                    return False
+                reported_value = value
+                return observers.incumbent(
+                    total_value=value, total_weight=weight,
+                    selected_items=selected_items, generation=generation
+                )
+            _, generation, best_value, stalled = message
+            return observers.iteration(generation=generation, best_value=best_value, stalled=stalled)
+        
+        try:
+            # Every island must run at once for the migration barriers to pass
+            with context.Pool(self.n_islands, initializer=_init_island, initargs=(barrier, shared)) as pool:
+                pending = pool.starmap_async(_run_island, [
+                    (
+                        island, self.n_islands, self.weights, self.values, self.capacity,
+                        self.ga_params, seeds[island], self.migration_interval,
+                        self.n_migrants, buffer.name, deadline
+                    )
+                    for island in range(self.n_islands)
+                ], chunksize=1)
+                while True:
+                    finished = pending.ready()
+                    try:
+                        message = shared['progress'].get(timeout=0 if finished else PROGRESS_POLL)
+                    except queue.Empty:
+                        if finished:
+                            break
+                        continue
+                    if relay(message):
+                        # The islands pick this up at their next migration
+                        shared['stop_requested'].value = 1
+                results = pending.get()
+        finally:
+            buffer.close()
+            buffer.unlink()
+        
+        best_solution, best_value, best_weight, self.generations_run, self.stop_reason = max(
+            results, key=lambda result: result[1]
+        )
+        selected_items = [i for i, x in enumerate(best_solution) if x == 1]
+        if observers and best_value > max(reported_value, 0):
+            # The final populations can beat every best reported at a migration
+            observers.incumbent(
+                total_value=float(best_value), total_weight=float(best_weight),
+                selected_items=selected_items, generation=self.generations_run - 1
+            )
+        
+        observers.finish({
+            'total_value': best_value,
+            'total_weight': best_weight,
+            'selected_items': selected_items,
+            'generations': self.generations_run,
+            'stop_reason': self.stop_reason
+        })
+        return best_solution, best_value, best_weight, selected_items
+
+
+class GeneticKnapsackSolver:
+    def __init__(
+        self,
+        population_size: int = 100,
+        generations: int = 300,
+        mutation_rate: Optional[float] = None,
+        elite_size: int = 10,
+        crossover: str = "uniform",
+        patience: Optional[int] = 50,
+        time_limit: Optional[float] = None,
+        n_islands: int = 1,
+        packed: bool = False,
+        seed: Optional[int] = None,
+        ml_solver: Optional[Any] = None
+    ):
+        """Genetic algorithm solver with the same interface as the other solvers.
+        
+        Args:
+            population_size: Chromosomes per population (per island)
+            generations: Maximum number of generations
+            mutation_rate: Per-gene mutation probability; defaults to 1 / number of items
+            elite_size: Best chromosomes carried over to each next generation
+            crossover: Crossover operator, "single_point" or "uniform"
+            patience: Stop after this many generations without improvement
+            time_limit: Default wall-clock budget in seconds
+            n_islands: Number of parallel islands; 1 runs a single population in-process
+            packed: Store chromosomes as packed bits
+            seed: Default random seed
+            ml_solver: MLKnapsackSolver whose per-item probabilities seed the population
+        """
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.elite_size = elite_size
+        self.crossover = crossover
+        self.patience = patience
+        self.time_limit = time_limit
+        self.n_islands = n_islands
+        self.packed = packed
+        self.seed = seed
+        self.ml_solver = ml_solver
+    
+    def solve(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        observers: Optional[Sequence[SolverObserver]] = None,
+        time_limit: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """Solve knapsack problem using the genetic algorithm.
+        
+        Args:
+            weights: List of item weights
+            values: List of item values
+            capacity: Knapsack capacity
+            observers: Notified as in KnapsackGA.solve; with islands, once per
+                migration interval (see IslandKnapsackGA.solve)
+            time_limit: Wall-clock budget in seconds, overriding the default
+            seed: Random seed, overriding the default
+            
+        Returns:
+            Dictionary containing solution details, plus the number of generations
+            run and why the search stopped
+        """
+        start_time = time.time()
+        n = len(weights)
+        observers = ObserverList("ga", observers)
+        observers.start(n, capacity)
+        
+        seed_probabilities = None
+        if self.ml_solver is not None:
+            seed_probabilities = self.ml_solver.predict_probabilities(weights, values, capacity)
+        
+        params = dict(
+            population_size=self.population_size,
+            generations=self.generations,
+            mutation_rate=self.mutation_rate if self.mutation_rate is not None else 1.0 / max(n, 1),
+            elite_size=self.elite_size,
+            crossover=self.crossover,
+            packed=self.packed,
+            patience=self.patience,
+            time_limit=self.time_limit if time_limit is None else time_limit,
+            seed_probabilities=seed_probabilities
+        )
+        seed = self.seed if seed is None else seed
+        
+        if self.n_islands > 1:
+            ga = IslandKnapsackGA(weights, values, capacity, n_islands=self.n_islands, seed=seed, **params)
+        else:
+            ga = KnapsackGA(weights, values, capacity, seed=seed, **params)
+        solution, _, _, selected_items = ga.solve(observers=observers.nested())
+        
+        total_weight = float(sum(weights[i] for i in selected_items))
+        total_value = float(sum(values[i] for i in selected_items))
+        
+        return observers.finish({
+            'selected_items': [int(i) for i in selected_items],
+            'total_value': total_value,
+            'total_weight': total_weight,
+            'is_feasible': total_weight <= capacity,
+            'selection': np.asarray(solution, dtype=float).tolist(),
+            'solve_time': time.time() - start_time,
+            'generations': ga.generations_run,
+            'stop_reason': ga.stop_reason
+        })
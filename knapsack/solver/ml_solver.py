@@ -4,8 +4,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Sequence
 from knapsack.train_model import KnapsackMLModel
+from knapsack.solver.observers import ObserverList, SolverObserver
+from knapsack.utils.metrics import ML_STAGE_SECONDS, ML_FALLBACKS, ML_SEARCH_ITERATIONS, ML_SEARCH_MOVES
 import time
 import warnings
 import logging
@@ -14,226 +16,275 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class StageTimer:
+    def __init__(self, profile: bool = False):
+        """Time consecutive stages of one ML solve and count the work done in them.
+        
+        Stage times always go to ML_STAGE_SECONDS and search counts to the
+        ML_SEARCH_* counters. Only with profile does the timer also keep its own
+        breakdown for the result; without it nothing beyond the metrics is stored.
+        
+        Args:
+            profile: Keep per-stage times and counters for profile()
+        """
+        self.stages = {} if profile else None
+        self.counters = {} if profile else None
+        self.fallback = None
+        self._stage_start = time.perf_counter()
+    
+    def lap(self, stage: str):
+        """End a stage that started when the previous one ended."""
+        now = time.perf_counter()
+        elapsed = now - self._stage_start
+        ML_STAGE_SECONDS.observe(elapsed, stage=stage)
+        if self.stages is not None:
+            self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+        self._stage_start = now
+    
+    def count(self, stage: str, iterations: int, moves: int):
+        """Record a search stage's improvement rounds and accepted moves."""
+        ML_SEARCH_ITERATIONS.inc(iterations, stage=stage)
+        ML_SEARCH_MOVES.inc(moves, stage=stage)
+        if self.counters is not None:
+            self.counters[stage] = {'iterations': iterations, 'moves_accepted': moves}
+    
+    def profile(self) -> Dict:
+        """Seconds per stage, counters per search stage and the fallback taken, if any."""
+        return {
+            'stages': dict(self.stages),
+            'total_seconds': sum(self.stages.values()),
+            'counters': dict(self.counters),
+            'fallback': self.fallback
+        }
+
 class MLKnapsackSolver:
-    def __init__(self, model_path: str = 'knapsack/models/rf_model.pkl'):
+    def __init__(self, model_path: Optional[str] = 'knapsack/models/rf_model.pkl', model_version: Optional[str] = None):
         """Initialize the ML-based knapsack solver.
         
         Args:
-            model_path: Path to the trained model file
+            model_path: Path to the trained model file; None starts without a model
+            model_version: Registry version of the model, if it came from the registry
         """
         # Import DP solver first to avoid circular imports
         from knapsack.solver.traditional_solver import DPKnapsackSolver, GreedyKnapsackSolver
         self.dp_solver = DPKnapsackSolver()
         self.greedy_solver = GreedyKnapsackSolver()
         self.model = None
+        self.model_version = model_version
         self.max_items = 50  # Maximum number of items to consider, must match the model's max_items
         
         # Try to load the ML model, but gracefully handle errors
+        if model_path is None:
+            return
         try:
             with warnings.catch_warnings():
                 warnings.filterwarnings("ignore", category=UserWarning)
                 self.model = KnapsackMLModel.load(model_path)
+                self.max_items = self.model.max_items
                 logger.info("ML model loaded successfully")
         except Exception as e:
             logger.warning(f"Failed to load ML model: {str(e)}. Will fall back to traditional solvers.")
             self.model = None
     
-    def solve(self, weights: List[float], values: List[float], capacity: float) -> Dict:
-        """Solve a knapsack instance using the ML model or fallback solvers if ML model loading failed.
+    def solve(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        profile: bool = False,
+        observers: Optional[Sequence[SolverObserver]] = None
+    ) -> Dict:
+        """Solve a knapsack instance using the ML model, or a fallback solver if no model is
+        loaded, the instance has more items than the model takes or the model fails.
         
         Args:
             weights: List of item weights
             values: List of item values
             capacity: Knapsack capacity
+            profile: Add a 'profile' entry with the seconds spent in each stage,
+                the iterations and accepted moves of each search stage and the
+                fallback taken, if any
+            observers: Notified of the start, the first feasible solution and every
+                improvement on it, an iteration per post-processing stage (repair,
+                local search, capacity fill) and the result; stopping skips the
+                remaining stages. A fallback solver reports to them as well
             
         Returns:
             Dictionary containing solution details
         """
         start_time = time.time()
+        timer = StageTimer(profile)
+        observers = ObserverList("ml", observers)
+        observers.start(len(weights), capacity)
+        # The model may be hot-swapped while this request runs; keep using the one it started with
+        model = self.model
         
         # If ML model failed to load, use traditional solvers
-        if self.model is None:
-            try:
-                dp_solution = self.dp_solver.solve(weights, values, capacity)
-                dp_solution['solve_time'] = time.time() - start_time
-                return dp_solution
-            except Exception as e:
-                logger.warning(f"DP solver failed: {str(e)}. Falling back to greedy.")
-            
-            # If DP fails, use greedy
-            greedy_solution = self.greedy_solver.solve(weights, values, capacity)
-            greedy_solution['solve_time'] = time.time() - start_time
-            return greedy_solution
+        if model is None:
+            return observers.finish(
+                self._solve_fallback(weights, values, capacity, "model_unavailable", start_time, timer, observers)
+            )
+        # The model's input has one slot per item
+        if len(weights) > model.max_items:
+            return observers.finish(
+                self._solve_fallback(weights, values, capacity, "too_many_items", start_time, timer, observers)
+            )
 
         try:
             # Convert inputs to numpy arrays
-            weights = np.array(weights)
-            values = np.array(values)
-            n_items = len(weights)
-            
-            # Calculate value/weight ratios
-            value_weight_ratios = values / weights
-            sorted_ratios = np.sort(value_weight_ratios)[::-1]  # Sort descending
-            
-            # Pad arrays to max_items
-            padded_weights = np.pad(weights, (0, self.max_items - len(weights)), 'constant')
-            padded_values = np.pad(values, (0, self.max_items - len(values)), 'constant')
-            
-            # Safely handle top k ratios when n_items < 5
-            n_ratios = min(n_items, 5)  # Use at most 5 or as many as available
-            
-            # Extra safety: Ensure we have at least one ratio
-            if len(value_weight_ratios) > 0:
-                sorted_ratios = np.sort(value_weight_ratios)[::-1]  # Sort descending
-                best_ratios = sorted_ratios[:n_ratios].tolist()  # Best k ratios
-                worst_ratios = sorted_ratios[max(-n_ratios, -len(sorted_ratios)):].tolist()  # Worst k ratios
-            else:
-                best_ratios = []
-                worst_ratios = []
-            
-            # Pad ratios arrays to always have 5 elements
-            best_ratios = best_ratios + [0.0] * (5 - len(best_ratios))
-            worst_ratios = worst_ratios + [0.0] * (5 - len(worst_ratios))
-            
-            # Get top 5 weights and values (same as in train_model.py)
-            sorted_weights = np.sort(weights)
-            sorted_values = np.sort(values)[::-1]  # Sort values descending
-            
-            # Be extra careful with small arrays
-            top_weights = sorted_weights[-min(5, len(sorted_weights)):].tolist()
-            top_weights = [0.0] * (5 - len(top_weights)) + top_weights
-            
-            top_values = sorted_values[:min(5, len(sorted_values))].tolist()
-            top_values = top_values + [0.0] * (5 - len(top_values))
-            
-            # Calculate additional features matching those in train_model.py
-            total_weight = float(np.sum(weights))
-            total_value = float(np.sum(values))
-            capacity_ratio = float(capacity / total_weight if total_weight > 0 else 1.0)
-            avg_weight = float(np.mean(weights))
-            avg_value = float(np.mean(values))
-            weight_variance = float(np.var(weights))
-            value_variance = float(np.var(values))
-            
-            # Calculate knapsack density (how many items can fit on average)
-            density = float(capacity / avg_weight if avg_weight > 0 else n_items)
-            
-            # Calculate potential value density (value per capacity unit)
-            value_density = float(total_value / capacity if capacity > 0 else total_value)
-            
-            # Calculate correlation between weights and values - safely
-            try:
-                if n_items > 1:
-                    correlation = float(np.corrcoef(weights, values)[0, 1])
-                else:
-                    correlation = 0.0
-            except:
-                correlation = 0.0
-            
-            # Calculate weight and value skewness
-            try:
-                weight_skew = float(self._calculate_skewness(weights))
-                value_skew = float(self._calculate_skewness(values))
-                ratio_skew = float(self._calculate_skewness(value_weight_ratios))
-            except:
-                weight_skew = 0.0
-                value_skew = 0.0
-                ratio_skew = 0.0
-            
-            # Calculate weight and value kurtosis
-            try:
-                weight_kurtosis = float(self._calculate_kurtosis(weights))
-                value_kurtosis = float(self._calculate_kurtosis(values))
-                ratio_kurtosis = float(self._calculate_kurtosis(value_weight_ratios))
-            except:
-                weight_kurtosis = 0.0
-                value_kurtosis = 0.0
-                ratio_kurtosis = 0.0
+            weights_array = np.array(weights)
+            values_array = np.array(values)
             
-            # Prepare features exactly as in training
-            instance_features = [
-                n_items,
-                capacity,
-                float(np.mean(weights)),
-                float(np.std(weights)),
-                float(np.median(weights)),
-                float(np.percentile(weights, 25)),
-                float(np.percentile(weights, 75)),
-                float(np.mean(values)),
-                float(np.std(values)),
-                float(np.median(values)),
-                float(np.percentile(values, 25)),
-                float(np.percentile(values, 75)),
-                total_value,
-                total_weight,
-                capacity_ratio,  # capacity utilization
-                float(np.max(weights) / np.min(weights) if np.min(weights) > 0 else np.max(weights)),  # weight range ratio
-                float(np.max(values) / np.min(values) if np.min(values) > 0 else np.max(values)),    # value range ratio
-                float(np.mean(value_weight_ratios)),
-                float(np.std(value_weight_ratios)),
-                float(np.median(value_weight_ratios)),
-                float(np.max(value_weight_ratios)),
-                float(np.min(value_weight_ratios)),
-                # New features
-                density,
-                value_density,
-                correlation,
-                weight_variance,
-                value_variance,
-                weight_skew,
-                value_skew,
-                ratio_skew,
-                weight_kurtosis,
-                value_kurtosis,
-                ratio_kurtosis,
-                # Top values
-                *top_weights,
-                *top_values,
-                # Top k value/weight ratios
-                *[float(x) for x in best_ratios],  # Best 5 ratios (padded if needed)
-                *[float(x) for x in worst_ratios],  # Worst 5 ratios (padded if needed)
-            ]
-            
-            # Add padded weights and values
-            instance_features.extend([float(x) for x in padded_weights])
-            instance_features.extend([float(x) for x in padded_values])
-            
-            # Convert to numpy array and reshape for single prediction
-            X = np.array([instance_features])
+            X = self._build_features(weights_array, values_array, capacity, model.max_items)
+            timer.lap("features")
             
             # Scale features
-            X = self.model.scaler.transform(X)
+            X = model.scaler.transform(X)
+            timer.lap("scaling")
             
             # Get model prediction
-            selection = self.model.model.predict(X)[0]
-            
-            # Convert to binary selection
-            if isinstance(selection, np.ndarray):
-                selection = (selection > 0.5).astype(int)
-            
-            # Ensure selection array matches actual number of items
-            selection = selection[:len(weights)] if isinstance(selection, np.ndarray) else selection[:len(weights)]
+            selection = model.model.predict(X)[0]
+            timer.lap("predict")
             
-            # Truncate selection to actual number of items and convert to Python list
-            selected_items = []
-            for i, selected in enumerate(selection):
-                if i < len(weights) and selected == 1:
-                    selected_items.append(i)
-                    
-            total_weight = float(sum(weights[i] for i in selected_items if i < len(weights)))  # Convert to float
-            total_value = float(sum(values[i] for i in selected_items if i < len(values)))    # Convert to float
-            is_feasible = bool(total_weight <= capacity)  # Convert to Python bool
+            solution = self._finish_prediction(
+                selection, weights_array, values_array, capacity, start_time, timer, observers
+            )
             
-            # If solution is infeasible, try to repair it
-            if not is_feasible:
-                selection, total_weight, total_value = self._repair_solution(
-                    np.array(selection), weights, values, capacity
-                )
-                selected_items = [i for i, selected in enumerate(selection) if selected == 1]
-                is_feasible = bool(total_weight <= capacity)  # Recheck feasibility after repair
+        except Exception as e:
+            # If anything fails in the ML pipeline, fall back to traditional solvers
+            logger.warning(f"ML solver failed: {str(e)}. Falling back to traditional solvers.")
+            solution = self._solve_fallback(weights, values, capacity, "ml_error", start_time, timer, observers)
+        return observers.finish(solution)
+    
+    def _solve_fallback(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        reason: str,
+        start_time: float,
+        timer: StageTimer,
+        observers: ObserverList
+    ) -> Dict:
+        """Answer with the DP, or with greedy if the DP fails, and record why."""
+        try:
+            solution = self.dp_solver.solve(weights, values, capacity, observers=observers.nested())
+            fallback_solver = "dp"
+        except Exception as e:
+            logger.warning(f"DP solver failed: {str(e)}. Falling back to greedy.")
+            solution = self.greedy_solver.solve(weights, values, capacity, observers=observers.nested())
+            fallback_solver = "greedy"
+        timer.lap("fallback")
+        ML_FALLBACKS.inc(reason=reason, solver=fallback_solver)
+        timer.fallback = {'reason': reason, 'solver': fallback_solver}
+        solution['solve_time'] = time.time() - start_time
+        return self._attach_profile(solution, timer)
+    
+    def _attach_profile(self, solution: Dict, timer: StageTimer) -> Dict:
+        if timer.stages is not None:
+            solution['profile'] = timer.profile()
+            logger.debug(f"ML solve profile: {solution['profile']}")
+        return solution
+    
+    def solve_batch(self, instances: List[Tuple[List[float], List[float], float]], profile: bool = False) -> List[Dict]:
+        """Solve many instances with one feature pass, one scaling and one model call.
+        
+        The per-call overhead of scaling and prediction is paid once for the whole
+        batch; repair and local search still run per instance. Each solution's
+        solve_time, and its profile's batched stages, include an equal share of
+        the batched stages. Instances the model cannot take (too many items), and
+        the whole batch if the batched prediction fails, are solved one by one
+        with solve().
+        
+        Args:
+            instances: (weights, values, capacity) tuples
+            profile: Add a 'profile' entry to each solution, as in solve()
             
+        Returns:
+            One solution dictionary per instance, in order
+        """
+        model = self.model
+        if model is None:
+            return [self.solve(weights, values, capacity, profile) for weights, values, capacity in instances]
+        
+        solutions = [None] * len(instances)
+        batch = [i for i, (weights, _, _) in enumerate(instances) if len(weights) <= model.max_items]
+        if batch:
+            try:
+                batch_start = time.time()
+                batch_timer = StageTimer(profile)
+                arrays = [
+                    (np.array(instances[i][0], dtype=float), np.array(instances[i][1], dtype=float), instances[i][2])
+                    for i in batch
+                ]
+                X = np.vstack([self._build_features(w, v, c, model.max_items) for w, v, c in arrays])
+                batch_timer.lap("features")
+                X = model.scaler.transform(X)
+                batch_timer.lap("scaling")
+                predictions = model.model.predict(X)
+                batch_timer.lap("predict")
+                share = (time.time() - batch_start) / len(batch)
+                
+                for i, (weights, values, capacity), prediction in zip(batch, arrays, predictions):
+                    now = time.time()
+                    timer = StageTimer(profile)
+                    if profile:
+                        timer.stages = {stage: seconds / len(batch) for stage, seconds in batch_timer.stages.items()}
+                    solutions[i] = self._finish_prediction(prediction, weights, values, capacity, now - share, timer)
+            except Exception as e:
+                logger.warning(f"Batched ML prediction failed: {str(e)}. Solving instances one by one.")
+        
+        for i, (weights, values, capacity) in enumerate(instances):
+            if solutions[i] is None:
+                solutions[i] = self.solve(weights, values, capacity, profile)
+        return solutions
+    
+    def _finish_prediction(
+        self,
+        selection: np.ndarray,
+        weights: np.ndarray,
+        values: np.ndarray,
+        capacity: float,
+        start_time: float,
+        timer: StageTimer,
+        observers: Optional[ObserverList] = None
+    ) -> Dict:
+        """Turn the model's raw prediction into a feasible, locally improved solution."""
+        observers = observers if observers is not None else ObserverList("ml")
+        # Convert to binary selection
+        if isinstance(selection, np.ndarray):
+            selection = (selection > 0.5).astype(int)
+        
+        # Ensure selection array matches actual number of items
+        selection = selection[:len(weights)] if isinstance(selection, np.ndarray) else selection[:len(weights)]
+        
+        # Truncate selection to actual number of items and convert to Python list
+        selected_items = []
+        for i, selected in enumerate(selection):
+            if i < len(weights) and selected == 1:
+                selected_items.append(i)
+                
+        total_weight = float(sum(weights[i] for i in selected_items if i < len(weights)))  # Convert to float
+        total_value = float(sum(values[i] for i in selected_items if i < len(values)))    # Convert to float
+        is_feasible = bool(total_weight <= capacity)  # Convert to Python bool
+        
+        # If solution is infeasible, try to repair it
+        if not is_feasible:
+            selection, total_weight, total_value, removed = self._repair_solution(
+                np.array(selection), weights, values, capacity
+            )
+            selected_items = [i for i, selected in enumerate(selection) if selected == 1]
+            is_feasible = bool(total_weight <= capacity)  # Recheck feasibility after repair
+            timer.lap("repair")
+            timer.count("repair", 1, removed)
+            if observers:
+                observers.iteration(stage="repair", iterations=1, moves_accepted=removed)
+        if observers and is_feasible:
+            observers.incumbent(total_value=total_value, total_weight=total_weight, selected_items=list(selected_items))
+        
+        if not observers.stop_requested:
             # Apply local search optimization to improve the solution
-            improved_selection, improved_value, improved_weight = self._local_search_optimization(
+            improved_selection, improved_value, improved_weight, iterations, moves = self._local_search_optimization(
                 np.array(selection) if isinstance(selection, list) else selection,
                 weights,
                 values,
@@ -251,50 +302,235 @@ class MLKnapsackSolver:
                 for i, selected in enumerate(selection):
                     if i < len(weights) and selected == 1:
                         selected_items.append(i)
-            
+                if observers and is_feasible:
+                    observers.incumbent(total_value=total_value, total_weight=total_weight, selected_items=list(selected_items))
+            timer.lap("local_search")
+            timer.count("local_search", iterations, moves)
+            if observers:
+                observers.iteration(stage="local_search", iterations=iterations, moves_accepted=moves)
+        
+        if not observers.stop_requested:
             # Apply capacity maximization to improve capacity utilization
-            selection, total_value, total_weight = self._maximize_capacity_utilization(
+            previous_value = total_value
+            selection, total_value, total_weight, iterations, moves = self._maximize_capacity_utilization(
                 selection if isinstance(selection, np.ndarray) else np.array(selection),
                 weights,
                 values,
                 capacity,
                 total_weight
             )
-            
-            # Safely extract selected items to avoid index errors
-            selected_items = []
-            for i, selected in enumerate(selection):
-                if i < len(weights) and selected == 1:
-                    selected_items.append(i)
-            
-            # Add solve time to ML solution
-            solve_time = time.time() - start_time
-            
-            return {
-                'selected_items': selected_items,
-                'total_value': total_value,
-                'total_weight': total_weight,
-                'is_feasible': is_feasible,
-                'selection': selection.tolist() if isinstance(selection, np.ndarray) else selection,
-                'solve_time': solve_time
-            }
-            
-        except Exception as e:
-            # If anything fails in the ML pipeline, fall back to traditional solvers
-            logger.warning(f"ML solver failed: {str(e)}. Falling back to traditional solvers.")
-            
-            try:
-                # Try DP first
-                dp_solution = self.dp_solver.solve(weights, values, capacity)
-                dp_solution['solve_time'] = time.time() - start_time
-                return dp_solution
-            except Exception as dp_error:
-                logger.warning(f"DP solver failed: {str(dp_error)}. Falling back to greedy.")
-            
-            # Fall back to greedy
-            greedy_solution = self.greedy_solver.solve(weights, values, capacity)
-            greedy_solution['solve_time'] = time.time() - start_time
-            return greedy_solution
+            timer.lap("capacity_fill")
+            timer.count("capacity_fill", iterations, moves)
+            if observers:
+                if total_value > previous_value and is_feasible:
+                    observers.incumbent(
+                        total_value=total_value, total_weight=total_weight,
+                        selected_items=[i for i, selected in enumerate(selection) if selected == 1]
+                    )
+                observers.iteration(stage="capacity_fill", iterations=iterations, moves_accepted=moves)
+        
+        # Safely extract selected items to avoid index errors
+        selected_items = []
+        for i, selected in enumerate(selection):
+            if i < len(weights) and selected == 1:
+                selected_items.append(i)
+        
+        # Add solve time to ML solution
+        solve_time = time.time() - start_time
+        
+        return self._attach_profile({
+            'selected_items': selected_items,
+            'total_value': total_value,
+            'total_weight': total_weight,
+            'is_feasible': is_feasible,
+            'selection': selection.tolist() if isinstance(selection, np.ndarray) else selection,
+            'solve_time': solve_time
+        }, timer)
+    
+    def _build_features(self, weights: np.ndarray, values: np.ndarray, capacity: float, max_items: Optional[int] = None) -> np.ndarray:
+        """Build the model's feature row for an instance, exactly as in training.
+        
+        Items are padded to max_items, the model's input width (self.max_items by default).
+        """
+        max_items = max_items or self.max_items
+        n_items = len(weights)
+        
+        # Calculate value/weight ratios
+        value_weight_ratios = values / weights
+        sorted_ratios = np.sort(value_weight_ratios)[::-1]  # Sort descending
+        
+        # Pad arrays to max_items
+        padded_weights = np.pad(weights, (0, max_items - len(weights)), 'constant')
+        padded_values = np.pad(values, (0, max_items - len(values)), 'constant')
+        
+        # Safely handle top k ratios when n_items < 5
+        n_ratios = min(n_items, 5)  # Use at most 5 or as many as available
+        
+        # Extra safety: Ensure we have at least one ratio
+        if len(value_weight_ratios) > 0:
+            sorted_ratios = np.sort(value_weight_ratios)[::-1]  # Sort descending
+            best_ratios = sorted_ratios[:n_ratios].tolist()  # Best k ratios
+            worst_ratios = sorted_ratios[max(-n_ratios, -len(sorted_ratios)):].tolist()  # Worst k ratios
+        else:
+            best_ratios = []
+            worst_ratios = []
+        
+        # Pad ratios arrays to always have 5 elements
+        best_ratios = best_ratios + [0.0] * (5 - len(best_ratios))
+        worst_ratios = worst_ratios + [0.0] * (5 - len(worst_ratios))
+        
+        # Get top 5 weights and values (same as in train_model.py)
+        sorted_weights = np.sort(weights)
+        sorted_values = np.sort(values)[::-1]  # Sort values descending
+        
+        # Be extra careful with small arrays
+        top_weights = sorted_weights[-min(5, len(sorted_weights)):].tolist()
+        top_weights = [0.0] * (5 - len(top_weights)) + top_weights
+        
+        top_values = sorted_values[:min(5, len(sorted_values))].tolist()
+        top_values = top_values + [0.0] * (5 - len(top_values))
+        
+        # Calculate additional features matching those in train_model.py
+        total_weight = float(np.sum(weights))
+        total_value = float(np.sum(values))
+        capacity_ratio = float(capacity / total_weight if total_weight > 0 else 1.0)
+        avg_weight = float(np.mean(weights))
+        avg_value = float(np.mean(values))
+        weight_variance = float(np.var(weights))
+        value_variance = float(np.var(values))
+        
+        # Calculate knapsack density (how many items can fit on average)
+        density = float(capacity / avg_weight if avg_weight > 0 else n_items)
+        
+        # Calculate potential value density (value per capacity unit)
+        value_density = float(total_value / capacity if capacity > 0 else total_value)
+        
+        # Calculate correlation between weights and values - safely
+        try:
+            if n_items > 1:
+                correlation = float(np.corrcoef(weights, values)[0, 1])
+            else:
+                correlation = 0.0
+        except:
+            correlation = 0.0
+        
+        # Calculate weight and value skewness
+        try:
+            weight_skew = float(self._calculate_skewness(weights))
+            value_skew = float(self._calculate_skewness(values))
+            ratio_skew = float(self._calculate_skewness(value_weight_ratios))
+        except:
+            weight_skew = 0.0
+            value_skew = 0.0
+            ratio_skew = 0.0
+        
+        # Calculate weight and value kurtosis
+        try:
+            weight_kurtosis = float(self._calculate_kurtosis(weights))
+            value_kurtosis = float(self._calculate_kurtosis(values))
+            ratio_kurtosis = float(self._calculate_kurtosis(value_weight_ratios))
+        except:
+            weight_kurtosis = 0.0
+            value_kurtosis = 0.0
+            ratio_kurtosis = 0.0
+        
+        # Prepare features exactly as in training
+        instance_features = [
+            n_items,
+            capacity,
+            float(np.mean(weights)),
+            float(np.std(weights)),
+            float(np.median(weights)),
+            float(np.percentile(weights, 25)),
+            float(np.percentile(weights, 75)),
+            float(np.mean(values)),
+            float(np.std(values)),
+            float(np.median(values)),
+            float(np.percentile(values, 25)),
+            float(np.percentile(values, 75)),
+            total_value,
+            total_weight,
+            capacity_ratio,  # capacity utilization
+            float(np.max(weights) / np.min(weights) if np.min(weights) > 0 else np.max(weights)),  # weight range ratio
+            float(np.max(values) / np.min(values) if np.min(values) > 0 else np.max(values)),    # value range ratio
+            float(np.mean(value_weight_ratios)),
+            float(np.std(value_weight_ratios)),
+            float(np.median(value_weight_ratios)),
+            float(np.max(value_weight_ratios)),
+            float(np.min(value_weight_ratios)),
+            # New features
+            density,
+            value_density,
+            correlation,
+            weight_variance,
+            value_variance,
+            weight_skew,
+            value_skew,
+            ratio_skew,
+            weight_kurtosis,
+            value_kurtosis,
+            ratio_kurtosis,
+            # Top values
+            *top_weights,
+            *top_values,
+            # Top k value/weight ratios
+            *[float(x) for x in best_ratios],  # Best 5 ratios (padded if needed)
+            *[float(x) for x in worst_ratios],  # Worst 5 ratios (padded if needed)
+        ]
+        
+        # Add padded weights and values
+        instance_features.extend([float(x) for x in padded_weights])
+        instance_features.extend([float(x) for x in padded_values])
+        
+        # Convert to numpy array and reshape for single prediction
+        return np.array([instance_features])
+    
+    def predict_probabilities(self, weights: List[float], values: List[float], capacity: float) -> Optional[np.ndarray]:
+        """Per-item selection probabilities from the model, e.g. to seed other solvers.
+        
+        Returns:
+            Array with one probability per item, or None if no model is loaded or
+            the instance has more than max_items items
+        """
+        model = self.model
+        if model is None or len(weights) > model.max_items:
+            return None
+        weights = np.array(weights, dtype=float)
+        values = np.array(values, dtype=float)
+        X = model.scaler.transform(self._build_features(weights, values, capacity, model.max_items))
+        return model.selection_probabilities(X)[0][:len(weights)]
+    
+    def warm_up(self, model: KnapsackMLModel, n_runs: int = 3) -> float:
+        """Run a model on a synthetic instance so its first real request pays no cold-start cost.
+        
+        Returns:
+            Seconds taken
+        """
+        start_time = time.perf_counter()
+        rng = np.random.default_rng(0)
+        weights = rng.uniform(1.0, 100.0, model.max_items)
+        values = rng.uniform(1.0, 100.0, model.max_items)
+        X = model.scaler.transform(self._build_features(weights, values, float(weights.sum()) / 2, model.max_items))
+        for _ in range(n_runs):
+            model.model.predict(X)
+            model.selection_probabilities(X)
+        return time.perf_counter() - start_time
+    
+    def set_n_jobs(self, n_jobs: int):
+        """Set the number of jobs the model predicts with, if it has such a parameter.
+        
+        Worker processes set 1, so they neither oversubscribe the CPUs nor start
+        joblib worker processes of their own.
+        """
+        estimator = getattr(self.model, 'model', None)
+        if hasattr(estimator, 'get_params') and 'n_jobs' in estimator.get_params():
+            estimator.set_params(n_jobs=n_jobs)
+    
+    def swap_model(self, model: KnapsackMLModel, version: Optional[str] = None):
+        """Replace the model in one step; requests already running finish on the old one."""
+        self.model = model
+        self.max_items = model.max_items
+        self.model_version = version
     
     def _repair_solution(
         self,
@@ -302,8 +538,12 @@ class MLKnapsackSolver:
         weights: List[float],
         values: List[float],
         capacity: float
-    ) -> Tuple[np.ndarray, float, float]:
-        """Repair an infeasible solution by removing items."""
+    ) -> Tuple[np.ndarray, float, float, int]:
+        """Repair an infeasible solution by removing items.
+        
+        Returns:
+            The repaired selection, its weight and value, and the number of items removed
+        """
         selection = selection.copy()
         # Ensure selection array size matches weights/values
         if isinstance(selection, np.ndarray) and len(selection) > len(weights):
@@ -326,13 +566,15 @@ class MLKnapsackSolver:
         total_weight = sum(weights[i] for i in selected_items if i < len(weights))
         total_value = sum(values[i] for i in selected_items if i < len(values))
         
+        removed = 0
         while total_weight > capacity and ratios:
             item_idx = ratios.pop(0)[0]  # Remove item with lowest ratio
             selection[item_idx] = 0
             total_weight -= weights[item_idx]
             total_value -= values[item_idx]
+            removed += 1
         
-        return selection, total_weight, total_value
+        return selection, total_weight, total_value, removed
     
     def _calculate_skewness(self, data: np.ndarray) -> float:
         """Calculate skewness of a distribution."""
@@ -369,8 +611,13 @@ class MLKnapsackSolver:
         values: np.ndarray, 
         capacity: float,
         max_iterations: int = 100
-    ) -> Tuple[np.ndarray, float, float]:
-        """Apply local search optimization to improve the solution."""
+    ) -> Tuple[np.ndarray, float, float, int, int]:
+        """Apply local search optimization to improve the solution.
+        
+        Returns:
+            The improved selection, its value and weight, the number of rounds
+            run and the number of swaps accepted
+        """
         # Ensure selection array size matches weights/values
         if isinstance(selection, np.ndarray) and len(selection) > len(weights):
             selection = selection[:len(weights)]
@@ -381,7 +628,9 @@ class MLKnapsackSolver:
         best_weight = sum(weights[i] for i, selected in enumerate(selection) 
                           if i < len(weights) and selected == 1)
         
+        iterations = moves = 0
         for _ in range(max_iterations):
+            iterations += 1
             improved = False
             
             # Try removing one item and adding another
@@ -407,6 +656,7 @@ class MLKnapsackSolver:
                         best_value = new_value
                         best_weight = best_weight - weights[remove_idx] + weights[add_idx]
                         improved = True
+                        moves += 1
                         break
                 
                 if improved:
@@ -416,7 +666,7 @@ class MLKnapsackSolver:
             if not improved:
                 break
         
-        return best_selection, best_value, best_weight
+        return best_selection, best_value, best_weight, iterations, moves
     
     def _maximize_capacity_utilization(
         self,
@@ -426,8 +676,13 @@ class MLKnapsackSolver:
         capacity: float,
         current_weight: float,
         max_iterations: int = 200
-    ) -> Tuple[np.ndarray, float, float]:
-        """Maximize capacity utilization by adding more items if possible."""
+    ) -> Tuple[np.ndarray, float, float, int, int]:
+        """Maximize capacity utilization by adding more items if possible.
+        
+        Returns:
+            The new selection, its value and weight, the number of swap rounds
+            run and the number of items added or swaps accepted
+        """
         # Ensure selection array size matches weights/values
         if isinstance(selection, np.ndarray) and len(selection) > len(weights):
             selection = selection[:len(weights)]
@@ -442,26 +697,29 @@ class MLKnapsackSolver:
         
         # If we're already using most of the capacity, don't bother
         if remaining_capacity < 0.05 * capacity:
-            return best_selection, best_value, best_weight
+            return best_selection, best_value, best_weight, 0, 0
         
         # Sort unselected items by value/weight ratio
         unselected_indices = [i for i, selected in enumerate(best_selection) if selected == 0]
         if not unselected_indices:
-            return best_selection, best_value, best_weight
+            return best_selection, best_value, best_weight, 0, 0
             
         # Try to add items greedily to fill remaining capacity
         value_weight_ratios = [(i, values[i]/weights[i]) for i in unselected_indices if weights[i] <= remaining_capacity]
         value_weight_ratios.sort(key=lambda x: x[1], reverse=True)  # Sort by ratio descending
         
+        iterations = moves = 0
         for idx, _ in value_weight_ratios:
             if weights[idx] <= remaining_capacity:
                 best_selection[idx] = 1
                 best_weight += weights[idx]
                 best_value += values[idx]
                 remaining_capacity = capacity - best_weight
+                moves += 1
         
         # Try swapping combinations of items to improve capacity utilization
         for _ in range(max_iterations):
+            iterations += 1
             improved = False
             selected_indices = [i for i, selected in enumerate(best_selection) if selected == 1]
             unselected_indices = [i for i, selected in enumerate(best_selection) if selected == 0]
@@ -491,6 +749,7 @@ class MLKnapsackSolver:
                         best_value = new_value
                         best_weight = new_weight
                         improved = True
+                        moves += 1
                         break
                 
                 if improved:
@@ -518,6 +777,7 @@ class MLKnapsackSolver:
                             best_value = new_value
                             best_weight = new_weight
                             improved = True
+                            moves += 1
                             break
                     
                     if improved:
@@ -530,7 +790,7 @@ class MLKnapsackSolver:
             if not improved:
                 break
         
-        return best_selection, best_value, best_weight
+        return best_selection, best_value, best_weight, iterations, moves
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,315 @@
+import logging
+import threading
+import time
+from typing import List, Dict, Any, Optional, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class SolverObserver:
+    """Receives the events of a solver run.
+
+    Every hook gets an event dictionary with 'type', 'solver' and 'elapsed'
+    (seconds since the run started) plus type-specific fields:
+
+    - on_start: 'n_items' and 'capacity'
+    - on_incumbent: an improving feasible solution, with 'total_value',
+      'total_weight' and 'selected_items', and 'bound' where the solver knows one
+    - on_bound: a new upper bound on the optimal value, as 'bound'
+    - on_iteration: one unit of the solver's work (a DP row, a GA generation,
+      an ML pipeline stage, a batch of branch and bound nodes)
+    - on_finish: the solver's result dictionary
+
+    Returning True from on_incumbent, on_bound or on_iteration asks the solver
+    to stop and return its best solution so far. Subclasses override only the
+    hooks they need.
+    """
+
+    def on_start(self, event: Dict[str, Any]):
+        pass
+
+    def on_incumbent(self, event: Dict[str, Any]) -> Optional[bool]:
+        pass
+
+    def on_bound(self, event: Dict[str, Any]) -> Optional[bool]:
+        pass
+
+    def on_iteration(self, event: Dict[str, Any]) -> Optional[bool]:
+        pass
+
+    def on_finish(self, event: Dict[str, Any]):
+        pass
+
+
+class ObserverList:
+    def __init__(self, solver: str, observers: Optional[Sequence[SolverObserver]] = None):
+        """Dispatch one run's events to its observers.
+
+        Solvers create one per solve() call and report through it. It is
+        falsy without observers, so solvers can skip building events nobody
+        receives. Once any observer asks to stop, stop_requested stays set.
+
+        Args:
+            solver: Solver name put into every event
+            observers: Observers of the run
+        """
+        self.solver = solver
+        self.observers = list(observers or ())
+        self.stop_requested = False
+        self._start_time = time.time()
+
+    def __bool__(self) -> bool:
+        return bool(self.observers)
+
+    def _event(self, event_type: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(fields, type=event_type, solver=self.solver, elapsed=time.time() - self._start_time)
+
+    def _dispatch(self, hook: str, event_type: str, fields: Dict[str, Any]) -> bool:
+        if not self.observers:
+            return False
+        event = self._event(event_type, fields)
+        for observer in self.observers:
+            if getattr(observer, hook)(event):
+                self.stop_requested = True
+        return self.stop_requested
+
+    def start(self, n_items: int, capacity: float, **fields):
+        self._start_time = time.time()
+        if self.observers:
+            event = self._event('start', dict(fields, n_items=n_items, capacity=capacity))
+            for observer in self.observers:
+                observer.on_start(event)
+
+    def incumbent(self, **fields) -> bool:
+        """Report an improving solution; True if the run should stop."""
+        return self._dispatch('on_incumbent', 'incumbent', fields)
+
+    def bound(self, **fields) -> bool:
+        """Report a new upper bound; True if the run should stop."""
+        return self._dispatch('on_bound', 'bound', fields)
+
+    def iteration(self, **fields) -> bool:
+        """Report one unit of work; True if the run should stop."""
+        return self._dispatch('on_iteration', 'iteration', fields)
+
+    def finish(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Report the result and return it unchanged."""
+        if self.observers:
+            event = self._event('finish', result)
+            for observer in self.observers:
+                observer.on_finish(event)
+        return result
+
+    def nested(self) -> List[SolverObserver]:
+        """Observers for a solver run as part of this run, e.g. a fallback.
+
+        The nested run's incumbents, bounds and iterations are reported as
+        events of this run; its start and finish are not, so observers see a
+        single start and finish per solve.
+        """
+        return [_NestedRunObserver(self)] if self.observers else []
+
+
+class _NestedRunObserver(SolverObserver):
+    def __init__(self, parent: ObserverList):
+        """Pass a nested run's progress on to the enclosing run's observers."""
+        self.parent = parent
+
+    @staticmethod
+    def _fields(event: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in event.items() if k not in ('type', 'solver', 'elapsed')}
+
+    def on_incumbent(self, event: Dict[str, Any]) -> Optional[bool]:
+        return self.parent.incumbent(**self._fields(event))
+
+    def on_bound(self, event: Dict[str, Any]) -> Optional[bool]:
+        return self.parent.bound(**self._fields(event))
+
+    def on_iteration(self, event: Dict[str, Any]) -> Optional[bool]:
+        return self.parent.iteration(**self._fields(event))
+
+
+class LoggingObserver(SolverObserver):
+    def __init__(self, log: Optional[logging.Logger] = None, level: int = logging.INFO):
+        """Log starts, incumbents and results at level, bounds and iterations at DEBUG."""
+        self.log = log or logger
+        self.level = level
+
+    def on_start(self, event: Dict[str, Any]):
+        self.log.log(self.level, f"{event['solver']}: started on {event['n_items']} items, capacity {event['capacity']}")
+
+    def on_incumbent(self, event: Dict[str, Any]) -> Optional[bool]:
+        self.log.log(self.level, f"{event['solver']}: incumbent {event['total_value']:.6g} "
+                                 f"(weight {event['total_weight']:.6g}) after {event['elapsed']:.3f}s")
+
+    def on_bound(self, event: Dict[str, Any]) -> Optional[bool]:
+        self.log.debug(f"{event['solver']}: bound {event['bound']:.6g} after {event['elapsed']:.3f}s")
+
+    def on_iteration(self, event: Dict[str, Any]) -> Optional[bool]:
+        fields = {k: v for k, v in event.items() if k not in ('type', 'solver', 'elapsed')}
+        self.log.debug(f"{event['solver']}: iteration {fields} after {event['elapsed']:.3f}s")
+
+    def on_finish(self, event: Dict[str, Any]):
+        self.log.log(self.level, f"{event['solver']}: finished with value {event['total_value']:.6g} "
+                                 f"in {event['elapsed']:.3f}s")
+
+
+class TracingObserver(SolverObserver):
+    def __init__(self, on_span: Optional[Callable[[Dict[str, Any]], None]] = None, iterations: bool = False):
+        """Record each run as a span with timestamped events, for tracing backends.
+
+        A span has the solver name, start and end (epoch seconds), duration,
+        result attributes and its events: incumbents, bounds and, with
+        iterations, every iteration. Finished spans are kept in self.spans and
+        handed to on_span, e.g. to export them.
+
+        Args:
+            on_span: Called with every finished span
+            iterations: Also record iteration events, which can be numerous
+        """
+        self.on_span = on_span
+        self.iterations = iterations
+        self.spans: List[Dict[str, Any]] = []
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def _add_event(self, event: Dict[str, Any]):
+        span = self._open.get((threading.get_ident(), event['solver']))
+        if span is not None:
+            span['events'].append({
+                'name': event['type'],
+                'time': span['start'] + event['elapsed'],
+                'attributes': {k: v for k, v in event.items() if k not in ('type', 'solver', 'elapsed', 'selected_items')}
+            })
+
+    def on_start(self, event: Dict[str, Any]):
+        self._open[(threading.get_ident(), event['solver'])] = {
+            'name': f"solve.{event['solver']}",
+            'start': time.time() - event['elapsed'],
+            'attributes': {'n_items': event['n_items'], 'capacity': event['capacity']},
+            'events': []
+        }
+
+    def on_incumbent(self, event: Dict[str, Any]) -> Optional[bool]:
+        self._add_event(event)
+
+    def on_bound(self, event: Dict[str, Any]) -> Optional[bool]:
+        self._add_event(event)
+
+    def on_iteration(self, event: Dict[str, Any]) -> Optional[bool]:
+        if self.iterations:
+            self._add_event(event)
+
+    def on_finish(self, event: Dict[str, Any]):
+        span = self._open.pop((threading.get_ident(), event['solver']), None)
+        if span is None:
+            return
+        span['end'] = span['start'] + event['elapsed']
+        span['duration'] = event['elapsed']
+        span['attributes'].update({
+            k: event[k] for k in ('total_value', 'total_weight', 'is_feasible', 'is_optimal', 'stop_reason')
+            if k in event
+        })
+        with self._lock:
+            self.spans.append(span)
+        if self.on_span is not None:
+            self.on_span(span)
+
+
+class EarlyStopObserver(SolverObserver):
+    def __init__(
+        self,
+        target_value: Optional[float] = None,
+        max_gap: Optional[float] = None,
+        time_limit: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+        cpu_time_limit: Optional[float] = None
+    ):
+        """Stop a run once its answer is good enough or its time is up.
+
+        Args:
+            target_value: Stop at an incumbent of at least this value
+            max_gap: Stop once (bound - incumbent) / bound is at most this
+            time_limit: Stop at the first event after this many seconds
+            stop_event: Stop at the first event after it is set, e.g. from another thread
+            cpu_time_limit: Stop at the first event after the run used this many CPU
+                seconds, measured on the thread that runs the solver
+        """
+        self.target_value = target_value
+        self.max_gap = max_gap
+        self.time_limit = time_limit
+        self.stop_event = stop_event
+        self.cpu_time_limit = cpu_time_limit
+        self.best_value = None
+        self.best_bound = None
+        self.reason = None
+        self._cpu_start = None
+
+    def _check(self, event: Dict[str, Any]) -> bool:
+        if self.reason is None:
+            if self.stop_event is not None and self.stop_event.is_set():
+                self.reason = "stop_event"
+            elif self.time_limit is not None and event['elapsed'] >= self.time_limit:
+                self.reason = "time_limit"
+            elif (self.cpu_time_limit is not None and self._cpu_start is not None
+                    and time.thread_time() - self._cpu_start >= self.cpu_time_limit):
+                self.reason = "cpu_time_limit"
+            elif self.best_value is not None and self.target_value is not None and self.best_value >= self.target_value:
+                self.reason = "target_value"
+            elif (self.max_gap is not None and self.best_value is not None and self.best_bound
+                    and (self.best_bound - self.best_value) / self.best_bound <= self.max_gap):
+                self.reason = "max_gap"
+        return self.reason is not None
+
+    def on_start(self, event: Dict[str, Any]):
+        self.best_value = None
+        self.best_bound = None
+        self.reason = None
+        self._cpu_start = time.thread_time()
+
+    def on_incumbent(self, event: Dict[str, Any]) -> Optional[bool]:
+        self.best_value = event['total_value']
+        if event.get('bound') is not None:
+            self.best_bound = event['bound']
+        return self._check(event)
+
+    def on_bound(self, event: Dict[str, Any]) -> Optional[bool]:
+        self.best_bound = event['bound']
+        return self._check(event)
+
+    def on_iteration(self, event: Dict[str, Any]) -> Optional[bool]:
+        return self._check(event)
+
+
+class ProgressObserver(SolverObserver):
+    def __init__(
+        self,
+        callback: Callable[[Dict[str, Any]], Optional[bool]],
+        events: Sequence[str] = ('incumbent', 'bound')
+    ):
+        """Forward selected events to a progress function, e.g. to stream them to a client.
+
+        Args:
+            callback: Called with each forwarded event; returning True stops the run
+            events: Event types to forward
+        """
+        self.callback = callback
+        self.events = set(events)
+
+    def _forward(self, event: Dict[str, Any]) -> bool:
+        return event['type'] in self.events and bool(self.callback(event))
+
+    def on_start(self, event: Dict[str, Any]):
+        self._forward(event)
+
+    def on_incumbent(self, event: Dict[str, Any]) -> Optional[bool]:
+        return self._forward(event)
+
+    def on_bound(self, event: Dict[str, Any]) -> Optional[bool]:
+        return self._forward(event)
+
+    def on_iteration(self, event: Dict[str, Any]) -> Optional[bool]:
+        return self._forward(event)
+
+    def on_finish(self, event: Dict[str, Any]):
+        self._forward(event)
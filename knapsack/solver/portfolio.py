@@ -0,0 +1,306 @@
+import inspect
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import numpy as np
+from threadpoolctl import threadpool_limits
+from typing import List, Dict, Any, Optional, Sequence
+
+from knapsack.solver.observers import ObserverList, ProgressObserver, SolverObserver
+from knapsack.solver.traditional_solver import GreedyKnapsackSolver
+
+logger = logging.getLogger(__name__)
+
+# Solvers whose final answer is provably optimal
+EXACT_SOLVERS = ("dp", "bnb")
+
+
+def _single_threaded(solver: Any):
+    """Pin the ML models a member holds to one job; members run as daemonic processes,
+    which cannot start joblib worker processes."""
+    from knapsack.solver.ml_solver import MLKnapsackSolver
+    for candidate in (solver, getattr(solver, 'ml_solver', None)):
+        if isinstance(candidate, MLKnapsackSolver):
+            candidate.set_n_jobs(1)
+
+
+def _member_worker(name: str, solver: Any, tasks, results, cancelled):
+    """Serve races for one portfolio member in a long-lived process.
+
+    Each task is (race_id, weights, values, capacity). A member set serves one
+    race at a time, so a race is over once the set's cancelled counter reaches
+    its id; the member then stops at its next progress report and skips stale
+    tasks.
+    """
+    _single_threaded(solver)
+    reports_progress = 'observers' in inspect.signature(solver.solve).parameters
+
+    # Members run side by side, so each keeps its native thread pools to one thread
+    with threadpool_limits(1):
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            race_id, weights, values, capacity = task
+            if cancelled.value >= race_id:
+                continue
+
+            def on_progress(event: Dict) -> bool:
+                if event['type'] == 'incumbent':
+                    results.put(('incumbent', race_id, name, event))
+                return cancelled.value >= race_id
+
+            try:
+                if reports_progress:
+                    observer = ProgressObserver(on_progress, events=('incumbent', 'bound', 'iteration'))
+                    solution = solver.solve(weights, values, capacity, observers=[observer])
+                else:
+                    solution = solver.solve(weights, values, capacity)
+                results.put(('result', race_id, name, solution))
+            except Exception as e:
+                results.put(('error', race_id, name, str(e)))
+
+
+class _MemberSet:
+    def __init__(self, context, solvers: Dict[str, Any]):
+        """One process per non-greedy member, together serving one race at a time."""
+        self.context = context
+        self.solvers = solvers
+        self.workers = {}
+        self.tasks = {}
+        self.results = None
+        self.cancelled = None
+
+    def start(self):
+        """Start the member processes that are not running."""
+        if self.results is None:
+            self.results = self.context.Queue()
+            self.cancelled = self.context.Value('q', 0)
+        for name, solver in self.solvers.items():
+            if name == "greedy" or (name in self.workers and self.workers[name].is_alive()):
+                continue
+            self.tasks[name] = self.context.Queue()
+            self.workers[name] = self.context.Process(
+                target=_member_worker,
+                args=(name, solver, self.tasks[name], self.results, self.cancelled),
+                daemon=True
+            )
+            self.workers[name].start()
+
+    def stop(self):
+        """Stop the member processes."""
+        workers, tasks = self.workers, self.tasks
+        self.workers, self.tasks, self.results, self.cancelled = {}, {}, None, None
+        for task_queue in tasks.values():
+            task_queue.put(None)
+        for worker in workers.values():
+            worker.join(timeout=1.0)
+            if worker.is_alive():
+                worker.terminate()
+
+
+class PortfolioKnapsackSolver:
+    def __init__(self, solvers: Dict[str, Any], deadline: float = 5.0, max_races: int = 1):
+        """Race several solvers in separate processes and keep the best answer.
+
+        Every member runs in a long-lived process holding a copy of the solver,
+        started on first use or by start(). There are max_races such member
+        sets, so up to that many races run at once; further races wait for a
+        set until their deadline. Call restart() after changing a member (e.g.
+        swapping its model). The greedy member runs in-process before every
+        race instead, so there is always an answer by the deadline.
+
+        Args:
+            solvers: Mapping of member name to solver instance
+            deadline: Default number of seconds to wait before returning the best incumbent
+            max_races: Number of races that can run at the same time
+        """
+        if max_races < 1:
+            raise ValueError("The portfolio needs at least one member set")
+        self.solvers = solvers
+        self.deadline = deadline
+        self.max_races = max_races
+        self.fallback_solver = solvers.get("greedy") or GreedyKnapsackSolver()
+        # Forking a multi-threaded server (e.g. from a web framework's thread pool) can
+        # deadlock the child, so member processes are never plain forks
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        if context.get_start_method() == "forkserver":
+            # Import the members' modules (and their ML libraries) once in the fork server,
+            # instead of in every member process it starts
+            context.set_forkserver_preload(
+                [__name__] + sorted({type(solver).__module__ for solver in solvers.values()})
+            )
+        self._member_sets = [_MemberSet(context, solvers) for _ in range(max_races)]
+        # Member sets not serving a race; a race or a restart takes one out while it uses it
+        self._free = list(self._member_sets)
+        self._condition = threading.Condition()
+        self._race_ids = itertools.count(1)
+
+    def _take(self, member_set: Optional[_MemberSet] = None, timeout: Optional[float] = None) -> Optional[_MemberSet]:
+        """Wait for a free member set (or the given one) and take it; None on timeout."""
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: member_set in self._free if member_set is not None else self._free,
+                timeout=timeout
+            ):
+                return None
+            member_set = member_set or self._free[-1]
+            self._free.remove(member_set)
+            return member_set
+
+    def _put_back(self, member_set: _MemberSet):
+        with self._condition:
+            self._free.append(member_set)
+            self._condition.notify_all()
+
+    def start(self):
+        """Start the member processes that are not running."""
+        for member_set in self._member_sets:
+            member_set = self._take(member_set)
+            try:
+                member_set.start()
+            finally:
+                self._put_back(member_set)
+
+    def restart(self):
+        """Replace the member processes with ones holding the current solvers.
+
+        Each member set is restarted once its current race has ended, so races
+        in flight keep their members; the other sets go on serving races.
+        """
+        for member_set in self._member_sets:
+            member_set = self._take(member_set)
+            try:
+                member_set.stop()
+                member_set.start()
+            finally:
+                self._put_back(member_set)
+
+    def shutdown(self):
+        """Stop the member processes at once; the next race starts new ones."""
+        for member_set in self._member_sets:
+            member_set.stop()
+
+    def solve(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        observers: Optional[Sequence[SolverObserver]] = None,
+        deadline: Optional[float] = None
+    ) -> Dict:
+        """Solve knapsack problem by racing all member solvers.
+
+        Returns as soon as an exact member proves optimality, every member has
+        finished, or the deadline expires; members still running stop at their
+        next progress report. The greedy solution computed before the race is
+        the answer when no member reports a better one in time, also when the
+        deadline passes while waiting for a free member set.
+
+        Args:
+            weights: List of item weights
+            values: List of item values
+            capacity: Knapsack capacity
+            observers: Notified of the start, every improvement of the best solution
+                (with the member that found it as 'member') and the result; any of
+                them can stop the race
+            deadline: Seconds to wait, overriding the default
+
+        Returns:
+            Dictionary containing solution details of the best member, plus the winner,
+            whether optimality was proven and each member's outcome
+        """
+        start_time = time.time()
+        observers = ObserverList("portfolio", observers)
+        observers.start(len(weights), capacity)
+        deadline_at = start_time + (self.deadline if deadline is None else deadline)
+        weights = list(weights)
+        values = list(values)
+
+        best = self.fallback_solver.solve(weights, values, capacity)
+        winner = "greedy"
+        outcomes = {name: "cancelled" for name in self.solvers}
+        if "greedy" in self.solvers:
+            outcomes["greedy"] = "finished"
+        is_optimal = False
+        stopped = bool(observers) and observers.incumbent(
+            member=winner,
+            total_value=best['total_value'],
+            total_weight=best['total_weight'],
+            selected_items=best['selected_items']
+        )
+
+        members = [name for name in self.solvers if name != "greedy"]
+        member_set = None
+        if members and not stopped:
+            member_set = self._take(timeout=max(deadline_at - time.time(), 0))
+        if member_set is not None:
+            race_id = next(self._race_ids)
+            cancelled = None
+            try:
+                member_set.start()
+                results, cancelled = member_set.results, member_set.cancelled
+                for name in members:
+                    member_set.tasks[name].put((race_id, weights, values, capacity))
+
+                while not is_optimal and any(outcome == "cancelled" for outcome in outcomes.values()):
+                    remaining = deadline_at - time.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        kind, message_race, name, payload = results.get(timeout=min(remaining, 0.05))
+                    except queue.Empty:
+                        # Members that died (e.g. killed for memory) count as failed and restart next race
+                        for name in members:
+                            worker = member_set.workers.get(name)
+                            if outcomes[name] == "cancelled" and (worker is None or not worker.is_alive()) and results.empty():
+                                outcomes[name] = "failed"
+                        continue
+                    if message_race != race_id:
+                        continue
+
+                    if kind == 'error':
+                        logger.warning(f"Portfolio member {name} failed: {payload}")
+                        outcomes[name] = "failed"
+                        continue
+                    if kind == 'result':
+                        outcomes[name] = "finished"
+                        if name in EXACT_SOLVERS and payload.get('is_optimal', True):
+                            is_optimal = True
+                    if not payload.get('is_feasible', True):
+                        continue
+                    if payload['total_value'] > best['total_value']:
+                        best = payload
+                        winner = name
+                        if observers and observers.incumbent(
+                            member=name,
+                            total_value=payload['total_value'],
+                            total_weight=payload['total_weight'],
+                            selected_items=payload['selected_items']
+                        ):
+                            break
+            finally:
+                if cancelled is not None:
+                    cancelled.value = race_id
+                self._put_back(member_set)
+
+        n = len(weights)
+        selected_items = sorted(int(i) for i in best['selected_items'])
+        selection = np.zeros(n)
+        selection[selected_items] = 1
+
+        return observers.finish({
+            'selected_items': selected_items,
+            'total_value': best['total_value'],
+            'total_weight': best['total_weight'],
+            'is_feasible': True,
+            'selection': selection.tolist(),
+            'solve_time': time.time() - start_time,
+            'winner': winner,
+            'is_optimal': is_optimal,
+            'members': outcomes
+        })
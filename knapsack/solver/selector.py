@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import time
+import numpy as np
+from typing import List, Dict, Optional, Any
+
+from knapsack.solver.cost_model import SolverCostModel, summarize_instance
+
+DEFAULT_PROFILE_PATH = 'knapsack/models/solver_profile.json'
+
+# Expected fraction of the optimal value before any calibration data exists
+DEFAULT_QUALITY = {
+    "dp": 1.0,
+    "bnb": 1.0,
+    "ml": 0.97,
+    "ga": 0.99,
+    "greedy": 0.85
+}
+
+
+def instance_features(weights: List[float], values: List[float], capacity: float) -> Dict:
+    """Instance properties used by the runtime and quality models.
+
+    Args:
+        weights: List of item weights
+        values: List of item values
+        capacity: Knapsack capacity
+
+    Returns:
+        Dictionary with size, scaled capacity, weight/value correlation,
+        coefficient scale and capacity ratio
+    """
+    weights = np.asarray(weights, dtype=float)
+    values = np.asarray(values, dtype=float)
+    summary = summarize_instance(weights, values, capacity)
+    if len(weights) > 1 and np.std(weights) > 0 and np.std(values) > 0:
+        correlation = float(np.corrcoef(weights, values)[0, 1])
+    else:
+        correlation = 0.0
+    return {
+        'n_items': summary['n_items'],
+        'capacity_scaled': summary['capacity_scaled'],
+        'correlation': correlation,
+        'scale': float(np.max(weights)),
+        'capacity_ratio': float(capacity / np.sum(weights))
+    }
+
+
+def _runtime_design(features: Dict) -> np.ndarray:
+    # log-runtime is modeled as linear in log size, log capacity, |correlation| and log scale
+    return np.array([
+        1.0,
+        np.log(features['n_items'] + 1),
+        np.log(features['capacity_scaled'] + 1),
+        abs(features['correlation']),
+        np.log(features['scale'] + 1)
+    ])
+
+
+def _quality_design(features: Dict) -> np.ndarray:
+    return np.array([
+        1.0,
+        np.log(features['n_items'] + 1),
+        features['correlation'],
+        min(features['capacity_ratio'], 1.0)
+    ])
+
+
+class SolverPerformanceModel:
+    def __init__(self, cost_model: SolverCostModel, coefficients: Optional[Dict[str, Dict[str, List[float]]]] = None):
+        """Predict each solver's runtime and solution quality on an instance.
+
+        Solvers without calibration data fall back to the analytic cost model for
+        runtime and to DEFAULT_QUALITY for quality.
+
+        Args:
+            cost_model: Analytic estimator used for uncalibrated solvers
+            coefficients: Per-solver 'runtime' and 'quality' regression coefficients
+        """
+        self.cost_model = cost_model
+        self.coefficients = coefficients or {}
+
+    def predict(self, solver_type: str, features: Dict) -> Dict:
+        """Predict runtime in seconds and quality as a fraction of the optimal value."""
+        fitted = self.coefficients.get(solver_type)
+        if fitted is not None:
+            runtime = float(np.exp(_runtime_design(features) @ np.array(fitted['runtime'])))
+            quality = float(np.clip(_quality_design(features) @ np.array(fitted['quality']), 0.0, 1.0))
+        else:
+            runtime = self.cost_model.estimate(solver_type, features)['cpu_seconds']
+            quality = DEFAULT_QUALITY[solver_type]
+        return {'runtime': runtime, 'quality': quality}
+
+    def choose(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        latency_target: float,
+        candidates: List[str]
+    ) -> Dict[str, Any]:
+        """Pick the solver with the best expected quality within the latency target.
+
+        Ties on quality go to the faster solver. If no solver is expected to meet
+        the target, the fastest one is chosen.
+
+        Returns:
+            Dictionary with the chosen solver, the reason and all predictions
+        """
+        features = instance_features(weights, values, capacity)
+        predictions = {name: self.predict(name, features) for name in candidates}
+        within = [name for name in candidates if predictions[name]['runtime'] <= latency_target]
+
+        if within:
+            chosen = max(within, key=lambda name: (predictions[name]['quality'], -predictions[name]['runtime']))
+            reason = (
+                f"best expected quality ({predictions[chosen]['quality']:.3f}) among solvers expected "
+                f"to finish within {latency_target:g}s ({predictions[chosen]['runtime']:.4f}s)"
+            )
+        else:
+            chosen = min(candidates, key=lambda name: predictions[name]['runtime'])
+            reason = (
+                f"no solver is expected to finish within {latency_target:g}s; "
+                f"fastest expected is {predictions[chosen]['runtime']:.4f}s"
+            )
+        return {'solver': chosen, 'reason': reason, 'predictions': predictions}
+
+    def fit(self, records: List[Dict]):
+        """Fit the per-solver models from benchmark records.
+
+        Each record holds the instance_features fields plus 'solver', 'runtime'
+        (seconds) and 'quality' (value / optimal value).
+        """
+        for solver_type in sorted({record['solver'] for record in records}):
+            rows = [record for record in records if record['solver'] == solver_type]
+            X_runtime = np.array([_runtime_design(row) for row in rows])
+            y_runtime = np.log(np.maximum([row['runtime'] for row in rows], 1e-7))
+            X_quality = np.array([_quality_design(row) for row in rows])
+            y_quality = np.array([row['quality'] for row in rows])
+            self.coefficients[solver_type] = {
+                'runtime': np.linalg.lstsq(X_runtime, y_runtime, rcond=None)[0].tolist(),
+                'quality': np.linalg.lstsq(X_quality, y_quality, rcond=None)[0].tolist(),
+                'n_records': len(rows)
+            }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.coefficients, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, cost_model: SolverCostModel) -> 'SolverPerformanceModel':
+        """Load fitted coefficients, or start uncalibrated if the file does not exist."""
+        if not os.path.exists(path):
+            return cls(cost_model)
+        with open(path) as f:
+            return cls(cost_model, json.load(f))
+
+
+def calibrate(
+    solvers: Dict[str, Any],
+    sizes: List[int] = (10, 20, 30),
+    scales: List[float] = (10.0, 30.0),
+    correlations: List[float] = (0.0, 0.5, 1.0),
+    repetitions: int = 3,
+    seed: int = 0
+) -> List[Dict]:
+    """Run every solver over a grid of random instances and record runtime and quality.
+
+    Values are drawn as a mix of independent noise and the item weight, so the
+    correlation grid spans uncorrelated to strongly correlated instances. The
+    optimum used for quality comes from the branch and bound solver.
+
+    Args:
+        solvers: Mapping of solver name to solver instance; must include 'bnb'
+        sizes: Numbers of items
+        scales: Maximum item weight (coefficient range)
+        correlations: Mixing weights between independent and weight-correlated values
+        repetitions: Instances per grid point
+        seed: Random seed
+
+    Returns:
+        List of benchmark records accepted by SolverPerformanceModel.fit
+    """
+    rng = np.random.default_rng(seed)
+    records = []
+    for n in sizes:
+        for scale in scales:
+            for rho in correlations:
+                for _ in range(repetitions):
+                    weights = rng.uniform(1, scale, n)
+                    values = (1 - rho) * rng.uniform(1, scale, n) + rho * (weights + scale / 10)
+                    capacity = 0.5 * float(np.sum(weights))
+                    features = instance_features(weights, values, capacity)
+                    optimal = solvers['bnb'].solve(weights.tolist(), values.tolist(), capacity)['total_value']
+                    for name, solver in solvers.items():
+                        start_time = time.perf_counter()
+                        solution = solver.solve(weights.tolist(), values.tolist(), capacity)
+                        records.append(dict(
+                            features,
+                            solver=name,
+                            runtime=time.perf_counter() - start_time,
+                            quality=float(solution['total_value'] / optimal) if optimal > 0 else 1.0
+                        ))
+    return records
+
+
+if __name__ == "__main__":
+    from knapsack.solver.traditional_solver import DPKnapsackSolver, GreedyKnapsackSolver, BranchAndBoundKnapsackSolver
+    from knapsack.solver.ml_solver import MLKnapsackSolver
+    from knapsack.solver.genetic_solver import GeneticKnapsackSolver
+
+    parser = argparse.ArgumentParser(description='Calibrate the solver runtime and quality models')
+    parser.add_argument('--output', type=str, default=DEFAULT_PROFILE_PATH,
+                      help='Where to save the fitted coefficients')
+    parser.add_argument('--records', type=str, default=None,
+                      help='Fit from a JSON list of records, or a benchmarks.suite results file, instead of running the grid')
+    parser.add_argument('--repetitions', type=int, default=3,
+                      help='Instances per grid point')
+    args = parser.parse_args()
+
+    if args.records:
+        with open(args.records) as f:
+            records = json.load(f)
+        if isinstance(records, dict):
+            records = records['records']
+    else:
+        ml_solver = MLKnapsackSolver()
+        records = calibrate({
+            'dp': DPKnapsackSolver(),
+            'greedy': GreedyKnapsackSolver(),
+            'ml': ml_solver,
+            'bnb': BranchAndBoundKnapsackSolver(),
+            'ga': GeneticKnapsackSolver(ml_solver=ml_solver)
+        }, repetitions=args.repetitions)
+
+    model = SolverPerformanceModel(SolverCostModel())
+    model.fit(records)
+    model.save(args.output)
+    print(f"Fitted {len(records)} records for solvers: {', '.join(sorted(model.coefficients))}")
+    print(f"Saved solver profile to {args.output}")
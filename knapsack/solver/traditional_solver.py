@@ -1,24 +1,41 @@
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Sequence
+from bisect import bisect_right
 import time
 
+from knapsack.solver.observers import ObserverList, SolverObserver
+
 class DPKnapsackSolver:
-    def solve(self, weights: List[float], values: List[float], capacity: float) -> Dict:
+    # Weights and capacity are scaled to integers, keeping 3 decimal places
+    scale = 1000
+
+    def solve(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        observers: Optional[Sequence[SolverObserver]] = None
+    ) -> Dict:
         """Solve knapsack problem using dynamic programming.
         
         Args:
             weights: List of item weights
             values: List of item values
             capacity: Knapsack capacity
+            observers: Notified of the start, an iteration per item row, the optimum
+                over the items so far whenever it improves, and the result; stopping
+                early returns the optimum over the rows filled so far
             
         Returns:
-            Dictionary containing solution details
+            Dictionary containing solution details, plus whether the answer is proven optimal
         """
         start_time = time.time()
+        observers = ObserverList("dp", observers)
+        observers.start(len(weights), capacity)
         
         n = len(weights)
         # Convert weights to integers for DP table
-        scale = 1000  # Use 3 decimal places
+        scale = self.scale
         weights_scaled = [int(w * scale) for w in weights]
         capacity_scaled = int(capacity * scale)
         
@@ -27,6 +44,8 @@ class DPKnapsackSolver:
         keep = np.zeros((n + 1, capacity_scaled + 1), dtype=int)
         
         # Fill DP table
+        rows = n
+        best_value = 0.0
         for i in range(1, n + 1):
             for w in range(capacity_scaled + 1):
                 if weights_scaled[i-1] <= w:
@@ -39,14 +58,21 @@ class DPKnapsackSolver:
                         dp[i][w] = val_without_item
                 else:
                     dp[i][w] = dp[i-1][w]
+            if observers:
+                if dp[i][capacity_scaled] > best_value:
+                    best_value = float(dp[i][capacity_scaled])
+                    items = self._backtrack(keep, weights_scaled, i, capacity_scaled)
+                    observers.incumbent(
+                        total_value=best_value,
+                        total_weight=sum(weights[j] for j in items),
+                        selected_items=sorted(items)
+                    )
+                if i < n and (observers.stop_requested or observers.iteration(item=i)):
+                    rows = i
+                    break
         
         # Backtrack to find selected items
-        selected_items = []
-        w = capacity_scaled
-        for i in range(n, 0, -1):
-            if keep[i][w] == 1:
-                selected_items.append(i-1)
-                w = w - weights_scaled[i-1]
+        selected_items = self._backtrack(keep, weights_scaled, rows, capacity_scaled)
         
         # Calculate solution metrics
         total_weight = sum(weights[i] for i in selected_items)
@@ -59,28 +85,49 @@ class DPKnapsackSolver:
         end_time = time.time()
         solve_time = end_time - start_time
         
-        return {
+        return observers.finish({
             'selected_items': selected_items,
             'total_value': total_value,
             'total_weight': total_weight,
             'is_feasible': True,  # DP always produces feasible solutions
             'selection': selection.tolist(),
-            'solve_time': solve_time
-        }
+            'solve_time': solve_time,
+            'is_optimal': rows == n
+        })
+    
+    @staticmethod
+    def _backtrack(keep: np.ndarray, weights_scaled: List[int], rows: int, capacity_scaled: int) -> List[int]:
+        """Items of the optimal selection over the first rows items."""
+        selected_items = []
+        w = capacity_scaled
+        for i in range(rows, 0, -1):
+            if keep[i][w] == 1:
+                selected_items.append(i-1)
+                w = w - weights_scaled[i-1]
+        return selected_items
 
 class GreedyKnapsackSolver:
-    def solve(self, weights: List[float], values: List[float], capacity: float) -> Dict:
+    def solve(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        observers: Optional[Sequence[SolverObserver]] = None
+    ) -> Dict:
         """Solve knapsack problem using greedy approach (value/weight ratio).
         
         Args:
             weights: List of item weights
             values: List of item values
             capacity: Knapsack capacity
+            observers: Notified of the start, the solution as an incumbent and the result
             
         Returns:
             Dictionary containing solution details
         """
         start_time = time.time()
+        observers = ObserverList("greedy", observers)
+        observers.start(len(weights), capacity)
         
         n = len(weights)
         # Calculate value/weight ratios
@@ -105,14 +152,146 @@ class GreedyKnapsackSolver:
         end_time = time.time()
         solve_time = end_time - start_time
         
-        return {
+        if observers:
+            observers.incumbent(total_value=total_value, total_weight=total_weight, selected_items=sorted(selected_items))
+        return observers.finish({
             'selected_items': selected_items,
             'total_value': total_value,
             'total_weight': total_weight,
             'is_feasible': True,  # Greedy always produces feasible solutions
             'selection': selection.tolist(),
             'solve_time': solve_time
-        }
+        })
+
+class BranchAndBoundKnapsackSolver:
+    def __init__(self, node_limit: int = 2_000_000, time_limit: Optional[float] = None, report_every: int = 10_000):
+        """Exact depth-first branch and bound with the Dantzig (LP relaxation) bound.
+        
+        Args:
+            node_limit: Maximum number of nodes to explore before returning the incumbent
+            time_limit: Maximum wall time in seconds before returning the incumbent
+            report_every: Number of nodes between bound updates sent to the observers
+        """
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.report_every = report_every
+    
+    def solve(
+        self,
+        weights: List[float],
+        values: List[float],
+        capacity: float,
+        observers: Optional[Sequence[SolverObserver]] = None
+    ) -> Dict:
+        """Solve knapsack problem using branch and bound.
+        
+        Args:
+            weights: List of item weights
+            values: List of item values
+            capacity: Knapsack capacity
+            observers: Notified of the start, every improving solution, the upper bound
+                every report_every nodes and the result; any of them can stop the search
+            
+        Returns:
+            Dictionary containing solution details, plus whether optimality was proven
+            and the best known upper bound
+        """
+        start_time = time.time()
+        observers = ObserverList("bnb", observers)
+        observers.start(len(weights), capacity)
+        
+        n = len(weights)
+        # Branch on items in order of decreasing value/weight ratio
+        order = sorted(range(n), key=lambda i: values[i] / weights[i], reverse=True)
+        w = [weights[i] for i in order]
+        v = [values[i] for i in order]
+        prefix_w = [0.0]
+        prefix_v = [0.0]
+        for i in range(n):
+            prefix_w.append(prefix_w[-1] + w[i])
+            prefix_v.append(prefix_v[-1] + v[i])
+        
+        def upper_bound(level: int, value: float, weight: float) -> float:
+            # Take the next items whole while they fit, then a fraction of the first that does not
+            limit = prefix_w[level] + capacity - weight
+            k = bisect_right(prefix_w, limit, lo=level) - 1
+            bound = value + prefix_v[k] - prefix_v[level]
+            if k < n:
+                bound += (limit - prefix_w[k]) * v[k] / w[k]
+            return bound
+        
+        best_value = 0.0
+        best_weight = 0.0
+        best_mask = 0
+        stopped = False
+        nodes = 0
+        
+        def global_bound() -> float:
+            return max([best_value] + [entry[4] for entry in stack])
+        
+        # Each entry is (level, value, weight, chosen bitmask, parent bound)
+        stack = [(0, 0.0, 0.0, 0, upper_bound(0, 0.0, 0.0))]
+        while stack:
+            level, value, weight, mask, parent_bound = stack.pop()
+            if parent_bound <= best_value:
+                continue
+            nodes += 1
+            
+            if value > best_value:
+                best_value, best_weight, best_mask = value, weight, mask
+                if observers and observers.incumbent(
+                    total_value=best_value,
+                    total_weight=best_weight,
+                    selected_items=sorted(order[i] for i in range(n) if mask >> i & 1),
+                    bound=global_bound()
+                ):
+                    stopped = True
+                    break
+            
+            if nodes % self.report_every == 0:
+                if self.time_limit is not None and time.time() - start_time > self.time_limit:
+                    stopped = True
+                    break
+                if observers and observers.bound(bound=global_bound(), nodes=nodes):
+                    stopped = True
+                    break
+            if nodes >= self.node_limit:
+                stopped = True
+                break
+            
+            if level == n:
+                continue
+            bound = upper_bound(level, value, weight)
+            if bound <= best_value:
+                continue
+            
+            # Push the exclude branch first so the include branch is explored first
+            stack.append((level + 1, value, weight, mask, bound))
+            if weight + w[level] <= capacity:
+                stack.append((level + 1, value + v[level], weight + w[level], mask | (1 << level), bound))
+        
+        is_optimal = not stopped
+        upper = best_value if is_optimal else global_bound()
+        selected_items = sorted(order[i] for i in range(n) if best_mask >> i & 1)
+        
+        # Create selection array
+        selection = np.zeros(n)
+        selection[selected_items] = 1
+        
+        end_time = time.time()
+        solve_time = end_time - start_time
+        
+        return observers.finish({
+            'selected_items': selected_items,
+            'total_value': best_value,
+            'total_weight': best_weight,
+            'is_feasible': True,  # Only feasible branches are explored
+            'selection': selection.tolist(),
+            'solve_time': solve_time,
+            'is_optimal': is_optimal,
+            'upper_bound': upper,
+            'nodes': nodes
+        })
 
 if __name__ == "__main__":
     # Example usage
@@ -1,27 +1,120 @@
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.neural_network import MLPRegressor
 from sklearn.multioutput import MultiOutputClassifier
 from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.linear_model import SGDClassifier, Ridge
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
-from sklearn.model_selection import cross_val_score, GridSearchCV
 import joblib
 import json
-from typing import List, Tuple, Dict, Any, Union
+import pickle
+from typing import List, Tuple, Dict, Any, Union, Optional
+import argparse
 import os
+import shutil
+import tempfile
 from tqdm import tqdm
 import time
+from knapsack.dataset import KnapsackDataset, load_instances
+
+# Anything load_instances accepts: a dataset directory, a CSV path, a DataFrame or a dataset
+DatasetSource = Union[str, pd.DataFrame, KnapsackDataset]
+
+# Hyperparameter search spaces per model type
+PARAM_GRIDS = {
+    "rf": {
+        'n_estimators': [300, 500],
+        'max_depth': [30, 40, 50],
+        'min_samples_split': [2, 5],
+        'min_samples_leaf': [1, 2]
+    },
+    # For MultiOutputClassifier, we need to specify parameters for the base estimator
+    "gb": {
+        'estimator__n_estimators': [200, 300],
+        'estimator__learning_rate': [0.05, 0.1],
+        'estimator__max_depth': [6, 8, 10],
+        'estimator__subsample': [0.7, 0.8, 0.9]
+    },
+    "mlp": {
+        'alpha': [0.0001, 0.001],
+        'learning_rate_init': [0.001, 0.01]
+    },
+    "sgd": {
+        'estimator__alpha': [0.00001, 0.0001, 0.001]
+    }
+}
+
+# Instances timed one at a time to measure single-instance inference latency
+LATENCY_SAMPLES = 20
+
+# Bumped whenever _prepare_features or _prepare_labels change, invalidating cached matrices
+FEATURE_SPEC_VERSION = 1
+
+# Small models distilled from a trained teacher: (model type, parameters)
+STUDENT_CANDIDATES = [
+    ("rf_student", {'n_estimators': 10, 'max_depth': 8}),
+    ("rf_student", {'n_estimators': 25, 'max_depth': 12}),
+    ("rf_student", {'n_estimators': 50, 'max_depth': 16}),
+    ("mlp_student", {'hidden_layer_sizes': (32,)}),
+    ("mlp_student", {'hidden_layer_sizes': (64, 32)}),
+    ("linear_student", {'alpha': 1.0})
+]
+
+
+def value_gaps(predictions: np.ndarray, data: KnapsackDataset) -> np.ndarray:
+    """Relative value gap to the optimum of predicted selections, per instance.
+
+    A prediction may overfill the knapsack, so predicted items are packed in
+    descending value/weight order and those that no longer fit are dropped, as
+    a solver would have to before returning the selection.
+
+    Args:
+        predictions: (instances x max_items) predicted 0/1 selections
+        data: The instances, with optimal values
+
+    Returns:
+        1 - packed value / optimal value for each instance
+    """
+    gaps = np.zeros(len(data))
+    for i in range(len(data)):
+        weights, values, capacity = data.instance(i)
+        selected = np.flatnonzero(predictions[i, :len(weights)] > 0.5)
+        order = selected[np.argsort(-values[selected] / weights[selected], kind='stable')]
+        packed_weight = packed_value = 0.0
+        for item in order:
+            if packed_weight + weights[item] <= capacity:
+                packed_weight += weights[item]
+                packed_value += values[item]
+        optimal_value = float(data.optimal_value[i])
+        gaps[i] = 1.0 - packed_value / optimal_value if optimal_value > 0 else 0.0
+    return gaps
+
+
+def single_instance_latency(estimator: Any, X: np.ndarray, samples: int = LATENCY_SAMPLES) -> float:
+    """Median time of predicting one row at a time, as the solver does per request."""
+    latencies = []
+    for i in range(min(samples, len(X))):
+        start_time = time.perf_counter()
+        estimator.predict(X[i:i + 1])
+        latencies.append(time.perf_counter() - start_time)
+    return float(np.median(latencies))
+
 
 class KnapsackMLModel:
-    def __init__(self, model_type: str = "rf"):
+    def __init__(self, model_type: str = "rf", feature_cache: bool = True):
         """Initialize the ML model for knapsack prediction.
         
         Args:
-            model_type: Type of model to use ('rf' for Random Forest, 'gb' for Gradient Boosting, or 'mlp' for Neural Network)
+            model_type: Type of model to use ('rf' for Random Forest, 'gb' for Gradient Boosting,
+                'mlp' for Neural Network, or 'sgd' for per-item linear classifiers), or a
+                student type for distill(): 'rf_student', 'mlp_student' or 'linear_student'
+            feature_cache: Persist training feature and label matrices next to
+                datasets loaded from disk and reuse them on later runs
         """
         self.model_type = model_type
+        self.feature_cache = feature_cache
         self.scaler = StandardScaler()
         self.max_items = 50  # Maximum number of items to consider
         
@@ -69,22 +162,51 @@ class KnapsackMLModel:
                 random_state=42,
                 verbose=True
             )
+        elif model_type == "sgd":
+            # One logistic-regression classifier per item position, trainable incrementally
+            base_sgd = SGDClassifier(
+                loss='log_loss',
+                alpha=0.0001,
+                random_state=42
+            )
+            self.model = MultiOutputClassifier(base_sgd)
+        elif model_type == "rf_student":
+            # Students regress the teacher's selection probabilities
+            self.model = RandomForestRegressor(
+                n_estimators=25,
+                max_depth=12,
+                n_jobs=-1,
+                random_state=42
+            )
+        elif model_type == "mlp_student":
+            self.model = MLPRegressor(
+                hidden_layer_sizes=(64, 32),
+                max_iter=500,
+                early_stopping=True,
+                random_state=42
+            )
+        elif model_type == "linear_student":
+            # One linear model per item position
+            self.model = Ridge(alpha=1.0)
         else:
             raise ValueError(f"Unknown model type: {model_type}")
     
-    def _prepare_features(self, data: pd.DataFrame) -> np.ndarray:
+    def _prepare_features(self, data: DatasetSource) -> np.ndarray:
         """Prepare features for the model with enhanced feature engineering."""
+        data = load_instances(data)
         features = []
         
-        for _, row in tqdm(data.iterrows(), total=len(data), desc="Preparing features", leave=False):
-            n_items = row['n_items']
-            weights = np.array(eval(row['weights']) if isinstance(row['weights'], str) else row['weights'])
-            values = np.array(eval(row['values']) if isinstance(row['values'], str) else row['values'])
-            capacity = row['capacity']
-            
-            # Pad weights and values to max_items
-            padded_weights = np.pad(weights, (0, self.max_items - len(weights)), 'constant')
-            padded_values = np.pad(values, (0, self.max_items - len(values)), 'constant')
+        # Pad weights and values to max_items for all instances at once
+        all_padded_weights = data.padded('weights', self.max_items)
+        all_padded_values = data.padded('values', self.max_items)
+        
+        for i in tqdm(range(len(data)), desc="Preparing features", leave=False):
+            weights, values, capacity = data.instance(i)
+            weights = np.asarray(weights)
+            values = np.asarray(values)
+            n_items = len(weights)
+            padded_weights = all_padded_weights[i]
+            padded_values = all_padded_values[i]
             
             # Enhanced feature engineering
             value_weight_ratios = values / weights
@@ -215,112 +337,36 @@ class KnapsackMLModel:
         kurt = (1/n) * np.sum(((data - mean) / std) ** 4) - 3  # Excess kurtosis
         return float(kurt)
     
-    def _prepare_labels(self, data: pd.DataFrame) -> np.ndarray:
+    def _prepare_labels(self, data: DatasetSource) -> np.ndarray:
         """Prepare labels for the model."""
-        labels = []
-        for _, row in tqdm(data.iterrows(), total=len(data), desc="Preparing labels", leave=False):
-            selection = eval(row['selection']) if isinstance(row['selection'], str) else row['selection']
-            # Pad selection to max_items
-            padded_selection = np.pad(selection, (0, self.max_items - len(selection)), 'constant')
-            labels.append(padded_selection)
-        return np.array(labels)
-    
-    def _tune_hyperparameters(self, X_train: np.ndarray, y_train: np.ndarray) -> Dict[str, Any]:
-        """Tune hyperparameters using grid search."""
-        print("\nTuning hyperparameters...")
-        
-        if self.model_type == "rf":
-            param_grid = {
-                'n_estimators': [300, 500],
-                'max_depth': [30, 40, 50],
-                'min_samples_split': [2, 5],
-                'min_samples_leaf': [1, 2]
-            }
-        elif self.model_type == "gb":
-            # For MultiOutputClassifier, we need to specify parameters for the base estimator
-            param_grid = {
-                'estimator__n_estimators': [200, 300],
-                'estimator__learning_rate': [0.05, 0.1],
-                'estimator__max_depth': [6, 8, 10],
-                'estimator__subsample': [0.7, 0.8, 0.9]
-            }
-        elif self.model_type == "mlp":
-            param_grid = {
-                'alpha': [0.0001, 0.001],
-                'learning_rate_init': [0.001, 0.01]
-            }
-        
-        # Use a smaller subset for grid search to speed it up
-        sample_size = min(1000, X_train.shape[0])
-        indices = np.random.choice(X_train.shape[0], sample_size, replace=False)
-        X_sample = X_train[indices]
-        y_sample = y_train[indices]
-        
-        # Create a copy of the model for grid search
-        if self.model_type == "rf":
-            model_copy = RandomForestClassifier(
-                random_state=42, n_jobs=-1, verbose=0, class_weight='balanced'
-            )
-        elif self.model_type == "gb":
-            base_gb = GradientBoostingClassifier(random_state=42, verbose=0)
-            model_copy = MultiOutputClassifier(base_gb, n_jobs=-1)
-        elif self.model_type == "mlp":
-            model_copy = MLPRegressor(
-                hidden_layer_sizes=(256, 128), activation='relu',
-                solver='adam', random_state=42, max_iter=100,
-                early_stopping=True, validation_fraction=0.1
-            )
-        
-        grid_search = GridSearchCV(
-            model_copy, param_grid, cv=3, n_jobs=-1,
-            verbose=1, scoring='accuracy' if self.model_type != 'mlp' else 'neg_mean_squared_error'
-        )
-        
-        grid_search.fit(X_sample, y_sample)
-        print(f"Best parameters: {grid_search.best_params_}")
-        return grid_search.best_params_
+        # Pad selection to max_items
+        return load_instances(data).padded('selection', self.max_items).astype(float)
     
-    def train(self, train_data: pd.DataFrame, val_data: pd.DataFrame, tune_hyperparams: bool = False) -> Dict:
+    def train(self, train_data: DatasetSource, val_data: DatasetSource, tune_hyperparams: bool = False) -> Dict:
         """Train the model and return metrics."""
         print(f"\nTraining {self.model_type.upper()} model...")
         start_time = time.time()
+        train_data = load_instances(train_data)
+        val_data = load_instances(val_data)
         
-        # Prepare features with progress bar
-        X_train = self._prepare_features(train_data)
-        X_val = self._prepare_features(val_data)
+        # Prepare features and labels, or load them from the feature cache
+        X_train, y_train = self._features_and_labels(train_data)
+        X_val, y_val = self._features_and_labels(val_data)
         
         # Scale features
         print("Scaling features...")
         X_train = self.scaler.fit_transform(X_train)
         X_val = self.scaler.transform(X_val)
         
-        # Prepare labels with progress bar
-        y_train = self._prepare_labels(train_data)
-        y_val = self._prepare_labels(val_data)
-        
-        # Tune hyperparameters if requested
+        # Tune hyperparameters if requested, by successive halving on the validation value gap
         if tune_hyperparams:
-            best_params = self._tune_hyperparameters(X_train, y_train)
+            from knapsack.model_search import FAMILY_NAMES, search_models
+            print("\nTuning hyperparameters...")
+            _, report = search_models(train_data, val_data, model_types=(self.model_type,))
+            best_params = report['families'][FAMILY_NAMES[self.model_type]]['params']
+            print(f"Best parameters: {best_params}")
             self.model.set_params(**best_params)
         
-        # Skip cross-validation for Gradient Boosting to avoid errors with multi-output
-        if self.model_type == "gb":
-            print("Skipping cross-validation for Gradient Boosting (multi-output not supported in CV)")
-            cv_scores = np.array([0.0, 0.0, 0.0])  # Placeholder
-        # Perform cross-validation for other models
-        elif self.model_type == "mlp":
-            # For MLP, we use MSE for cross-validation
-            print("Performing cross-validation...")
-            cv_scores = -cross_val_score(self.model, X_train[:1000], y_train[:1000], 
-                                       cv=3, n_jobs=-1, scoring='neg_mean_squared_error')
-            print(f"Cross-validation MSE scores: {cv_scores}")
-            print(f"Mean CV MSE: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
-        else:
-            print("Performing cross-validation...")
-            cv_scores = cross_val_score(self.model, X_train[:1000], y_train[:1000], cv=3, n_jobs=-1)
-            print(f"Cross-validation scores: {cv_scores}")
-            print(f"Mean CV score: {cv_scores.mean():.4f} (+/- {cv_scores.std() * 2:.4f})")
-        
         # Train model
         print("Training final model...")
         if self.model_type == "mlp":
@@ -336,8 +382,8 @@ class KnapsackMLModel:
         val_preds = (self.model.predict(X_val) > 0.5).astype(int)
         
         # Calculate metrics only on non-padded items
-        train_metrics = self._calculate_metrics(y_train, train_preds, train_data['n_items'].values)
-        val_metrics = self._calculate_metrics(y_val, val_preds, val_data['n_items'].values)
+        train_metrics = self._calculate_metrics(y_train, train_preds, train_data.n_items)
+        val_metrics = self._calculate_metrics(y_val, val_preds, val_data.n_items)
         
         metrics = {
             'train_accuracy': train_metrics['accuracy'],
@@ -348,8 +394,195 @@ class KnapsackMLModel:
             'val_precision': val_metrics['precision'],
             'train_recall': train_metrics['recall'],
             'val_recall': val_metrics['recall'],
-            'cv_score_mean': float(cv_scores.mean()),
-            'cv_score_std': float(cv_scores.std()),
+            'training_time': time.time() - start_time
+        }
+        # Scored like the model search: packed value gap on the whole validation split
+        if val_data.optimal_value is not None:
+            gaps = value_gaps(val_preds, val_data)
+            metrics['val_value_gap'] = float(gaps.mean())
+            metrics['val_optimal_fraction'] = float(np.mean(gaps <= 1e-9))
+        
+        print(f"\nMetrics for {self.model_type.upper()}:")
+        for key, value in metrics.items():
+            print(f"{key}: {value:.4f}")
+        
+        return metrics
+    
+    def _prepare_shards(self, data: KnapsackDataset, shard_size: int, directory: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute features and labels shard by shard into memory-mapped .npy files.
+        
+        Only one shard of instances is processed in memory at a time.
+        
+        Returns:
+            Memory-mapped feature and label matrices (features.npy and labels.npy in directory)
+        """
+        os.makedirs(directory, exist_ok=True)
+        n_features = self._prepare_features(data.shard(0, min(1, len(data)))).shape[1]
+        features = np.lib.format.open_memmap(
+            os.path.join(directory, 'features.npy'), mode='w+',
+            dtype=np.float64, shape=(len(data), n_features)
+        )
+        labels = np.lib.format.open_memmap(
+            os.path.join(directory, 'labels.npy'), mode='w+',
+            dtype=np.float64, shape=(len(data), self.max_items)
+        )
+        for start in tqdm(range(0, len(data), shard_size), desc="Preparing shards"):
+            shard = data.shard(start, min(start + shard_size, len(data)))
+            features[start:start + len(shard)] = self._prepare_features(shard)
+            labels[start:start + len(shard)] = self._prepare_labels(shard)
+        features.flush()
+        labels.flush()
+        return features, labels
+    
+    def _feature_cache_path(self, data: KnapsackDataset) -> Optional[str]:
+        """Feature cache directory of a dataset loaded from disk, None for in-memory data.
+        
+        The cache sits next to the dataset (in a dataset directory's features/
+        subdirectory, or in <name>_features/ beside a CSV file) and is keyed by the
+        dataset fingerprint, FEATURE_SPEC_VERSION and max_items, so changed data or
+        feature code never hits a stale entry.
+        """
+        if not self.feature_cache or data.path is None:
+            return None
+        if os.path.isdir(data.path):
+            root = os.path.join(data.path, 'features')
+        else:
+            root = os.path.splitext(data.path)[0] + '_features'
+        return os.path.join(root, f'{data.fingerprint()[:16]}-v{FEATURE_SPEC_VERSION}-m{self.max_items}')
+    
+    def _cached_matrices(self, data: KnapsackDataset, shard_size: Optional[int] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Feature and label matrices from the feature cache, computing and persisting them on a miss.
+        
+        Cached matrices are memory-mapped, not read. Returns None when the dataset
+        cannot be cached (not loaded from disk, caching disabled, or its
+        directory is not writable).
+        """
+        cache_path = self._feature_cache_path(data)
+        if cache_path is None:
+            return None
+        if not os.path.isdir(cache_path):
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                staging = tempfile.mkdtemp(prefix='.staging-', dir=os.path.dirname(cache_path))
+            except OSError:
+                return None
+            try:
+                self._prepare_shards(data, shard_size or max(len(data), 1), staging)
+                # Publish atomically; a concurrent run may have published first
+                os.rename(staging, cache_path)
+            except OSError:
+                if not os.path.isdir(cache_path):
+                    raise
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        else:
+            print(f"Loading cached features from {cache_path}")
+        return (
+            np.load(os.path.join(cache_path, 'features.npy'), mmap_mode='r'),
+            np.load(os.path.join(cache_path, 'labels.npy'), mmap_mode='r')
+        )
+    
+    def _features_and_labels(self, data: KnapsackDataset) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature and label matrices, through the feature cache when the dataset allows it."""
+        cached = self._cached_matrices(data)
+        if cached is not None:
+            return cached
+        return self._prepare_features(data), self._prepare_labels(data)
+    
+    def train_incremental(
+        self,
+        train_data: DatasetSource,
+        val_data: DatasetSource,
+        shard_size: int = 5000,
+        epochs: int = 1,
+        trees_per_shard: int = 50,
+        feature_dir: Optional[str] = None
+    ) -> Dict:
+        """Train out of core, streaming over shards of the training set.
+        
+        Features are computed per shard into memory-mapped files (the feature
+        cache for datasets loaded from disk), the scaler is
+        fitted with partial_fit, and the model learns one shard at a time:
+        MLP and SGD models with partial_fit, forests by growing a new batch of
+        trees_per_shard trees on each shard (warm start). Gradient boosting has
+        no incremental mode and is rejected.
+        
+        Args:
+            train_data: Training instances
+            val_data: Validation instances
+            shard_size: Instances per shard
+            epochs: Passes over the shards (partial_fit models only)
+            trees_per_shard: Trees added per shard (forests only)
+            feature_dir: Where to keep the feature files of datasets without a feature
+                cache; a temporary directory (removed afterwards) if not given
+        
+        Returns:
+            Validation metrics and training statistics
+        """
+        if self.model_type == "gb":
+            raise ValueError("Gradient boosting does not support incremental training")
+        print(f"\nTraining {self.model_type.upper()} model incrementally...")
+        start_time = time.time()
+        train_data = load_instances(train_data)
+        val_data = load_instances(val_data)
+        
+        temporary = feature_dir is None
+        feature_dir = tempfile.mkdtemp(prefix='knapsack-features-') if temporary else feature_dir
+        os.makedirs(feature_dir, exist_ok=True)
+        try:
+            X_train, y_train = (self._cached_matrices(train_data, shard_size)
+                                or self._prepare_shards(train_data, shard_size, os.path.join(feature_dir, 'train')))
+            X_val, y_val = (self._cached_matrices(val_data, shard_size)
+                            or self._prepare_shards(val_data, shard_size, os.path.join(feature_dir, 'val')))
+            shards = [(start, min(start + shard_size, len(train_data))) for start in range(0, len(train_data), shard_size)]
+            
+            print("Fitting scaler...")
+            for start, end in shards:
+                self.scaler.partial_fit(X_train[start:end])
+            
+            if self.model_type == "rf":
+                # Each shard grows its own batch of trees; the forest votes over all of them
+                self.model.set_params(warm_start=True, oob_score=False, n_estimators=0)
+                classes = None
+                for start, end in tqdm(shards, desc="Growing trees"):
+                    y_shard = y_train[start:end]
+                    shard_classes = [tuple(np.unique(y_shard[:, j])) for j in range(y_shard.shape[1])]
+                    if classes is not None and shard_classes != classes:
+                        raise ValueError(
+                            "A shard is missing a label class at some item position; increase shard_size"
+                        )
+                    classes = shard_classes
+                    self.model.set_params(n_estimators=self.model.n_estimators + trees_per_shard)
+                    self.model.fit(self.scaler.transform(X_train[start:end]), y_shard)
+            else:
+                fit_params = {}
+                if self.model_type == "sgd":
+                    fit_params['classes'] = [np.array([0.0, 1.0])] * self.max_items
+                else:
+                    # partial_fit cannot hold out a validation split of its own
+                    self.model.set_params(early_stopping=False)
+                for epoch in range(epochs):
+                    for start, end in tqdm(shards, desc=f"Epoch {epoch + 1}/{epochs}"):
+                        self.model.partial_fit(
+                            self.scaler.transform(X_train[start:end]), y_train[start:end], **fit_params
+                        )
+            
+            print("Evaluating model...")
+            val_preds = np.vstack([
+                (self.model.predict(self.scaler.transform(X_val[start:start + shard_size])) > 0.5).astype(int)
+                for start in range(0, len(val_data), shard_size)
+            ])
+            val_metrics = self._calculate_metrics(np.asarray(y_val), val_preds, val_data.n_items)
+        finally:
+            if temporary:
+                shutil.rmtree(feature_dir, ignore_errors=True)
+        
+        metrics = {
+            'val_accuracy': val_metrics['accuracy'],
+            'val_f1': val_metrics['f1'],
+            'val_precision': val_metrics['precision'],
+            'val_recall': val_metrics['recall'],
+            'n_shards': len(shards),
             'training_time': time.time() - start_time
         }
         
@@ -375,19 +608,30 @@ class KnapsackMLModel:
             'recall': recall_score(all_true, all_pred, average='weighted', zero_division=0)
         }
     
-    def predict(self, data: pd.DataFrame) -> np.ndarray:
+    def predict(self, data: DatasetSource) -> np.ndarray:
         """Make predictions for new instances."""
+        data = load_instances(data)
         X = self._prepare_features(data)
         X = self.scaler.transform(X)
-        predictions = self.model.predict(X)
-        
-        if self.model_type == "mlp":
-            predictions = (predictions > 0.5).astype(int)  # Threshold at 0.5
+        # Threshold at 0.5 for models that predict probabilities
+        predictions = (self.model.predict(X) > 0.5).astype(int)
         
         # Truncate predictions to actual number of items
-        n_items = data['n_items'].iloc[0]
+        n_items = data.n_items[0]
         return predictions[0][:n_items]
     
+    def selection_probabilities(self, X: np.ndarray) -> np.ndarray:
+        """Per-item selection probabilities (instances x max_items) for scaled features X."""
+        if hasattr(self.model, 'predict_proba'):
+            # Classifiers give one (samples x classes) array per item
+            outputs = self.model.predict_proba(X)
+            classes = self.model.classes_ if hasattr(self.model, 'classes_') else [e.classes_ for e in self.model.estimators_]
+            return np.column_stack([
+                output[:, list(labels).index(1)] if 1 in labels else np.zeros(len(X))
+                for output, labels in zip(outputs, classes)
+            ])
+        return np.clip(self.model.predict(X), 0.0, 1.0)
+    
     def save(self, path: str):
         """Save the model and scaler."""
         print(f"\nSaving model to {path}...")
@@ -409,42 +653,144 @@ class KnapsackMLModel:
         instance.max_items = saved_data.get('max_items', 50)
         return instance
 
-def train_and_evaluate_models(train_data_path: str, val_data_path: str):
-    """Train and evaluate multiple models and save the best one."""
+def _pareto_front(rows: List[Dict]) -> List[bool]:
+    """Whether each row is not dominated in value gap, latency and model size."""
+    keys = ('value_gap', 'latency_seconds', 'model_bytes')
+    return [
+        not any(
+            all(other[k] <= row[k] for k in keys) and any(other[k] < row[k] for k in keys)
+            for other in rows
+        )
+        for row in rows
+    ]
+
+
+def distill(
+    teacher: KnapsackMLModel,
+    train_data: DatasetSource,
+    val_data: DatasetSource,
+    candidates: List[Tuple[str, Dict]] = STUDENT_CANDIDATES,
+    max_gap_increase: float = 0.01,
+    output_path: Optional[str] = 'knapsack/models/student_model.pkl'
+) -> Tuple[KnapsackMLModel, List[Dict]]:
+    """Distill a trained model into smaller, faster students.
+    
+    Every candidate student learns the teacher's per-item selection
+    probabilities (soft outputs) on the training set and is scored on the
+    validation set by value gap, single-instance latency and pickled size.
+    The chosen student is the fastest one within max_gap_increase of the
+    teacher's value gap; if none is, the student with the lowest gap.
+    
+    Args:
+        teacher: Trained model to distill
+        train_data: Instances to learn the teacher's outputs on
+        val_data: Validation instances, with optimal values
+        candidates: Student model types and parameters to try
+        max_gap_increase: Value gap the students may lose against the teacher
+        output_path: Where to save the chosen student, if anywhere
+    
+    Returns:
+        The chosen student and a table with one row per model (teacher first),
+        flagging the rows on the Pareto front
+    """
+    train_data = load_instances(train_data)
+    val_data = load_instances(val_data)
+    
+    # Students share the teacher's features and scaler
+    X_train, _ = teacher._features_and_labels(train_data)
+    X_val, _ = teacher._features_and_labels(val_data)
+    X_train = teacher.scaler.transform(X_train)
+    X_val = teacher.scaler.transform(X_val)
+    print("Computing teacher outputs...")
+    soft_labels = teacher.selection_probabilities(X_train)
+    
+    def evaluate(name: str, model: KnapsackMLModel, params: Dict) -> Dict:
+        predictions = (model.model.predict(X_val) > 0.5).astype(int)
+        return {
+            'model': name,
+            'params': {k: list(v) if isinstance(v, tuple) else v for k, v in params.items()},
+            'value_gap': float(value_gaps(predictions, val_data).mean()),
+            'latency_seconds': single_instance_latency(model.model, X_val),
+            'model_bytes': len(pickle.dumps(model.model))
+        }
+    
+    table = [evaluate(f'teacher ({teacher.model_type})', teacher, {})]
+    students = []
+    for model_type, params in tqdm(candidates, desc="Training students"):
+        student = KnapsackMLModel(model_type=model_type)
+        student.model.set_params(**params)
+        student.scaler = teacher.scaler
+        student.max_items = teacher.max_items
+        start_time = time.time()
+        student.model.fit(X_train, soft_labels)
+        row = evaluate(model_type, student, params)
+        row['training_time'] = time.time() - start_time
+        table.append(row)
+        students.append(student)
+    
+    for row, on_front in zip(table, _pareto_front(table)):
+        row['pareto'] = on_front
+    
+    student_rows = table[1:]
+    acceptable = [i for i, row in enumerate(student_rows) if row['value_gap'] <= table[0]['value_gap'] + max_gap_increase]
+    if acceptable:
+        chosen = min(acceptable, key=lambda i: student_rows[i]['latency_seconds'])
+    else:
+        chosen = min(range(len(student_rows)), key=lambda i: student_rows[i]['value_gap'])
+    student_rows[chosen]['chosen'] = True
+    
+    print(f"\n{'model':<22} {'value gap':>10} {'latency ms':>11} {'size KB':>10}  pareto")
+    for row in table:
+        marker = ' *' if row.get('chosen') else ''
+        print(f"{row['model']:<22} {row['value_gap']:>10.4f} {row['latency_seconds'] * 1000:>11.3f} "
+              f"{row['model_bytes'] / 1024:>10.1f}  {'yes' if row['pareto'] else 'no'}{marker}")
+    
+    student = students[chosen]
+    if output_path is not None:
+        student.save(output_path)
+    return student, table
+
+def train_and_evaluate_models(
+    train_data_path: str,
+    val_data_path: str,
+    shard_size: Optional[int] = None,
+    cpu_budget: Optional[int] = None
+):
+    """Train and evaluate multiple models and save the best one.
+    
+    Both paths may be columnar dataset directories or CSV files. By default the
+    Random Forest, Gradient Boosting and Neural Network families are searched
+    concurrently with successive halving (see knapsack.model_search) and the
+    best model is chosen by validation value gap and inference latency. With
+    shard_size set, training instead streams over shards of that many instances
+    (out of core): Random Forest, SGD and Neural Network models are trained
+    incrementally with default settings, Gradient Boosting, which cannot be, is
+    skipped, and the best model is chosen by validation F1.
+    """
     print("Loading data...")
-    train_data = pd.read_csv(train_data_path)
-    val_data = pd.read_csv(val_data_path)
+    train_data = load_instances(train_data_path)
+    val_data = load_instances(val_data_path)
     
     print(f"\nDataset sizes:")
     print(f"Training set: {len(train_data)} instances")
     print(f"Validation set: {len(val_data)} instances")
     
-    metrics = {}
-    models = {}
-    
-    # Train Random Forest model
-    rf_model = KnapsackMLModel(model_type="rf")
-    rf_metrics = rf_model.train(train_data, val_data)
-    rf_model.save('knapsack/models/rf_model.pkl')
-    metrics["random_forest"] = rf_metrics
-    models["random_forest"] = rf_model
-    
-    # Train Gradient Boosting model
-    gb_model = KnapsackMLModel(model_type="gb")
-    gb_metrics = gb_model.train(train_data, val_data)
-    gb_model.save('knapsack/models/gb_model.pkl')
-    metrics["gradient_boosting"] = gb_metrics
-    models["gradient_boosting"] = gb_model
-    
-    # Train Neural Network model
-    mlp_model = KnapsackMLModel(model_type="mlp")
-    mlp_metrics = mlp_model.train(train_data, val_data)
-    mlp_model.save('knapsack/models/mlp_model.pkl')
-    metrics["neural_network"] = mlp_metrics
-    models["neural_network"] = mlp_model
-    
-    # Find the best model based on validation F1 score
-    best_model_name = max(metrics, key=lambda k: metrics[k]['val_f1'])
+    if shard_size is not None:
+        metrics = {}
+        models = {}
+        for name, model_type in [("random_forest", "rf"), ("sgd", "sgd"), ("neural_network", "mlp")]:
+            model = KnapsackMLModel(model_type=model_type)
+            metrics[name] = model.train_incremental(train_data, val_data, shard_size=shard_size)
+            models[name] = model
+        best_model_name = max(metrics, key=lambda k: metrics[k]['val_f1'])
+    else:
+        from knapsack.model_search import search_models
+        models, report = search_models(train_data, val_data, cpu_budget=cpu_budget)
+        metrics = dict(report['families'], trials=report['trials'], search_seconds=report['search_seconds'])
+        best_model_name = report['selected']
+    
+    for model in models.values():
+        model.save(f'knapsack/models/{model.model_type}_model.pkl')
     best_model = models[best_model_name]
     
     # Save the best model as the default model
@@ -455,10 +801,32 @@ def train_and_evaluate_models(train_data_path: str, val_data_path: str):
         json.dump(metrics, f, indent=2)
     
     print("\nTraining complete! Final metrics:")
-    print(json.dumps(metrics, indent=2))
+    print(json.dumps({k: v for k, v in metrics.items() if k != 'trials'}, indent=2))
     print(f"\nBest model: {best_model_name}")
     
     return best_model
 
 if __name__ == "__main__":
-    train_and_evaluate_models('knapsack/data/train_data.csv', 'knapsack/data/val_data.csv') 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Train the knapsack ML models')
+    parser.add_argument('--train-data', type=str, default='knapsack/data/train_data',
+                      help='Training dataset directory or CSV file')
+    parser.add_argument('--val-data', type=str, default='knapsack/data/val_data',
+                      help='Validation dataset directory or CSV file')
+    parser.add_argument('--shard-size', type=int, default=None,
+                      help='Stream training over shards of this many instances (out-of-core training)')
+    parser.add_argument('--cpu-budget', type=int, default=None,
+                      help='CPUs the concurrent model search may use (default: all)')
+    parser.add_argument('--distill', action='store_true',
+                      help='Distill the best model into a small student (knapsack/models/student_model.pkl)')
+    parser.add_argument('--teacher', type=str, default=None,
+                      help='Distill this saved model instead of training new ones')
+    args = parser.parse_args()
+    
+    if args.teacher is not None:
+        teacher = KnapsackMLModel.load(args.teacher)
+    else:
+        teacher = train_and_evaluate_models(args.train_data, args.val_data, shard_size=args.shard_size, cpu_budget=args.cpu_budget)
+    if args.distill or args.teacher is not None:
+        _, table = distill(teacher, args.train_data, args.val_data)
+        with open('knapsack/models/distillation.json', 'w') as f:
+            json.dump(table, f, indent=2) 
\ No newline at end of file
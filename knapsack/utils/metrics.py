@@ -0,0 +1,138 @@
+import bisect
+import threading
+from typing import List, Tuple, Optional
+
+# Latency buckets in seconds, from sub-millisecond greedy runs to long exact solves
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != float('inf') else "+Inf"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        """Monotonically increasing counter, optionally split by labels."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Increase the counter for the given label values."""
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        """Cumulative histogram of observations, optionally split by labels."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Record one observation for the given label values."""
+        key = tuple(str(labels[name]) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                bucket_label = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, bucket_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Collection of metrics rendered together in Prometheus text format."""
+        self._metrics = {}
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Tuple[str, ...] = (),
+        buckets: Optional[Tuple[float, ...]] = None
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets or DEFAULT_BUCKETS))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "knapsack_requests_total", "HTTP requests handled, by endpoint and status code", ("endpoint", "status")
+)
+QUEUE_WAIT_SECONDS = registry.histogram(
+    "knapsack_queue_wait_seconds", "Time solve requests spent waiting for a worker slot"
+)
+SOLVER_SECONDS = registry.histogram(
+    "knapsack_solver_seconds", "Wall time of a single solver run", ("solver",)
+)
+ML_STAGE_SECONDS = registry.histogram(
+    "knapsack_ml_stage_seconds", "Wall time of each stage of the ML solver pipeline", ("stage",)
+)
+ML_FALLBACKS = registry.counter(
+    "knapsack_ml_fallbacks_total", "ML solves answered by a fallback solver", ("reason", "solver")
+)
+ML_SEARCH_ITERATIONS = registry.counter(
+    "knapsack_ml_search_iterations_total", "Improvement rounds of the ML solver's post-processing stages", ("stage",)
+)
+ML_SEARCH_MOVES = registry.counter(
+    "knapsack_ml_search_moves_total", "Moves accepted by the ML solver's post-processing stages", ("stage",)
+)
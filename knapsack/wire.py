@@ -0,0 +1,152 @@
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # msgpack is only needed for the binary wire format
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+FLOAT_DTYPES = ("<f4", "<f8")
+
+# Per-solver fields that repeat information already carried by the selection bitset
+REDUNDANT_RESULT_FIELDS = ("selection",)
+
+
+class WireFormatError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        """Raised when a binary request cannot be decoded."""
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """Whether the Accept header asks for the binary format."""
+    return bool(accept) and MSGPACK_MEDIA_TYPE in accept
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    """Whether the Content-Type header announces the binary format."""
+    return bool(content_type) and content_type.split(";")[0].strip() == MSGPACK_MEDIA_TYPE
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise WireFormatError(415, f"{MSGPACK_MEDIA_TYPE} is not supported: msgpack is not installed")
+
+
+def _decode_array(name: str, data: Any, dtype: str) -> List[float]:
+    """Decode a little-endian float array, or a plain list of numbers."""
+    if isinstance(data, (bytes, bytearray)):
+        if len(data) % np.dtype(dtype).itemsize:
+            raise WireFormatError(400, f"Array length is not a multiple of the {dtype} item size")
+        return np.frombuffer(data, dtype=dtype).astype(float).tolist()
+    if not isinstance(data, (list, tuple)) or not all(
+        isinstance(x, (int, float)) and not isinstance(x, bool) for x in data
+    ):
+        raise WireFormatError(422, f"{name} must be a float array or a list of numbers")
+    return [float(x) for x in data]
+
+
+def decode_request(body: bytes) -> Tuple[Dict[str, Any], str]:
+    """Decode a msgpack solve request into plain request fields.
+
+    The body is a map with 'weights' and 'values' as raw little-endian float
+    arrays (dtype given by 'dtype', '<f8' by default) or plain lists, plus the
+    same scalar fields as the JSON request. Only the arrays are decoded here;
+    the scalar fields are left for the caller to validate.
+
+    Returns:
+        Tuple of the request fields and the float dtype the client used
+    """
+    _require_msgpack()
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise WireFormatError(400, f"Invalid msgpack body: {str(e)}")
+    if not isinstance(payload, dict) or not {"weights", "values", "capacity"} <= payload.keys():
+        raise WireFormatError(400, "Request must be a map with weights, values and capacity")
+
+    dtype = payload.pop("dtype", "<f8")
+    if dtype not in FLOAT_DTYPES:
+        raise WireFormatError(400, f"Unsupported dtype: {dtype}")
+    payload["weights"] = _decode_array("weights", payload["weights"], dtype)
+    payload["values"] = _decode_array("values", payload["values"], dtype)
+    return payload, dtype
+
+
+def pack_selection(selection: List[float]) -> bytes:
+    """Pack a 0/1 selection into a bitset, item i at bit i % 8 of byte i // 8."""
+    return np.packbits(np.asarray(selection) > 0.5, bitorder="little").tobytes()
+
+
+def unpack_selection(bits: bytes, n_items: int) -> np.ndarray:
+    """Inverse of pack_selection."""
+    return np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=n_items, bitorder="little")
+
+
+def compact_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the echoed request and redundant per-solver fields from a response."""
+    compact = {key: value for key, value in payload.items() if key != "request"}
+    compact["results"] = {
+        name: {key: value for key, value in result.items() if key not in REDUNDANT_RESULT_FIELDS}
+        for name, result in payload["results"].items()
+    }
+    return compact
+
+
+def _encode_result(result: Dict[str, Any], compact: bool) -> Dict[str, Any]:
+    encoded = {
+        "total_value": float(result["total_value"]),
+        "total_weight": float(result["total_weight"]),
+        "is_feasible": bool(result["is_feasible"]),
+        "solve_time": float(result["solve_time"]),
+        "n_items": len(result["selection"]),
+        "selection_bits": pack_selection(result["selection"])
+    }
+    if not compact:
+        encoded["selected_items"] = [int(i) for i in result["selected_items"]]
+    for key, value in result.items():
+        if key not in encoded and key not in ("selection", "selected_items"):
+            encoded[key] = value
+    return encoded
+
+
+def encode_response(payload: Dict[str, Any], compact: bool = False, dtype: str = "<f8") -> bytes:
+    """Encode a solve response as msgpack.
+
+    Selections are sent as bitsets and the echoed request arrays as raw
+    little-endian floats of the given dtype. In compact mode the echoed
+    request and the selected_items lists are omitted.
+    """
+    _require_msgpack()
+    encoded = {
+        key: value for key, value in payload.items() if key not in ("results", "request")
+    }
+    encoded["results"] = {
+        name: _encode_result(result, compact)
+        for name, result in payload["results"].items()
+    }
+    if not compact and "request" in payload:
+        request = payload["request"]
+        encoded["request"] = {
+            "weights": np.asarray(request["weights"], dtype=dtype).tobytes(),
+            "values": np.asarray(request["values"], dtype=dtype).tobytes(),
+            "dtype": dtype,
+            "capacity": float(request["capacity"])
+        }
+    return msgpack.packb(encoded, use_bin_type=True, default=_encode_default)
+
+
+def _encode_default(obj: Any) -> Any:
+    """Convert NumPy scalars and arrays that msgpack cannot pack natively."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Cannot encode {type(obj).__name__}")
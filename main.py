@@ -2,8 +2,9 @@ import argparse
 import json
 from typing import List
 import numpy as np
-from knapsack.solver.traditional_solver import DPKnapsackSolver, GreedyKnapsackSolver
+from knapsack.solver.traditional_solver import DPKnapsackSolver, GreedyKnapsackSolver, BranchAndBoundKnapsackSolver
 from knapsack.solver.ml_solver import MLKnapsackSolver
+from knapsack.solver.genetic_solver import GeneticKnapsackSolver
 from utils.evaluation import KnapsackEvaluator
 
 def parse_list(s: str) -> List[float]:
@@ -18,10 +19,18 @@ def main():
                       help='Comma-separated list of values')
     parser.add_argument('--capacity', type=float, required=True,
                       help='Knapsack capacity')
-    parser.add_argument('--solver', type=str, choices=['dp', 'greedy', 'ml', 'all'],
+    parser.add_argument('--solver', type=str, choices=['dp', 'greedy', 'ml', 'bnb', 'ga', 'all'],
                       default='all', help='Solver to use')
     parser.add_argument('--output', type=str, default=None,
                       help='Output file for JSON results')
+    parser.add_argument('--seed', type=int, default=None,
+                      help='Random seed for the genetic solver')
+    parser.add_argument('--population-size', type=int, default=100,
+                      help='Population size for the genetic solver')
+    parser.add_argument('--generations', type=int, default=300,
+                      help='Maximum generations for the genetic solver')
+    parser.add_argument('--time-limit', type=float, default=None,
+                      help='Time budget in seconds for the genetic solver')
     
     args = parser.parse_args()
     
@@ -47,6 +56,19 @@ def main():
         ml_solver = MLKnapsackSolver()
         results['ml'] = ml_solver.solve(weights, values, args.capacity)
     
+    if args.solver == 'bnb':
+        bnb_solver = BranchAndBoundKnapsackSolver()
+        results['bnb'] = bnb_solver.solve(weights, values, args.capacity)
+    
+    if args.solver == 'ga':
+        ga_solver = GeneticKnapsackSolver(
+            population_size=args.population_size,
+            generations=args.generations,
+            time_limit=args.time_limit,
+            seed=args.seed
+        )
+        results['ga'] = ga_solver.solve(weights, values, args.capacity)
+    
     # Print results
     for solver_name, solution in results.items():
         print(f"\n{solver_name.upper()} Solver Solution:")
@@ -1,4 +1,8 @@
-from knapsack_ga import KnapsackGA
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knapsack.solver.genetic_solver import KnapsackGA
 import numpy as np
 
 def main():
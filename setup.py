@@ -12,6 +12,7 @@ setup(
         "uvicorn",
         "pydantic<2.0",
         "joblib",
+        "threadpoolctl",
         "tqdm"
     ]
 ) 
\ No newline at end of file
@@ -0,0 +1,10 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from knapsack import api
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(api.app) as client:
+        yield client
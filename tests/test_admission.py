@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from knapsack import api
+from knapsack.admission import AdmissionPolicy, AdmissionError
+from knapsack.solver.cost_model import SolverCostModel
+
+# The DP table has 20 x 100,001 cells, about 2 estimated CPU seconds
+WEIGHTS = [float(w) for w in range(1, 21)]
+VALUES = [float(w % 7 + 1) for w in range(1, 21)]
+CAPACITY = 100.0
+
+
+def make_policy(**kwargs):
+    return AdmissionPolicy(SolverCostModel(), **kwargs)
+
+
+def test_plan_rejects_a_solver_over_budget():
+    with pytest.raises(AdmissionError) as excinfo:
+        make_policy(max_cpu_seconds=0.5).plan(["dp"], WEIGHTS, VALUES, CAPACITY)
+    assert excinfo.value.status_code == 413
+
+
+def test_plan_downgrades_a_solver_over_budget():
+    plan = make_policy(max_cpu_seconds=0.5).plan(["dp"], WEIGHTS, VALUES, CAPACITY, allow_downgrade=True)
+    assert plan["solvers"] == ["ml"]
+    assert plan["downgrades"] == {"dp": "ml"}
+
+
+def test_plan_rejects_memory_over_budget():
+    with pytest.raises(AdmissionError) as excinfo:
+        make_policy(max_memory_bytes=1024 ** 2).plan(["dp"], WEIGHTS, VALUES, CAPACITY)
+    assert excinfo.value.status_code == 413
+
+
+def test_full_queue_is_503():
+    policy = make_policy(max_concurrent=1, max_queue=1)
+
+    async def run():
+        await policy.acquire(0)
+        waiting = asyncio.ensure_future(policy.acquire(0))
+        await asyncio.sleep(0.01)
+        with pytest.raises(AdmissionError) as excinfo:
+            await policy.acquire(0)
+        assert excinfo.value.status_code == 503
+        assert excinfo.value.retry_after is not None
+        await policy.release(0)
+        await waiting
+        await policy.release(0)
+
+    asyncio.run(run())
+
+
+def test_queue_timeout_is_503():
+    policy = make_policy(max_concurrent=1, queue_timeout=0.05)
+
+    async def run():
+        await policy.acquire(0)
+        with pytest.raises(AdmissionError, match="Timed out"):
+            await policy.acquire(0)
+        await policy.release(0)
+        assert await policy.acquire(0) >= 0
+        await policy.release(0)
+
+    asyncio.run(run())
+
+
+def test_api_answers_413_and_downgrades(client):
+    request = {"weights": WEIGHTS, "values": VALUES, "capacity": 1e6, "solver_type": "dp"}
+    assert client.post("/solve", json=request).status_code == 413
+
+    response = client.post("/solve", json=dict(request, allow_downgrade=True))
+    assert response.status_code == 200
+    assert response.json()["admission"]["downgrades"]["dp"] in ("ml", "greedy")
+
+
+def test_solver_stops_at_the_cpu_budget():
+    results = api._run_solvers(["dp"], WEIGHTS, VALUES, CAPACITY, cpu_budget=0.05)
+
+    solution = results["dp"]
+    assert solution["stop_reason"] == "cpu_budget"
+    assert not solution["is_optimal"]
+    assert solution["total_weight"] <= CAPACITY
+    assert solution["solve_time"] < 1.0
+
+
+def test_solver_within_the_cpu_budget_runs_to_the_end():
+    results = api._run_solvers(["greedy", "bnb"], WEIGHTS, VALUES, CAPACITY, cpu_budget=30.0)
+    assert "stop_reason" not in results["bnb"]
+    assert results["bnb"]["is_optimal"]
@@ -0,0 +1,35 @@
+import pytest
+
+INSTANCE = {"weights": [2.0, 3.0, 4.0, 5.0], "values": [3.0, 4.0, 5.0, 6.0], "capacity": 5.0}
+
+
+@pytest.mark.parametrize("solver_type", ["auto", "ga", "bnb", "all"])
+@pytest.mark.parametrize("weights, values", [
+    ([0.0, 1.0], [1.0, 1.0]),
+    ([-1.0, 1.0], [1.0, 1.0]),
+    ([1.0, 1.0], [-1.0, 1.0])
+])
+def test_non_positive_weights_and_negative_values_are_rejected(client, solver_type, weights, values):
+    response = client.post("/solve", json={"weights": weights, "values": values, "capacity": 4.0, "solver_type": solver_type})
+    assert response.status_code == 400
+
+
+def test_non_finite_numbers_are_rejected(client):
+    body = '{"weights": [1.0, Infinity], "values": [1.0, 2.0], "capacity": 4.0, "solver_type": "greedy"}'
+    response = client.post("/solve", content=body, headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("solver_type", ["ga", "bnb", "dp", "ml"])
+def test_zero_values_are_accepted(client, solver_type):
+    response = client.post("/solve", json=dict(INSTANCE, values=[0.0, 4.0, 5.0, 6.0], solver_type=solver_type))
+    assert response.status_code == 200
+    assert response.json()["results"][solver_type]["total_value"] == 6.0
+
+
+def test_auto_reports_its_choice(client):
+    response = client.post("/solve", json=dict(INSTANCE, solver_type="auto"))
+    assert response.status_code == 200
+    payload = response.json()
+    assert list(payload["results"]) == [payload["auto"]["solver"]]
+    assert payload["results"][payload["auto"]["solver"]]["total_value"] == 7.0
@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.suite import build_solvers, compare, load_results, run_benchmarks, save_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CELL = {'family': 'uncorrelated', 'n_items': 20, 'coefficient_range': 100, 'capacity_fraction': 0.5}
+ENVIRONMENT = {'python': '3.11', 'numpy': '1.26', 'platform': 'linux', 'processor': 'x86_64', 'cpu_count': 4}
+
+
+def record(solver='greedy', runtime=0.01, gap=0.01, peak=1_000_000, feasible=True, **cell):
+    return dict(CELL, **cell, solver=solver, runtime=runtime, gap=gap,
+                tracemalloc_peak_bytes=peak, is_feasible=feasible)
+
+
+def run(*records, **environment):
+    return {'environment': dict(ENVIRONMENT, **environment), 'records': list(records)}
+
+
+def test_identical_runs_do_not_regress():
+    baseline = run(record(), record(solver='bnb'))
+    report = compare(baseline, baseline)
+
+    assert len(report['cells']) == 2
+    assert report['regressions'] == []
+    assert not report['environment_differs']
+
+
+@pytest.mark.parametrize("changes, reason", [
+    (dict(runtime=0.02), "runtime"),
+    (dict(gap=0.02), "gap"),
+    (dict(peak=2_000_000), "peak memory"),
+    (dict(feasible=False), "feasibility"),
+])
+def test_regressions_are_flagged_with_their_reason(changes, reason):
+    report = compare(run(record()), run(record(**changes)))
+
+    assert len(report['regressions']) == 1
+    assert report['regressions'][0]['reasons'][0].startswith(reason)
+
+
+@pytest.mark.parametrize("changes", [
+    dict(runtime=0.012),  # within the 25% runtime tolerance
+    dict(runtime=0.0001 * 1.5, base_runtime=0.0001),  # 50% slower, but under a millisecond
+    dict(gap=0.014),  # within the 0.005 gap tolerance
+    dict(peak=1_050_000),  # within the memory tolerance
+    dict(peak=100_000, base_peak=50_000),  # doubled, but by less than 64 KB
+    dict(runtime=0.005, gap=0.0),  # improvements
+])
+def test_changes_within_tolerance_are_not_regressions(changes):
+    base = record(runtime=changes.pop('base_runtime', 0.01), peak=changes.pop('base_peak', 1_000_000))
+    assert compare(run(base), run(record(**changes)))['regressions'] == []
+
+
+def test_tolerances_can_be_widened():
+    report = compare(run(record()), run(record(runtime=0.02, gap=0.02)), runtime_tolerance=1.5, gap_tolerance=0.05)
+    assert report['regressions'] == []
+
+
+def test_cells_are_compared_on_their_median_runtime():
+    baseline = run(record(runtime=0.01), record(runtime=0.01), record(runtime=0.01))
+    current = run(record(runtime=0.01), record(runtime=0.01), record(runtime=0.1))
+    assert compare(baseline, current)['regressions'] == []
+
+
+def test_cells_in_only_one_run_are_listed():
+    report = compare(run(record(), record(solver='ga')), run(record(), record(n_items=50)))
+
+    assert [cell['solver'] for cell in report['only_in_baseline']] == ['ga']
+    assert [cell['n_items'] for cell in report['only_in_current']] == [50]
+    assert len(report['cells']) == 1
+
+
+def test_environment_changes_are_reported():
+    assert compare(run(record()), run(record(), cpu_count=8))['environment_differs']
+
+
+def test_compare_exits_with_status_one_on_regressions(tmp_path):
+    records, skipped = run_benchmarks(
+        build_solvers(("greedy", "bnb")), families=("uncorrelated",), sizes=(10,),
+        coefficient_ranges=(100,), capacity_fractions=(0.5,), instances=1, repetitions=1
+    )
+    assert {r['solver'] for r in records} == {"greedy", "bnb"}
+    assert all(r['is_feasible'] for r in records)
+    assert next(r for r in records if r['solver'] == 'bnb')['gap'] == pytest.approx(0.0)
+
+    save_results(str(tmp_path / 'baseline.json'), records, skipped, {})
+    slower = [dict(r, runtime=r['runtime'] * 10 + 0.01) if r['solver'] == 'greedy' else r for r in records]
+    save_results(str(tmp_path / 'current.json'), slower, skipped, {})
+    assert load_results(str(tmp_path / 'current.json'))['records'] == slower
+
+    def compare_cli(current):
+        return subprocess.run(
+            [sys.executable, '-m', 'benchmarks.suite', 'compare', str(tmp_path / 'baseline.json'), str(tmp_path / current)],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+
+    result = compare_cli('baseline.json')
+    assert result.returncode == 0, result.stderr
+    assert "0 of 2 cells regressed" in result.stdout
+    result = compare_cli('current.json')
+    assert result.returncode == 1
+    assert "REGRESSION greedy" in result.stdout and "1 of 2 cells regressed" in result.stdout
+
+
+def test_unknown_results_versions_are_rejected(tmp_path):
+    path = tmp_path / 'results.json'
+    path.write_text('{"results_version": 99}')
+    with pytest.raises(ValueError, match="results version"):
+        load_results(str(path))
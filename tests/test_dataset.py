@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from knapsack.dataset import KnapsackDataset, load_instances, convert_csv
+
+
+def make_frame():
+    return pd.DataFrame({
+        'weights': [[1.0, 2.0, 3.0], [4.0], [5.0, 6.0]],
+        'values': [[3.0, 2.0, 1.0], [7.0], [1.0, 9.0]],
+        'selection': [[1, 1, 0], [0], [0, 1]],
+        'capacity': [3.0, 2.0, 6.0],
+        'optimal_value': [5.0, 0.0, 9.0]
+    })
+
+
+def assert_same(a: KnapsackDataset, b: KnapsackDataset):
+    for field in ('capacity', 'offsets', 'weights', 'values', 'optimal_value', 'selection'):
+        np.testing.assert_array_equal(getattr(a, field), getattr(b, field))
+
+
+def test_columnar_round_trip(tmp_path):
+    dataset = KnapsackDataset.from_frame(make_frame())
+    dataset.save(str(tmp_path / 'data'))
+
+    for mmap in (True, False):
+        loaded = load_instances(str(tmp_path / 'data'), mmap=mmap)
+        assert_same(loaded, dataset)
+        assert loaded.fingerprint() == dataset.fingerprint()
+        weights, values, capacity = loaded.instance(2)
+        np.testing.assert_array_equal(weights, [5.0, 6.0])
+        np.testing.assert_array_equal(values, [1.0, 9.0])
+        assert capacity == 6.0
+    pd.testing.assert_frame_equal(loaded.to_frame(), dataset.to_frame())
+
+
+def test_csv_conversion_matches_csv_loading(tmp_path):
+    make_frame().to_csv(tmp_path / 'data.csv', index=False)
+    converted = convert_csv(str(tmp_path / 'data.csv'), str(tmp_path / 'data'))
+
+    assert_same(load_instances(str(tmp_path / 'data.csv')), converted)
+    assert_same(load_instances(str(tmp_path / 'data')), converted)
+    np.testing.assert_array_equal(converted.n_items, [3, 1, 2])
+
+
+def test_memory_mapped_columns_are_not_read_into_memory(tmp_path):
+    KnapsackDataset.from_frame(make_frame()).save(str(tmp_path / 'data'))
+
+    assert isinstance(load_instances(str(tmp_path / 'data')).weights, np.memmap)
+    assert not isinstance(load_instances(str(tmp_path / 'data'), mmap=False).weights, np.memmap)
+
+
+def test_shard_views_match_the_rows():
+    dataset = KnapsackDataset.from_frame(make_frame())
+    shard = dataset.shard(1, 3)
+
+    assert len(shard) == 2
+    pd.testing.assert_frame_equal(shard.to_frame(), dataset.to_frame().iloc[1:].reset_index(drop=True))
+
+
+def test_padded_zero_pads_and_truncates():
+    dataset = KnapsackDataset.from_frame(make_frame())
+    np.testing.assert_array_equal(dataset.padded('weights', 2), [[1.0, 2.0], [4.0, 0.0], [5.0, 6.0]])
+
+
+def test_fingerprint_follows_the_content():
+    frame = make_frame()
+    assert KnapsackDataset.from_frame(frame).fingerprint() == KnapsackDataset.from_frame(frame.copy()).fingerprint()
+    frame.loc[0, 'capacity'] = 4.0
+    assert KnapsackDataset.from_frame(frame).fingerprint() != KnapsackDataset.from_frame(make_frame()).fingerprint()
+
+
+def test_unknown_format_versions_are_rejected(tmp_path):
+    KnapsackDataset.from_frame(make_frame()).save(str(tmp_path / 'data'))
+    meta_path = tmp_path / 'data' / 'meta.json'
+    meta_path.write_text(meta_path.read_text().replace('"format_version": 1', '"format_version": 99'))
+
+    with pytest.raises(ValueError, match="format version"):
+        load_instances(str(tmp_path / 'data'))
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from knapsack.generate_data import solve_knapsack_dp
+from utils.evaluation import DEFAULT_SOLVERS, KnapsackEvaluator
+
+
+def labeled_frame(n_instances, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n_instances):
+        n = int(rng.integers(5, 15))
+        weights = rng.integers(1, 30, n).astype(float)
+        values = rng.integers(1, 30, n).astype(float)
+        capacity = float(weights.sum() // 2)
+        optimal_value, selected = solve_knapsack_dp(weights.tolist(), values.tolist(), capacity)
+        selection = np.zeros(n)
+        selection[selected] = 1
+        rows.append({
+            'weights': weights.tolist(), 'values': values.tolist(), 'selection': selection.tolist(),
+            'capacity': capacity, 'optimal_value': optimal_value
+        })
+    return pd.DataFrame(rows)
+
+
+def test_default_run_leaves_out_the_dp():
+    assert "dp" not in DEFAULT_SOLVERS
+    assert KnapsackEvaluator(["greedy"]).ml_solver is None
+
+
+def test_workers_without_the_ml_solver_match_in_process_evaluation():
+    # Several chunks, so the evaluation really goes through the worker pool
+    data = labeled_frame(120)
+    parallel = KnapsackEvaluator(["greedy"], n_workers=2).evaluate_dataset(data)
+    serial = KnapsackEvaluator(["greedy"], n_workers=1).evaluate_dataset(data)
+
+    assert parallel['greedy']['mean_value'] == serial['greedy']['mean_value']
+    assert parallel['greedy']['feasibility_rate'] == 1.0
+    assert 0.8 < parallel['greedy']['relative_performance'] <= 1.0
+
+
+def test_dp_is_measured_against_the_stored_optimum():
+    summary = KnapsackEvaluator(["dp", "greedy"], n_workers=1).evaluate_dataset(labeled_frame(2))
+    assert summary['dp']['relative_performance'] == pytest.approx(1.0)
+
+
+def test_unlabeled_instances_are_solved_by_the_dp():
+    data = labeled_frame(2).drop(columns=['optimal_value'])
+    results = KnapsackEvaluator(["greedy"], n_workers=1).evaluate_instances(
+        [(row.weights, row.values, row.capacity) for row in data.itertuples()], [None] * len(data)
+    )
+    assert all(result['greedy']['relative_performance'] <= 1.0 for result in results)
@@ -0,0 +1,399 @@
+import time
+
+import numpy as np
+import pytest
+
+from knapsack.generate_data import solve_knapsack_dp
+from knapsack.solver.genetic_solver import GeneticKnapsackSolver, IslandKnapsackGA, KnapsackGA
+from knapsack.solver.observers import EarlyStopObserver, SolverObserver
+
+
+def integer_instance(seed, n=40):
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, 100, n).astype(float).tolist()
+    values = rng.integers(1, 100, n).astype(float).tolist()
+    return weights, values, float(np.floor(0.4 * sum(weights)))
+
+
+def make_ga(n=40, seed=0, **kwargs):
+    weights, values, capacity = integer_instance(seed, n)
+    return KnapsackGA(weights, values, capacity, seed=seed, **kwargs)
+
+
+@pytest.mark.parametrize("crossover", ["single_point", "uniform"])
+def test_crossover_children_share_their_parents_genes(crossover):
+    ga = make_ga(crossover=crossover, population_size=50)
+    parents = ga.rng.integers(0, 2, size=(50, ga.n_items), dtype=np.int8)
+    offspring = ga._crossover(parents)
+
+    # Each pair's children split the parents' genes between them, position by position
+    np.testing.assert_array_equal(offspring[0::2] + offspring[1::2], parents[0::2] + parents[1::2])
+    assert np.all((offspring[0::2] == parents[0::2]) | (offspring[0::2] == parents[1::2]))
+    if crossover == "single_point":
+        # The first child takes a prefix of the first parent and the rest of the second
+        for child, first, second in zip(offspring[0::2], parents[0::2], parents[1::2]):
+            assert any(
+                np.array_equal(child, np.concatenate([first[:point], second[point:]]))
+                for point in range(1, ga.n_items)
+            )
+
+def test_mutation_flips_about_the_mutation_rate():
+    ga = make_ga(n=200, mutation_rate=0.05, population_size=200)
+    population = np.zeros((200, ga.n_items), dtype=np.int8)
+    mutated = ga._mutate(population.copy())
+    assert set(np.unique(mutated)) <= {0, 1}
+    assert mutated.mean() == pytest.approx(0.05, abs=0.01)
+
+
+def test_tournament_selection_picks_population_members():
+    ga = make_ga(population_size=30, tournament_size=30)
+    population = ga._initialize_population()
+    fitness, _ = ga._calculate_fitness(population)
+    parents = ga._select_parents(population, fitness)
+
+    assert parents.shape == population.shape
+    rows = {row.tobytes() for row in population}
+    assert all(row.tobytes() in rows for row in parents)
+    assert ga._calculate_fitness(parents)[0].mean() >= fitness.mean()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ga_reaches_near_optimal_feasible_solutions(seed):
+    weights, values, capacity = integer_instance(seed)
+    optimum, _ = solve_knapsack_dp(weights, values, capacity)
+    ga = KnapsackGA(weights, values, capacity, seed=seed, population_size=100, generations=200, mutation_rate=1 / 40)
+    solution, value, weight, selected = ga.solve()
+
+    assert weight <= capacity
+    assert value == pytest.approx(sum(values[i] for i in selected))
+    assert value >= 0.97 * optimum
+
+
+@pytest.mark.parametrize("n", [5, 64, 70, 130])
+def test_pack_round_trip_leaves_padding_clear(n):
+    ga = make_ga(n=n, packed=True)
+    population = ga.rng.integers(0, 2, size=(20, n), dtype=np.int8)
+    packed = ga._pack(population)
+
+    assert packed.dtype == np.dtype('<u8') and packed.shape == (20, ga.n_words)
+    np.testing.assert_array_equal(ga._unpack(packed), population)
+    assert np.all(packed[:, -1] & ~ga._last_word_mask == 0)
+
+
+@pytest.mark.parametrize("n", [5, 70])
+def test_packed_fitness_matches_unpacked(n):
+    packed_ga = make_ga(n=n, packed=True)
+    ga = make_ga(n=n)
+    population = ga.rng.integers(0, 2, size=(50, n), dtype=np.int8)
+
+    fitness, weights = ga._calculate_fitness(population)
+    packed_fitness, packed_weights = packed_ga._calculate_fitness(packed_ga._pack(population))
+    np.testing.assert_allclose(packed_fitness, fitness)
+    np.testing.assert_allclose(packed_weights, weights)
+
+
+def test_packed_repair_matches_unpacked():
+    packed_ga = make_ga(n=70, packed=True)
+    ga = make_ga(n=70)
+    population = np.ones((10, 70), dtype=np.int8)
+    population[:, ::3] = 0
+
+    repaired = ga._repair(population.copy())
+    packed_repaired = packed_ga._repair(packed_ga._pack(population))
+    np.testing.assert_array_equal(packed_ga._unpack(packed_repaired), repaired)
+
+
+@pytest.mark.parametrize("crossover", ["single_point", "uniform"])
+def test_packed_crossover_matches_unpacked_semantics(crossover):
+    ga = make_ga(n=70, packed=True, crossover=crossover, population_size=40)
+    parents = ga.rng.integers(0, 2, size=(40, 70), dtype=np.int8)
+    offspring = ga._unpack(ga._crossover(ga._pack(parents)))
+
+    np.testing.assert_array_equal(offspring[0::2] + offspring[1::2], parents[0::2] + parents[1::2])
+    if crossover == "single_point":
+        for child, first, second in zip(offspring[0::2], parents[0::2], parents[1::2]):
+            assert any(
+                np.array_equal(child, np.concatenate([first[:point], second[point:]]))
+                for point in range(1, 70)
+            )
+
+
+def test_packed_mutation_mask_rate_and_padding():
+    ga = make_ga(n=70, packed=True, mutation_rate=0.1)
+    mask = ga._packed_mutation_mask((500, ga.n_words))
+
+    assert np.all(mask[:, -1] & ~ga._last_word_mask == 0)
+    assert ga._unpack(mask).mean() == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_packed_ga_solves_like_unpacked(seed):
+    weights, values, capacity = integer_instance(seed, n=70)
+    optimum, _ = solve_knapsack_dp(weights, values, capacity)
+    results = []
+    for packed in (False, True):
+        ga = KnapsackGA(weights, values, capacity, seed=seed, packed=packed, generations=200, mutation_rate=1 / 70)
+        solution, value, weight, selected = ga.solve()
+        assert len(solution) == 70
+        assert weight <= capacity
+        assert value == pytest.approx(sum(values[i] for i in selected))
+        results.append(value)
+    assert min(results) >= 0.97 * optimum
+
+
+class RecordingObserver(SolverObserver):
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, event):
+        self.events.append(event)
+
+    def on_incumbent(self, event):
+        self.events.append(event)
+
+    def on_iteration(self, event):
+        self.events.append(event)
+
+    def on_finish(self, event):
+        self.events.append(event)
+
+
+def make_islands(n=60, **kwargs):
+    weights, values, capacity = integer_instance(0, n)
+    kwargs.setdefault("generations", 10 ** 6)
+    return IslandKnapsackGA(weights, values, capacity, n_islands=2, migration_interval=10, seed=0, **kwargs)
+
+
+@pytest.mark.parametrize("kwargs, reason", [
+    (dict(generations=50), "generations"),
+    (dict(time_limit=0.2), "time_limit"),
+    (dict(patience=30), "patience"),
+    (dict(target_value=1.0), "target_value"),
+    (dict(min_diversity=0.99), "min_diversity"),
+])
+def test_islands_stop_together_at_a_migration(kwargs, reason):
+    ga = make_islands(**kwargs)
+    _, value, weight, _ = ga.solve()
+
+    assert ga.stop_reason == reason
+    assert ga.generations_run % 10 == 0
+    assert weight <= ga.capacity and value > 0
+
+
+def test_observers_can_stop_islands():
+    observer = RecordingObserver()
+    ga = make_islands()
+    start = time.perf_counter()
+    _, value, _, selected = ga.solve(observers=[observer, EarlyStopObserver(time_limit=0.2)])
+
+    assert time.perf_counter() - start < 5
+    assert ga.stop_reason == "observer"
+    types = [event["type"] for event in observer.events]
+    assert types[0] == "start" and types[-1] == "finish" and types.count("finish") == 1
+    incumbents = [event["total_value"] for event in observer.events if event["type"] == "incumbent"]
+    assert incumbents == sorted(incumbents) and incumbents[-1] == value
+    assert observer.events[-1]["selected_items"] == selected
+    assert "iteration" in types
+
+
+def test_island_solver_honours_its_time_limit():
+    weights, values, capacity = integer_instance(0, 60)
+    solver = GeneticKnapsackSolver(generations=10 ** 6, patience=None, n_islands=2, seed=0)
+    result = solver.solve(weights, values, capacity, time_limit=0.2)
+
+    assert result["stop_reason"] == "time_limit"
+    assert result["solve_time"] < 5
+    assert result["is_feasible"]
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_repair_makes_every_chromosome_feasible(packed):
+    ga = make_ga(n=70, packed=packed)
+    genes = ga.rng.integers(0, 2, size=(100, 70), dtype=np.int8)
+    population = ga._pack(genes) if packed else genes.copy()
+
+    repaired = ga._repair(population)
+    repaired_genes = ga._unpack(repaired) if packed else repaired
+    assert np.all(repaired_genes @ ga.weights <= ga.capacity)
+    # Repair only drops items
+    assert np.all(repaired_genes <= genes)
+    # and only from chromosomes that were overweight
+    feasible = genes @ ga.weights <= ga.capacity
+    np.testing.assert_array_equal(repaired_genes[feasible], genes[feasible])
+
+
+def test_repair_drops_the_lowest_ratio_items_first():
+    ga = KnapsackGA([5, 5, 5], [1, 10, 5], 10.0, population_size=4)
+    np.testing.assert_array_equal(ga._repair(np.ones((1, 3), dtype=np.int8)), [[0, 1, 1]])
+
+
+def test_without_repair_overweight_chromosomes_score_zero():
+    ga = KnapsackGA([5, 5, 5], [1, 10, 5], 10.0, population_size=4, repair=False)
+    fitness, _ = ga._calculate_fitness(np.array([[1, 1, 1], [0, 1, 1]], dtype=np.int8))
+    np.testing.assert_array_equal(fitness, [0, 15])
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_population_starts_with_the_greedy_solution(packed):
+    ga = make_ga(packed=packed)
+    population = ga._initialize_population()
+    first = ga._unpack(population[:1])[0] if packed else population[0]
+
+    np.testing.assert_array_equal(first, ga._greedy_solution())
+    order = ga._ratio_order[::-1]
+    # Greedy takes items by descending ratio, skipping those that no longer fit
+    total = 0.0
+    for i in order:
+        assert first[i] == (total + ga.weights[i] <= ga.capacity)
+        total += ga.weights[i] * first[i]
+
+
+def test_seed_probabilities_shape_the_seeded_part_of_the_population():
+    n = 40
+    probabilities = np.where(np.arange(n) < 20, 1.0, 0.0)
+    ga = make_ga(
+        n=n, population_size=200, seed_probabilities=probabilities, seed_fraction=0.5,
+        seed_greedy=False, repair=False
+    )
+    population = ga._initialize_population()
+
+    seeded, random = population[100:], population[:100]
+    assert np.all(seeded[:, :20] == 1) and np.all(seeded[:, 20:] == 0)
+    assert random.mean() == pytest.approx(0.5, abs=0.05)
+
+
+def test_seed_probabilities_must_match_the_items():
+    with pytest.raises(ValueError, match="Seed probabilities"):
+        make_ga(n=10, seed_probabilities=[0.5] * 9)
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_elitism_never_loses_the_best_chromosome(packed):
+    ga = make_ga(n=60, packed=packed, elite_size=2, mutation_rate=0.3, seed_greedy=False)
+    population = ga._initialize_population()
+    best = -np.inf
+    for _ in range(30):
+        fitness, _ = ga._calculate_fitness(population)
+        assert fitness.max() >= best
+        best = fitness.max()
+        population = ga._next_generation(population, fitness)
+        assert len(population) == ga.population_size
+
+
+@pytest.mark.parametrize("kwargs, reason", [
+    (dict(generations=25), "generations"),
+    (dict(patience=15), "patience"),
+    (dict(target_value=1.0), "target_value"),
+    (dict(min_diversity=0.99), "min_diversity"),
+    (dict(time_limit=0.05), "time_limit"),
+])
+def test_stopping_rules_name_the_reason(kwargs, reason):
+    kwargs.setdefault("generations", 10 ** 6)
+    ga = make_ga(**kwargs)
+    ga.solve()
+
+    assert ga.stop_reason == reason
+    if reason == "generations":
+        assert ga.generations_run == 25
+    if reason == "target_value":
+        assert ga.generations_run == 1
+
+
+def test_patience_counts_generations_without_improvement():
+    ga = make_ga(generations=10 ** 6, patience=15, record_trace=True)
+    ga.solve()
+
+    best_values = [entry["best_value"] for entry in ga.trace]
+    last_improvement = max(i for i in range(len(best_values)) if i == 0 or best_values[i] > best_values[i - 1])
+    assert ga.generations_run - 1 - last_improvement == 15
+
+
+def test_observers_can_stop_a_run():
+    class StopAfter(SolverObserver):
+        def on_iteration(self, event):
+            return event["generation"] >= 4
+
+    ga = make_ga(generations=100)
+    ga.solve(observers=[StopAfter()])
+    assert ga.stop_reason == "observer"
+    assert ga.generations_run == 5
+
+
+def test_trace_records_one_entry_per_generation():
+    ga = make_ga(generations=20, record_trace=True)
+    _, value, _, _ = ga.solve()
+
+    assert [entry["generation"] for entry in ga.trace] == list(range(20))
+    for entry in ga.trace:
+        assert 0 <= entry["feasible_fraction"] <= 1
+        assert 0 <= entry["diversity"] <= 1
+        assert entry["mean_fitness"] <= entry["best_value"]
+    assert [entry["best_value"] for entry in ga.trace] == sorted(entry["best_value"] for entry in ga.trace)
+    assert ga.trace[-1]["best_value"] <= value
+
+
+def test_trace_is_off_by_default():
+    ga = make_ga(generations=5)
+    ga.solve()
+    assert ga.trace is None
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    (dict(weights=[1.0, 2.0], values=[1.0]), "same length"),
+    (dict(weights=[0.0, 2.0], values=[1.0, 1.0]), "Weights must be positive"),
+    (dict(weights=[1.0, 2.0], values=[-1.0, 1.0]), "cannot be negative"),
+    (dict(capacity=0.0), "Capacity"),
+    (dict(crossover="two_point"), "crossover"),
+])
+def test_invalid_inputs_raise_before_any_numpy_warning(kwargs, message):
+    arguments = dict(weights=[1.0, 2.0], values=[1.0, 1.0], capacity=2.0)
+    arguments.update(kwargs)
+    with np.errstate(all="raise"), pytest.raises(ValueError, match=message):
+        KnapsackGA(**arguments)
+
+
+def test_without_elitism_the_best_chromosome_seen_is_returned():
+    observer = RecordingObserver()
+    ga = make_ga(n=60, elite_size=0, mutation_rate=0.5, generations=30)
+    _, value, weight, selected = ga.solve(observers=[observer])
+
+    incumbents = [event["total_value"] for event in observer.events if event["type"] == "incumbent"]
+    assert value == max(incumbents)
+    assert weight <= ga.capacity
+    assert value == pytest.approx(float(ga.values[selected].sum()))
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_genetic_solver_reports_a_result_dict(packed):
+    weights, values, capacity = integer_instance(2)
+    optimum, _ = solve_knapsack_dp(weights, values, capacity)
+    result = GeneticKnapsackSolver(packed=packed, seed=0).solve(weights, values, capacity)
+
+    assert set(result) == {
+        "selected_items", "total_value", "total_weight", "is_feasible", "selection",
+        "solve_time", "generations", "stop_reason"
+    }
+    assert result["is_feasible"]
+    assert result["total_value"] == sum(values[i] for i in result["selected_items"])
+    assert [i for i, x in enumerate(result["selection"]) if x == 1] == result["selected_items"]
+    assert result["total_value"] >= 0.97 * optimum
+    assert result["stop_reason"] in ("generations", "patience")
+
+
+def test_genetic_solver_is_reproducible_with_a_seed():
+    weights, values, capacity = integer_instance(3)
+    solver = GeneticKnapsackSolver(seed=1)
+    first, second = solver.solve(weights, values, capacity), solver.solve(weights, values, capacity)
+    assert first["selected_items"] == second["selected_items"]
+
+
+def test_api_runs_the_ga(client):
+    response = client.post("/solve", json={
+        "weights": [2.0, 3.0, 4.0, 5.0], "values": [3.0, 4.0, 5.0, 6.0], "capacity": 5.0,
+        "solver_type": "ga", "latency_target": 2.0
+    })
+    assert response.status_code == 200
+    result = response.json()["results"]["ga"]
+    assert result["total_value"] == 7.0
+    assert result["selected_items"] == [0, 1]
+    assert result["stop_reason"] in ("generations", "patience", "time_limit")
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from knapsack import generate_data
+from knapsack.generate_data import generate_dataset
+
+PARAMS = dict(min_items=5, max_items=12)
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    monkeypatch.setattr(generate_data, "SHARD_SIZE", 4)
+
+
+def test_seeded_dataset_does_not_depend_on_the_workers(small_shards):
+    serial = generate_dataset(10, seed=7, n_workers=1, **PARAMS)
+    parallel = generate_dataset(10, seed=7, n_workers=2, **PARAMS)
+
+    assert len(serial) == 10
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_shards_are_seeded_independently(small_shards):
+    # A larger dataset starts with the same shards; a different seed changes them
+    small = generate_dataset(8, seed=7, n_workers=2, **PARAMS)
+    large = generate_dataset(10, seed=7, n_workers=2, **PARAMS)
+    pd.testing.assert_frame_equal(small, large.iloc[:8])
+    other = generate_dataset(8, seed=8, n_workers=2, **PARAMS)
+    assert not small['weights'].equals(other['weights'])
+
+
+@pytest.mark.parametrize("family", [None, "strongly_correlated"])
+def test_instances_are_labeled_with_their_optimum(small_shards, family):
+    data = generate_dataset(6, seed=1, n_workers=1, family=family, **PARAMS)
+
+    for row in data.itertuples():
+        assert PARAMS['min_items'] <= row.n_items <= PARAMS['max_items']
+        selection = np.asarray(row.selection)
+        if family is not None:
+            # Float weights are truncated by the DP, so only integer families are exactly feasible
+            assert selection @ np.asarray(row.weights) <= row.capacity
+        assert selection @ np.asarray(row.values) == pytest.approx(row.optimal_value)
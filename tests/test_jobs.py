@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from knapsack import api
+from knapsack.jobs import JobManager, JobQueueFullError
+
+INSTANCE = {"weights": [2.0, 3.0, 4.0, 5.0], "values": [3.0, 4.0, 5.0, 6.0], "capacity": 5.0}
+
+
+def wait_for(client, job_id, statuses, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} is still {job['status']}")
+
+
+def wait_until_finished(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while job.finished_at is None and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_queue_full_and_queued_cancel():
+    manager = JobManager(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        running = manager.submit(lambda job: release.wait(5) and {}, {})
+        while running.status != "running":
+            time.sleep(0.01)
+        queued = manager.submit(lambda job: {}, {})
+        with pytest.raises(JobQueueFullError):
+            manager.submit(lambda job: {}, {})
+
+        assert manager.cancel(queued.job_id).status == "cancelled"
+        release.set()
+        wait_until_finished(running)
+        assert running.status == "succeeded"
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def test_failed_job_keeps_its_error():
+    manager = JobManager(max_workers=1)
+    try:
+        job = manager.submit(lambda job: 1 / 0, {})
+        wait_until_finished(job)
+        assert job.status == "failed"
+        assert "division by zero" in job.to_dict()["error"]
+    finally:
+        manager.shutdown()
+
+
+def test_eviction_drops_the_earliest_finished_jobs():
+    manager = JobManager(max_workers=2, max_finished=1)
+    release = threading.Event()
+    try:
+        slow = manager.submit(lambda job: release.wait(5) and {}, {})
+        fast = manager.submit(lambda job: {}, {})
+        wait_until_finished(fast)
+        release.set()
+        wait_until_finished(slow)
+
+        # Submitted first but finished last, so the slow job is kept
+        assert manager.get(slow.job_id) is slow
+        assert manager.get(fast.job_id) is None
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def test_report_keeps_the_best_feasible_incumbent():
+    manager = JobManager(max_workers=1)
+    try:
+        def target(job):
+            job.report("greedy", {"is_feasible": True, "total_value": 5.0, "total_weight": 4.0, "selected_items": [0]})
+            job.report("ga", {"is_feasible": False, "total_value": 9.0, "total_weight": 9.0, "selected_items": [1]})
+            job.report("dp", {"is_feasible": True, "total_value": 7.0, "total_weight": 5.0, "selected_items": [0, 1]})
+            return {}
+        job = manager.submit(target, {})
+        wait_until_finished(job)
+        assert job.incumbent["solver"] == "dp"
+        assert job.incumbent["total_value"] == 7.0
+    finally:
+        manager.shutdown()
+
+
+def test_job_lifecycle(client):
+    job_id = client.post("/jobs", json=dict(INSTANCE, solver_type="greedy")).json()["job_id"]
+    job = wait_for(client, job_id, ("succeeded", "failed"))
+    assert job["status"] == "succeeded"
+    assert job["result"]["results"]["greedy"]["total_value"] == 7.0
+    assert job["incumbent"]["total_value"] == 7.0
+
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_job_cancelled_while_waiting_for_admission(client):
+    max_concurrent = api.admission.max_concurrent
+    api.admission.max_concurrent = 1
+    # Hold the only solver slot, so the job has to wait for admission
+    client.portal.call(api.admission.acquire, 0)
+    try:
+        job_id = client.post("/jobs", json=dict(INSTANCE, solver_type="greedy")).json()["job_id"]
+        time.sleep(0.2)
+        assert client.get(f"/jobs/{job_id}").json()["result"] is None
+        client.delete(f"/jobs/{job_id}")
+        assert wait_for(client, job_id, ("cancelled",))["result"] is None
+    finally:
+        client.portal.call(api.admission.release, 0)
+        api.admission.max_concurrent = max_concurrent
+    assert api.admission._running == 0
@@ -0,0 +1,53 @@
+import re
+
+import pytest
+
+from knapsack.utils.metrics import MetricsRegistry
+
+INSTANCE = {"weights": [2.0, 3.0, 4.0, 5.0], "values": [3.0, 4.0, 5.0, 6.0], "capacity": 5.0}
+
+
+def sample(text, series):
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    assert match is not None, f"{series} not in metrics"
+    return float(match.group(1))
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("solver",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(value, solver="dp")
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert sample(text, 'latency_seconds_bucket{solver="dp",le="0.1"}') == 1
+    assert sample(text, 'latency_seconds_bucket{solver="dp",le="1.0"}') == 3
+    assert sample(text, 'latency_seconds_bucket{solver="dp",le="+Inf"}') == 4
+    assert sample(text, 'latency_seconds_count{solver="dp"}') == 4
+    assert sample(text, 'latency_seconds_sum{solver="dp"}') == pytest.approx(6.25)
+
+
+def test_counter_and_duplicate_names():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("status",))
+    counter.inc(status=200)
+    counter.inc(2, status=200)
+    assert sample(registry.render(), 'requests_total{status="200"}') == 3
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Requests again")
+
+
+def test_metrics_endpoint_counts_solves(client):
+    before = client.get("/metrics").text
+    assert client.post("/solve", json=dict(INSTANCE, solver_type="ml")).status_code == 200
+    response = client.get("/metrics")
+    text = response.text
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    requests = 'knapsack_requests_total{endpoint="/solve",status="200"}'
+    solver_runs = 'knapsack_solver_seconds_count{solver="ml"}'
+    assert sample(text, requests) == (sample(before, requests) if requests in before else 0) + 1
+    assert sample(text, solver_runs) == (sample(before, solver_runs) if solver_runs in before else 0) + 1
+    assert sample(text, 'knapsack_ml_stage_seconds_count{stage="predict"}') >= 1
+    assert sample(text, "knapsack_queue_wait_seconds_count") >= 1
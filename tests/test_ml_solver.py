@@ -0,0 +1,59 @@
+import re
+
+import numpy as np
+import pytest
+
+from knapsack.solver.ml_solver import MLKnapsackSolver
+from knapsack.utils.metrics import registry
+
+
+def fallbacks(reason, solver="dp"):
+    series = f'knapsack_ml_fallbacks_total{{reason="{reason}",solver="{solver}"}}'
+    match = re.search(rf"^{re.escape(series)} (\S+)$", registry.render(), re.MULTILINE)
+    return 0.0 if match is None else float(match.group(1))
+
+
+def instance(n, seed=0, capacity=None):
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, 20, n).astype(float).tolist()
+    values = rng.integers(1, 20, n).astype(float).tolist()
+    return weights, values, float(sum(weights) // 2) if capacity is None else capacity
+
+
+# The DP answers fallbacks, so their instances get a small capacity to keep it quick
+def oversized(solver):
+    return instance(solver.max_items + 5, capacity=10.0)
+
+
+@pytest.fixture(scope="module")
+def solver():
+    return MLKnapsackSolver()
+
+
+def test_instances_over_max_items_fall_back_as_too_many_items(solver):
+    before = fallbacks("too_many_items")
+    result = solver.solve(*oversized(solver), profile=True)
+
+    assert result['profile']['fallback'] == {'reason': 'too_many_items', 'solver': 'dp'}
+    assert result['is_feasible']
+    assert fallbacks("too_many_items") == before + 1
+
+
+def test_instances_within_max_items_use_the_model(solver):
+    before = fallbacks("ml_error")
+    result = solver.solve(*instance(solver.max_items), profile=True)
+
+    assert result['profile']['fallback'] is None
+    assert result['is_feasible']
+    assert fallbacks("ml_error") == before
+
+
+def test_batches_report_oversized_instances_as_too_many_items(solver):
+    results = solver.solve_batch([instance(10), oversized(solver)], profile=True)
+    assert results[0]['profile']['fallback'] is None
+    assert results[1]['profile']['fallback']['reason'] == 'too_many_items'
+
+
+def test_missing_model_falls_back_as_model_unavailable():
+    result = MLKnapsackSolver(model_path=None).solve(*instance(10, capacity=10.0), profile=True)
+    assert result['profile']['fallback']['reason'] == 'model_unavailable'
@@ -0,0 +1,197 @@
+import logging
+import threading
+
+import pytest
+
+from knapsack.solver.genetic_solver import GeneticKnapsackSolver
+from knapsack.solver.ml_solver import MLKnapsackSolver
+from knapsack.solver.observers import (
+    EarlyStopObserver, LoggingObserver, ObserverList, ProgressObserver, SolverObserver, TracingObserver
+)
+from knapsack.solver.traditional_solver import BranchAndBoundKnapsackSolver, DPKnapsackSolver, GreedyKnapsackSolver
+
+WEIGHTS, VALUES, CAPACITY = [2.0, 3.0, 4.0, 5.0, 1.0], [3.0, 4.0, 5.0, 6.0, 1.0], 8.0
+
+
+class RecordingObserver(SolverObserver):
+    def __init__(self, stop_on=None):
+        self.events = []
+        self.stop_on = stop_on
+
+    def _record(self, event):
+        self.events.append(event)
+        return event['type'] == self.stop_on
+
+    on_start = on_finish = on_incumbent = on_bound = on_iteration = _record
+
+    def types(self):
+        return [event['type'] for event in self.events]
+
+
+def test_events_carry_the_solver_and_elapsed_time():
+    observer = RecordingObserver()
+    observers = ObserverList("dp", [observer])
+    observers.start(3, 10.0)
+    observers.incumbent(total_value=5.0)
+    result = observers.finish({'total_value': 5.0})
+
+    assert result == {'total_value': 5.0}
+    assert observer.types() == ['start', 'incumbent', 'finish']
+    assert observer.events[0]['n_items'] == 3 and observer.events[0]['capacity'] == 10.0
+    assert all(event['solver'] == "dp" and event['elapsed'] >= 0 for event in observer.events)
+
+
+def test_any_observer_can_stop_and_the_request_sticks():
+    quiet, stopping = RecordingObserver(), RecordingObserver(stop_on='bound')
+    observers = ObserverList("bnb", [quiet, stopping])
+
+    assert not observers.iteration(nodes=1)
+    assert observers.bound(bound=10.0)
+    assert observers.stop_requested
+    # Every observer still sees the events, and the stop stays requested
+    assert observers.iteration(nodes=2)
+    assert quiet.types() == ['iteration', 'bound', 'iteration']
+
+
+def test_an_empty_list_is_falsy_and_never_stops():
+    observers = ObserverList("greedy")
+    assert not observers
+    assert not observers.incumbent(total_value=1.0)
+    assert observers.nested() == []
+
+
+def test_nested_runs_report_progress_but_not_their_start_and_finish():
+    observer = RecordingObserver()
+    outer = ObserverList("ml", [observer])
+    outer.start(5, CAPACITY)
+    DPKnapsackSolver().solve(WEIGHTS, VALUES, CAPACITY, observers=outer.nested())
+    outer.finish({'total_value': 0.0})
+
+    types = observer.types()
+    assert types[0] == 'start' and types[-1] == 'finish'
+    assert types.count('start') == 1 and types.count('finish') == 1
+    assert 'incumbent' in types
+    assert all(event['solver'] == "ml" for event in observer.events)
+
+
+def test_logging_observer_logs_at_its_level(caplog):
+    observers = ObserverList("greedy", [LoggingObserver(level=logging.WARNING)])
+    with caplog.at_level(logging.DEBUG, logger="knapsack.solver.observers"):
+        observers.start(2, 5.0)
+        observers.incumbent(total_value=3.0, total_weight=4.0)
+        observers.iteration(step=1)
+        observers.finish({'total_value': 3.0})
+
+    levels = [(record.levelno, record.getMessage()) for record in caplog.records]
+    assert [level for level, _ in levels] == [logging.WARNING, logging.WARNING, logging.DEBUG, logging.WARNING]
+    assert "greedy: incumbent 3" in levels[1][1]
+
+
+def test_tracing_observer_records_a_span_per_run():
+    exported = []
+    tracer = TracingObserver(on_span=exported.append)
+    result = BranchAndBoundKnapsackSolver().solve(WEIGHTS, VALUES, CAPACITY, observers=[tracer])
+
+    assert exported == tracer.spans and len(tracer.spans) == 1
+    span = tracer.spans[0]
+    assert span['name'] == "solve.bnb"
+    assert span['end'] - span['start'] == pytest.approx(span['duration'])
+    assert span['attributes']['n_items'] == 5
+    assert span['attributes']['total_value'] == result['total_value']
+    names = {event['name'] for event in span['events']}
+    assert 'incumbent' in names and 'iteration' not in names
+    assert all(span['start'] <= event['time'] <= span['end'] for event in span['events'])
+
+
+def test_tracing_observer_keeps_concurrent_runs_apart():
+    tracer = TracingObserver()
+    threads = [
+        threading.Thread(target=GreedyKnapsackSolver().solve, args=(WEIGHTS, VALUES, CAPACITY), kwargs={'observers': [tracer]})
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(tracer.spans) == 4
+
+
+@pytest.mark.parametrize("kwargs, events, reason", [
+    (dict(target_value=10.0), [('incumbent', dict(total_value=12.0))], "target_value"),
+    (dict(max_gap=0.1), [('bound', dict(bound=10.0)), ('incumbent', dict(total_value=9.5))], "max_gap"),
+    (dict(time_limit=0.0), [('iteration', {})], "time_limit"),
+    (dict(cpu_time_limit=0.0), [('iteration', {})], "cpu_time_limit"),
+])
+def test_early_stop_names_the_rule(kwargs, events, reason):
+    observer = EarlyStopObserver(**kwargs)
+    observers = ObserverList("bnb", [observer])
+    observers.start(5, CAPACITY)
+    stopped = [getattr(observers, event_type)(**fields) for event_type, fields in events]
+
+    assert stopped[-1]
+    assert observer.reason == reason
+
+
+def test_early_stop_waits_for_its_rules():
+    observer = EarlyStopObserver(target_value=20.0, max_gap=0.01, time_limit=60.0, cpu_time_limit=60.0)
+    observers = ObserverList("bnb", [observer])
+    observers.start(5, CAPACITY)
+    assert not observers.bound(bound=30.0)
+    assert not observers.incumbent(total_value=15.0)
+    assert observer.reason is None
+
+
+def test_early_stop_on_event_and_reset_on_start():
+    stop_event = threading.Event()
+    observer = EarlyStopObserver(stop_event=stop_event)
+    observers = ObserverList("ga", [observer])
+    observers.start(5, CAPACITY)
+    assert not observers.iteration(generation=0)
+    stop_event.set()
+    assert observers.iteration(generation=1)
+    assert observer.reason == "stop_event"
+
+    stop_event.clear()
+    ObserverList("ga", [observer]).start(5, CAPACITY)
+    assert observer.reason is None
+
+
+def test_progress_observer_forwards_selected_events():
+    forwarded = []
+    observer = ProgressObserver(lambda event: forwarded.append(event['type']) or event['type'] == 'bound',
+                                events=('start', 'incumbent', 'bound'))
+    observers = ObserverList("bnb", [observer])
+    observers.start(5, CAPACITY)
+    assert not observers.iteration(nodes=1)
+    assert not observers.incumbent(total_value=1.0)
+    assert observers.bound(bound=2.0)
+    observers.finish({'total_value': 1.0})
+    assert forwarded == ['start', 'incumbent', 'bound']
+
+
+@pytest.mark.parametrize("name, make_solver", [
+    ("dp", DPKnapsackSolver),
+    ("greedy", GreedyKnapsackSolver),
+    ("bnb", BranchAndBoundKnapsackSolver),
+    ("ml", MLKnapsackSolver),
+    ("ga", lambda: GeneticKnapsackSolver(seed=0, generations=20)),
+])
+def test_each_solver_reports_one_start_and_finish(name, make_solver):
+    observer = RecordingObserver()
+    result = make_solver().solve(WEIGHTS, VALUES, CAPACITY, observers=[observer])
+
+    types = observer.types()
+    assert types[0] == 'start' and types[-1] == 'finish'
+    assert types.count('start') == 1 and types.count('finish') == 1
+    assert all(event['solver'] == name for event in observer.events)
+    incumbents = [event['total_value'] for event in observer.events if event['type'] == 'incumbent']
+    assert incumbents == sorted(incumbents)
+    assert observer.events[-1]['total_value'] == result['total_value']
+    if incumbents:
+        assert incumbents[-1] <= result['total_value']
+
+
+@pytest.mark.parametrize("make_solver", [DPKnapsackSolver, BranchAndBoundKnapsackSolver])
+def test_exact_solvers_stop_when_asked(make_solver):
+    result = make_solver().solve(WEIGHTS, VALUES, CAPACITY, observers=[RecordingObserver(stop_on='iteration')])
+    assert result['is_feasible']
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from knapsack.solver.traditional_solver import BranchAndBoundKnapsackSolver, GreedyKnapsackSolver
+from knapsack.solver.portfolio import PortfolioKnapsackSolver
+
+INSTANCE = {"weights": [2.0, 3.0, 4.0, 5.0], "values": [3.0, 4.0, 5.0, 6.0], "capacity": 5.0}
+
+
+def random_instance(rng, n):
+    weights = rng.integers(1, 50, n).astype(float).tolist()
+    values = rng.integers(1, 50, n).astype(float).tolist()
+    capacity = float(np.floor(0.4 * sum(weights)))
+    return weights, values, capacity
+
+
+def greedy_and_bnb(**kwargs):
+    return PortfolioKnapsackSolver({
+        "greedy": GreedyKnapsackSolver(),
+        "bnb": BranchAndBoundKnapsackSolver()
+    }, **kwargs)
+
+
+def test_portfolio_answers_by_a_short_deadline():
+    rng = np.random.default_rng(0)
+    weights, values, capacity = random_instance(rng, 2000)
+    portfolio = PortfolioKnapsackSolver({
+        "greedy": GreedyKnapsackSolver(),
+        "bnb": BranchAndBoundKnapsackSolver()
+    })
+    try:
+        solution = portfolio.solve(weights, values, capacity, deadline=0.001)
+    finally:
+        portfolio.shutdown()
+
+    greedy = GreedyKnapsackSolver().solve(weights, values, capacity)
+    assert solution['is_feasible']
+    assert solution['winner'] == "greedy"
+    assert solution['total_value'] == pytest.approx(greedy['total_value'])
+    assert solution['members']['bnb'] == "cancelled"
+
+
+def test_concurrent_races_each_get_members():
+    # Greedy misses the optimum of this instance, so branch and bound has to win
+    weights, values, capacity = [5.0, 4.0, 4.0], [10.0, 7.0, 7.0], 8.0
+    portfolio = greedy_and_bnb(max_races=2)
+    portfolio.start()
+    solutions = [None, None]
+
+    def race(i):
+        solutions[i] = portfolio.solve(weights, values, capacity, deadline=10.0)
+
+    try:
+        threads = [threading.Thread(target=race, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        portfolio.shutdown()
+
+    for solution in solutions:
+        assert solution["winner"] == "bnb"
+        assert solution["is_optimal"]
+        assert solution["total_value"] == 14.0
+
+
+def test_restart_waits_for_the_race_in_flight():
+    rng = np.random.default_rng(1)
+    weights = rng.integers(1000, 1100, 200).astype(float).tolist()
+    values = [w + 10.0 for w in weights]
+    capacity = float(np.floor(0.5 * sum(weights)))
+    portfolio = greedy_and_bnb()
+    portfolio.start()
+    race = {}
+
+    def run():
+        race["solution"] = portfolio.solve(weights, values, capacity, deadline=1.0)
+        race["ended"] = time.time()
+
+    try:
+        thread = threading.Thread(target=run)
+        thread.start()
+        time.sleep(0.3)
+        portfolio.restart()
+        restarted = time.time()
+        thread.join()
+        assert restarted >= race["ended"]
+        assert race["solution"]["members"]["bnb"] != "failed"
+        assert portfolio.solve(*INSTANCE.values(), deadline=10.0)["is_optimal"]
+    finally:
+        portfolio.shutdown()
+
+
+def test_at_least_one_member_set():
+    with pytest.raises(ValueError):
+        greedy_and_bnb(max_races=0)
+
+
+def test_non_positive_latency_target_is_rejected(client):
+    response = client.post("/solve", json=dict(INSTANCE, solver_type="portfolio", latency_target=-1))
+    assert response.status_code == 400
+
+
+def test_portfolio_with_tiny_latency_target_answers(client):
+    response = client.post("/solve", json=dict(INSTANCE, solver_type="portfolio", latency_target=0.001))
+    assert response.status_code == 200
+    assert response.json()["results"]["portfolio"]["total_value"] == 7.0
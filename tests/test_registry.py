@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from knapsack.registry import ModelDeployer, ModelRegistry
+from knapsack.train_model import KnapsackMLModel, FEATURE_SPEC_VERSION
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def register_with_spec(root, feature_spec_version):
+    registry = ModelRegistry(str(root))
+    version = registry.register(KnapsackMLModel(model_type="linear_student"))
+    path = os.path.join(str(root), version, 'metadata.json')
+    with open(path) as f:
+        meta = json.load(f)
+    meta['feature_spec_version'] = feature_spec_version
+    with open(path, 'w') as f:
+        json.dump(meta, f)
+    return registry, version
+
+
+def test_load_checks_feature_spec(tmp_path):
+    registry, version = register_with_spec(tmp_path, FEATURE_SPEC_VERSION)
+    assert registry.load(version).model_type == "linear_student"
+
+    registry, version = register_with_spec(tmp_path / 'stale', FEATURE_SPEC_VERSION + 1)
+    with pytest.raises(ValueError, match="feature spec"):
+        registry.load(version)
+
+
+@pytest.mark.parametrize("version", ["..", ".staging-x", "a/b", ""])
+def test_invalid_version_names(tmp_path, version):
+    with pytest.raises(ValueError, match="Invalid model version"):
+        ModelRegistry(str(tmp_path)).metadata(version)
+
+
+def test_api_refuses_active_version_with_other_feature_spec(tmp_path):
+    registry, version = register_with_spec(tmp_path, FEATURE_SPEC_VERSION + 1)
+    registry.set_active(version)
+
+    result = subprocess.run(
+        [sys.executable, '-c', 'import knapsack.api'],
+        cwd=REPO_ROOT,
+        env=dict(os.environ, KNAPSACK_MODEL_REGISTRY=str(tmp_path)),
+        capture_output=True,
+        text=True
+    )
+    assert result.returncode != 0
+    assert "feature spec" in result.stderr
+
+
+class FakeSolver:
+    def __init__(self):
+        self.model_version = None
+
+    def warm_up(self, model):
+        return 0.0
+
+    def swap_model(self, model, version=None):
+        self.model_version = version
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_deploys_reach_every_worker_watching_the_registry(tmp_path):
+    registry, version = register_with_spec(tmp_path, FEATURE_SPEC_VERSION)
+    first, second = FakeSolver(), FakeSolver()
+    deployers = [ModelDeployer(ModelRegistry(str(tmp_path)), solver, poll_interval=0.05) for solver in (first, second)]
+    for deployer in deployers:
+        deployer.watch()
+    try:
+        assert deployers[0].deploy(version)
+        wait_for(lambda: first.model_version == version)
+        assert registry.active_version() == version
+        wait_for(lambda: second.model_version == version)
+
+        newer = registry.register(KnapsackMLModel(model_type="linear_student"))
+        registry.set_active(newer)
+        wait_for(lambda: first.model_version == newer and second.model_version == newer)
+    finally:
+        for deployer in deployers:
+            deployer.stop()
+
+
+def test_sync_does_not_retry_a_failed_version(tmp_path):
+    registry, version = register_with_spec(tmp_path, FEATURE_SPEC_VERSION + 1)
+    registry.set_active(version)
+    deployer = ModelDeployer(registry, FakeSolver())
+
+    assert deployer.sync()
+    wait_for(lambda: deployer.status()['loading'] is None)
+    assert "feature spec" in deployer.status()['last_error']
+    assert not deployer.sync()
+
+
+def test_watching_is_off_without_an_interval(tmp_path):
+    deployer = ModelDeployer(ModelRegistry(str(tmp_path)), FakeSolver(), poll_interval=0)
+    deployer.watch()
+    assert deployer._watcher is None
+    deployer.stop()
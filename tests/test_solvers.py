@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from knapsack.solver.traditional_solver import DPKnapsackSolver, BranchAndBoundKnapsackSolver
+
+
+def random_instance(rng, n):
+    weights = rng.integers(1, 50, n).astype(float).tolist()
+    values = rng.integers(1, 50, n).astype(float).tolist()
+    capacity = float(np.floor(0.4 * sum(weights)))
+    return weights, values, capacity
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bnb_matches_dp(seed):
+    rng = np.random.default_rng(seed)
+    weights, values, capacity = random_instance(rng, int(rng.integers(1, 25)))
+
+    expected = DPKnapsackSolver().solve(weights, values, capacity)
+    solution = BranchAndBoundKnapsackSolver().solve(weights, values, capacity)
+
+    assert solution['is_optimal']
+    assert solution['total_value'] == pytest.approx(expected['total_value'])
+    assert solution['total_weight'] <= capacity
+    assert solution['total_value'] == pytest.approx(sum(values[i] for i in solution['selected_items']))
@@ -0,0 +1,31 @@
+import json
+
+INSTANCE = {"weights": [2.0, 3.0, 4.0, 5.0, 6.0], "values": [3.0, 4.0, 5.0, 6.0, 8.0], "capacity": 9.0}
+
+
+def parse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_reports_start_incumbents_and_result(client):
+    response = client.post("/solve/stream", json=dict(INSTANCE, solver_type="bnb"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_events(response.text)
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "start" and kinds[-1] == "result"
+    incumbents = [data["total_value"] for kind, data in events if kind == "incumbent"]
+    assert incumbents and incumbents == sorted(incumbents)
+    result = events[-1][1]
+    assert result["solver"] == "bnb"
+    assert result["total_value"] == 12.0
+    assert incumbents[-1] == result["total_value"]
+
+
+def test_stream_needs_a_single_solver(client):
+    assert client.post("/solve/stream", json=dict(INSTANCE, solver_type="all")).status_code == 400
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from knapsack import wire
+
+msgpack = pytest.importorskip("msgpack")
+
+MSGPACK_HEADERS = {"Content-Type": "application/x-msgpack"}
+INSTANCE = {"weights": [2.0, 3.0, 4.0, 5.0], "values": [3.0, 4.0, 5.0, 6.0], "capacity": 5.0}
+
+
+def msgpack_body(**fields):
+    body = {
+        "weights": np.asarray(INSTANCE["weights"], dtype="<f8").tobytes(),
+        "values": np.asarray(INSTANCE["values"], dtype="<f8").tobytes(),
+        "capacity": INSTANCE["capacity"],
+        "solver_type": "greedy"
+    }
+    body.update(fields)
+    return msgpack.packb(body, use_bin_type=True)
+
+
+@pytest.mark.parametrize("dtype", ["<f4", "<f8"])
+def test_decode_request_reads_raw_arrays(dtype):
+    body = msgpack.packb({
+        "weights": np.asarray([1.5, 2.0], dtype=dtype).tobytes(),
+        "values": [3, 4.5],
+        "capacity": 3,
+        "dtype": dtype
+    }, use_bin_type=True)
+    fields, decoded_dtype = wire.decode_request(body)
+
+    assert decoded_dtype == dtype
+    assert fields["weights"] == [1.5, 2.0]
+    assert fields["values"] == [3.0, 4.5]
+    assert fields["capacity"] == 3
+
+
+@pytest.mark.parametrize("payload, status_code", [
+    ({"weights": b"\x00" * 5, "values": [1.0], "capacity": 1.0}, 400),
+    ({"weights": [1.0], "values": [1.0], "capacity": 1.0, "dtype": "<i8"}, 400),
+    ({"weights": [1.0], "values": [1.0]}, 400),
+    ({"weights": [True], "values": [1.0], "capacity": 1.0}, 422)
+])
+def test_decode_request_rejects_malformed_bodies(payload, status_code):
+    with pytest.raises(wire.WireFormatError) as excinfo:
+        wire.decode_request(msgpack.packb(payload, use_bin_type=True))
+    assert excinfo.value.status_code == status_code
+
+
+def test_selection_bits_round_trip():
+    selection = [1.0, 0.0, 0.0, 1.0, 1.0, 0.0, 1.0, 0.0, 0.0, 1.0]
+    bits = wire.pack_selection(selection)
+    assert len(bits) == 2
+    assert wire.unpack_selection(bits, len(selection)).tolist() == [int(x) for x in selection]
+
+
+def test_msgpack_request_matches_json(client):
+    from_json = client.post("/solve", json=dict(INSTANCE, solver_type="greedy")).json()
+    from_msgpack = client.post("/solve", content=msgpack_body(), headers=MSGPACK_HEADERS).json()
+
+    assert from_msgpack["request"] == from_json["request"]
+    for field in ("selected_items", "total_value", "total_weight", "selection"):
+        assert from_msgpack["results"]["greedy"][field] == from_json["results"]["greedy"][field]
+
+
+def test_msgpack_response_decodes_to_json_result(client):
+    from_json = client.post("/solve", json=dict(INSTANCE, solver_type="greedy")).json()
+    response = client.post(
+        "/solve", content=msgpack_body(), headers=dict(MSGPACK_HEADERS, Accept="application/x-msgpack")
+    )
+    result = msgpack.unpackb(response.content, raw=False)["results"]["greedy"]
+
+    expected = from_json["results"]["greedy"]
+    assert result["total_value"] == expected["total_value"]
+    assert result["selected_items"] == expected["selected_items"]
+    bits = np.unpackbits(np.frombuffer(result["selection_bits"], dtype=np.uint8), count=4, bitorder="little")
+    assert bits.tolist() == [int(x) for x in expected["selection"]]
+
+
+@pytest.mark.parametrize("fields", [
+    {"solver_type": ["x"]},
+    {"allow_downgrade": "x"},
+    {"capacity": "abc"},
+    {"weights": [1.0, "a", 3.0, 4.0]}
+])
+def test_msgpack_malformed_field_is_422(client, fields):
+    response = client.post("/solve", content=msgpack_body(**fields), headers=MSGPACK_HEADERS)
+    assert response.status_code == 422
+
+
+def test_compact_json_response_drops_redundant_fields(client):
+    response = client.post("/solve", json=dict(INSTANCE, solver_type="greedy", compact=True)).json()
+    assert "request" not in response
+    assert "selection" not in response["results"]["greedy"]
+    assert response["results"]["greedy"]["selected_items"] == [0, 1]
@@ -1,109 +1,201 @@
+import argparse
+import multiprocessing
+import os
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any
-import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Union, Optional, Tuple, Sequence
 from knapsack.solver.traditional_solver import DPKnapsackSolver, GreedyKnapsackSolver
 from knapsack.solver.ml_solver import MLKnapsackSolver
+from knapsack.solver.genetic_solver import GeneticKnapsackSolver
+from knapsack.dataset import KnapsackDataset, load_instances
+
+# Solvers compared by default; the DP (pure Python, seconds per instance) and the GA
+# are opt-in with --solvers, and the DP only runs by default for unlabeled instances
+DEFAULT_SOLVERS = ("greedy", "ml")
+# Instances sent to a worker at once, so batch solver APIs see whole chunks
+CHUNK_SIZE = 50
+
+Instance = Tuple[List[float], List[float], float]
+
+# Evaluator of a worker process, built once by _init_worker
+_worker_evaluator = None
+
+
+def _init_worker(solver_names: Tuple[str, ...], model_path: str):
+    """Give each worker its own solvers, limited to one thread so workers do not oversubscribe the CPUs."""
+    global _worker_evaluator
+    _worker_evaluator = KnapsackEvaluator(solver_names, n_workers=1, model_path=model_path)
+    # Only loaded for 'ml' or 'ga'; the GA seeds its population with the same solver
+    if _worker_evaluator.ml_solver is not None:
+        _worker_evaluator.ml_solver.set_n_jobs(1)
+
+
+def _evaluate_chunk(instances: List[Instance], optimal_values: List[Optional[float]]) -> List[Dict[str, Any]]:
+    return _worker_evaluator.evaluate_instances(instances, optimal_values)
+
 
 class KnapsackEvaluator:
-    def __init__(self):
-        """Initialize solvers for comparison."""
+    def __init__(
+        self,
+        solvers: Sequence[str] = DEFAULT_SOLVERS,
+        n_workers: Optional[int] = None,
+        model_path: str = 'knapsack/models/rf_model.pkl'
+    ):
+        """Initialize solvers for comparison.
+
+        Args:
+            solvers: Solvers to evaluate, out of 'dp', 'greedy', 'ml' and 'ga'
+            n_workers: Worker processes for evaluate_dataset; defaults to the number
+                of CPUs, 1 evaluates in-process
+            model_path: Trained model for the ML solver
+        """
+        self.solver_names = tuple(solvers)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.model_path = model_path
         self.dp_solver = DPKnapsackSolver()
         self.greedy_solver = GreedyKnapsackSolver()
-        self.ml_solver = MLKnapsackSolver()
-    
+        self.ml_solver = MLKnapsackSolver(model_path) if {'ml', 'ga'} & set(self.solver_names) else None
+        self.ga_solver = GeneticKnapsackSolver(ml_solver=self.ml_solver, seed=0)
+        self.solvers = {
+            "dp": self.dp_solver,
+            "greedy": self.greedy_solver,
+            "ml": self.ml_solver,
+            "ga": self.ga_solver
+        }
+
     def evaluate_instance(
         self,
         weights: List[float],
         values: List[float],
-        capacity: float
+        capacity: float,
+        optimal_value: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Evaluate all solvers on a single instance."""
-        results = {}
-        
-        # Solve using each method
-        dp_solution = self.dp_solver.solve(weights, values, capacity)
-        greedy_solution = self.greedy_solver.solve(weights, values, capacity)
-        ml_solution = self.ml_solver.solve(weights, values, capacity)
-        
-        # Optimal value from DP
-        optimal_value = dp_solution['total_value']
-        
-        # Calculate relative performance
-        results['dp'] = {
-            'total_value': dp_solution['total_value'],
-            'total_weight': dp_solution['total_weight'],
-            'solve_time': dp_solution['solve_time'],
-            'relative_performance': 1.0,  # By definition
-            'is_feasible': dp_solution['is_feasible']
-        }
-        
-        results['greedy'] = {
-            'total_value': greedy_solution['total_value'],
-            'total_weight': greedy_solution['total_weight'],
-            'solve_time': greedy_solution['solve_time'],
-            'relative_performance': greedy_solution['total_value'] / optimal_value,
-            'is_feasible': greedy_solution['is_feasible']
-        }
-        
-        results['ml'] = {
-            'total_value': ml_solution['total_value'],
-            'total_weight': ml_solution['total_weight'],
-            'solve_time': time.time() - time.time(),  # ML prediction time is negligible
-            'relative_performance': ml_solution['total_value'] / optimal_value,
-            'is_feasible': ml_solution['is_feasible']
-        }
-        
+        """Evaluate all solvers on a single instance.
+
+        Relative performance is measured against optimal_value; without one,
+        the DP solves the instance for it.
+        """
+        return self.evaluate_instances([(weights, values, capacity)], [optimal_value])[0]
+
+    def evaluate_instances(
+        self,
+        instances: List[Instance],
+        optimal_values: List[Optional[float]]
+    ) -> List[Dict[str, Any]]:
+        """Evaluate all solvers on a list of instances, using batch solver APIs where available.
+
+        Args:
+            instances: (weights, values, capacity) tuples
+            optimal_values: Known optimum of each instance, or None to compute it with the DP
+
+        Returns:
+            Per instance, each solver's value, weight, time, feasibility and
+            relative performance
+        """
+        solutions = {}
+        for name in self.solver_names:
+            solver = self.solvers[name]
+            if hasattr(solver, 'solve_batch'):
+                solutions[name] = solver.solve_batch(instances)
+            else:
+                solutions[name] = [solver.solve(weights, values, capacity) for weights, values, capacity in instances]
+
+        results = []
+        for i, (weights, values, capacity) in enumerate(instances):
+            optimal_value = optimal_values[i]
+            if optimal_value is None:
+                # Optimal value from DP
+                dp_solution = solutions['dp'][i] if 'dp' in solutions else self.dp_solver.solve(weights, values, capacity)
+                optimal_value = dp_solution['total_value']
+
+            results.append({
+                name: {
+                    'total_value': solutions[name][i]['total_value'],
+                    'total_weight': solutions[name][i]['total_weight'],
+                    'solve_time': solutions[name][i]['solve_time'],
+                    'relative_performance': solutions[name][i]['total_value'] / optimal_value if optimal_value > 0 else 1.0,
+                    'is_feasible': solutions[name][i]['is_feasible']
+                }
+                for name in self.solver_names
+            })
         return results
-    
-    def evaluate_dataset(self, test_data: pd.DataFrame) -> Dict[str, Dict[str, float]]:
-        """Evaluate all solvers on a test dataset."""
-        all_results = {
-            'dp': {'values': [], 'times': [], 'feasible': []},
-            'greedy': {'values': [], 'times': [], 'feasible': []},
-            'ml': {'values': [], 'times': [], 'feasible': []}
-        }
-        
-        for _, instance in test_data.iterrows():
-            weights = eval(instance['weights']) if isinstance(instance['weights'], str) else instance['weights']
-            values = eval(instance['values']) if isinstance(instance['values'], str) else instance['values']
-            capacity = instance['capacity']
-            
-            results = self.evaluate_instance(weights, values, capacity)
-            
-            for solver in ['dp', 'greedy', 'ml']:
-                all_results[solver]['values'].append(results[solver]['total_value'])
-                all_results[solver]['times'].append(results[solver]['solve_time'])
-                all_results[solver]['feasible'].append(results[solver]['is_feasible'])
-        
+
+    def evaluate_dataset(self, test_data: Union[str, pd.DataFrame, KnapsackDataset]) -> Dict[str, Dict[str, float]]:
+        """Evaluate all solvers on a test dataset (directory, CSV path, DataFrame or dataset).
+
+        Stored optimal values are used when the dataset has them. Instances are
+        evaluated in chunks of CHUNK_SIZE across n_workers processes, each with
+        its own solvers; results are collected in dataset order.
+        """
+        test_data = load_instances(test_data)
+        instances = []
+        for i in range(len(test_data)):
+            weights, values, capacity = test_data.instance(i)
+            instances.append((weights.tolist(), values.tolist(), capacity))
+        if test_data.optimal_value is not None:
+            optimal_values = [float(value) for value in test_data.optimal_value]
+        else:
+            optimal_values = [None] * len(instances)
+
+        chunks = [
+            (instances[start:start + CHUNK_SIZE], optimal_values[start:start + CHUNK_SIZE])
+            for start in range(0, len(instances), CHUNK_SIZE)
+        ]
+        results = []
+        if self.n_workers == 1 or len(chunks) <= 1:
+            for chunk_instances, chunk_optima in chunks:
+                results.extend(self.evaluate_instances(chunk_instances, chunk_optima))
+        else:
+            # Spawned, not forked: forking after the solvers' thread pools have run can deadlock the children
+            with ProcessPoolExecutor(
+                max_workers=self.n_workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker, initargs=(self.solver_names, self.model_path)
+            ) as executor:
+                futures = [executor.submit(_evaluate_chunk, *chunk) for chunk in chunks]
+                for future in futures:
+                    results.extend(future.result())
+
         # Compute summary statistics
         summary = {}
-        for solver in ['dp', 'greedy', 'ml']:
-            values = np.array(all_results[solver]['values'])
-            times = np.array(all_results[solver]['times'])
-            feasible = np.array(all_results[solver]['feasible'])
-            
+        for solver in self.solver_names:
+            values = np.array([result[solver]['total_value'] for result in results])
+            times = np.array([result[solver]['solve_time'] for result in results])
+            feasible = np.array([result[solver]['is_feasible'] for result in results])
+            relative = np.array([result[solver]['relative_performance'] for result in results])
+
             summary[solver] = {
                 'mean_value': np.mean(values),
                 'std_value': np.std(values),
                 'mean_time': np.mean(times),
                 'std_time': np.std(times),
                 'feasibility_rate': np.mean(feasible),
-                'relative_performance': np.mean(values / np.array(all_results['dp']['values']))
+                'relative_performance': np.mean(relative)
             }
-        
+
         return summary
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare solvers on a labeled test dataset')
+    parser.add_argument('--data', type=str, default='knapsack/data/test_data',
+                      help='Test dataset directory or CSV file')
+    parser.add_argument('--solvers', type=str, nargs='+', choices=['dp', 'greedy', 'ml', 'ga'],
+                      default=list(DEFAULT_SOLVERS), help='Solvers to evaluate')
+    parser.add_argument('--workers', type=int, default=None,
+                      help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--model', type=str, default='knapsack/models/rf_model.pkl',
+                      help='Trained model for the ML solver')
+    args = parser.parse_args()
+
     # Load test data
-    test_data = pd.read_csv('data/test_data.csv')
-    
+    test_data = load_instances(args.data)
+
     # Create evaluator
-    evaluator = KnapsackEvaluator()
-    
+    evaluator = KnapsackEvaluator(args.solvers, n_workers=args.workers, model_path=args.model)
+
     # Run evaluation
     summary = evaluator.evaluate_dataset(test_data)
-    
+
     # Print results
     print("\nEvaluation Results:")
     for solver, metrics in summary.items():
@@ -111,4 +203,4 @@ if __name__ == "__main__":
         print(f"Mean Value: {metrics['mean_value']:.2f} ± {metrics['std_value']:.2f}")
         print(f"Mean Time: {metrics['mean_time']:.6f} ± {metrics['std_time']:.6f} seconds")
         print(f"Feasibility Rate: {metrics['feasibility_rate']*100:.1f}%")
-        print(f"Relative Performance: {metrics['relative_performance']*100:.1f}% of optimal") 
\ No newline at end of file
+        print(f"Relative Performance: {metrics['relative_performance']*100:.1f}% of optimal")